@@ -26,6 +26,7 @@ from apps.dashboard.models import (
     TrainerAssignment,
     UWHControl,
 )
+from apps.dashboard.services import kpi, versions
 
 
 # Admin + sponsor accounts to re-create
@@ -87,6 +88,10 @@ class Command(BaseCommand):
         )
         self.stdout.write(f"  Reset {updated} schools to not_started")
 
+        # .update() bypasses the KPI/version signals
+        kpi.rebuild()
+        versions.bump("schools")
+
         # Re-create admin/sponsor accounts
         self.stdout.write("Re-creating admin & sponsor accounts...")
         for u in SEED_USERS:
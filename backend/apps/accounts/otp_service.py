@@ -6,12 +6,12 @@ Each function does exactly one thing. No side effects beyond its stated purpose.
 import secrets
 from datetime import timedelta
 
-from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 
+from apps.dashboard.services import email
+
 from .models import OTP
 
 OTP_LENGTH = 6
@@ -91,7 +91,11 @@ def consume_otp(user, code):
 
 
 def send_otp_email(user, code, purpose="reset"):
-    """Send the OTP code to the user's email. purpose: 'reset' or 'registration'."""
+    """Queue the OTP email for the user. purpose: 'reset' or 'registration'.
+
+    Sent on the priority lane, ahead of batch email. Returns the outbox row;
+    its ``delivery_id`` lets the client poll delivery status.
+    """
     subject = f"Your AI Literacy verification code: {code}"
     html_message = render_to_string(
         "accounts/otp_email.html",
@@ -104,15 +108,12 @@ def send_otp_email(user, code, purpose="reset"):
     )
     plain_message = strip_tags(html_message)
 
-    send_mail(
-        subject=subject,
-        message=plain_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        html_message=html_message,
-        fail_silently=False,
-    )
+    return email.queue(user.email, subject, plain_message, html_message, urgent=True)
+
 
+def delivery_status(delivery_id):
+    """Status of a queued OTP email ('pending', 'sending', 'sent', 'failed'), or None."""
+    return email.delivery_status(delivery_id)
 
 def cleanup_expired_otps():
     """Delete all expired or used OTPs. Run periodically via management command."""
@@ -11,5 +11,6 @@ urlpatterns = [
     path("trainer-register/", views.trainer_register),
     path("verify-registration/", views.verify_registration),
     path("resend-registration-otp/", views.resend_registration_otp),
+    path("otp-delivery/<uuid:delivery_id>/", views.otp_delivery),
     path("public-schools/", views.public_schools),
 ]
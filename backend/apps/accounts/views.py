@@ -96,7 +96,7 @@ def request_otp(request):
     otp = otp_service.create_otp(user)
 
     try:
-        otp_service.send_otp_email(user, otp.code)
+        message = otp_service.send_otp_email(user, otp.code)
     except Exception:
         logger.exception("Failed to send OTP email to %s", user.email)
         return Response(
@@ -104,7 +104,9 @@ def request_otp(request):
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
-    return Response({"detail": "Verification code sent to your email."})
+    return Response(
+        {"detail": "Verification code sent to your email.", "delivery_id": message.delivery_id}
+    )
 
 
 @api_view(["POST"])
@@ -206,7 +208,7 @@ def trainer_register(request):
     # Generate & send OTP
     otp = otp_service.create_otp(user)
     try:
-        otp_service.send_otp_email(user, otp.code, purpose="registration")
+        message = otp_service.send_otp_email(user, otp.code, purpose="registration")
     except Exception:
         logger.exception("Failed to send registration OTP to %s", email)
         # Rollback: delete the user (cascades to assignment + OTPs)
@@ -217,7 +219,10 @@ def trainer_register(request):
         )
 
     return Response(
-        {"detail": "Registration successful. Please check your email for the verification code."},
+        {
+            "detail": "Registration successful. Please check your email for the verification code.",
+            "delivery_id": message.delivery_id,
+        },
         status=status.HTTP_201_CREATED,
     )
 
@@ -281,7 +286,7 @@ def resend_registration_otp(request):
     otp = otp_service.create_otp(user)
 
     try:
-        otp_service.send_otp_email(user, otp.code, purpose="registration")
+        message = otp_service.send_otp_email(user, otp.code, purpose="registration")
     except Exception:
         logger.exception("Failed to resend registration OTP to %s", user.email)
         return Response(
@@ -289,7 +294,23 @@ def resend_registration_otp(request):
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
-    return Response({"detail": "Verification code sent to your email."})
+    return Response(
+        {"detail": "Verification code sent to your email.", "delivery_id": message.delivery_id}
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def otp_delivery(request, delivery_id):
+    """Delivery status of a queued OTP email: pending, sending, sent or failed.
+
+    The OTP endpoints return as soon as the email is queued; the client polls
+    this to tell the user when the code could not be delivered.
+    """
+    delivery_status = otp_service.delivery_status(delivery_id)
+    if delivery_status is None:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response({"status": delivery_status})
 
 
 @api_view(["GET"])
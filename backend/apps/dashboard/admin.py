@@ -9,7 +9,12 @@ from .models import (
     ActivityLog,
     UWHControl,
     TrainerAssignment,
+    DashboardKPI,
+    IdempotencyRecord,
+    Task,
+    EmailOutbox,
 )
+from .services import tasks
 
 
 @admin.register(District)
@@ -74,3 +79,38 @@ class ActivityLogAdmin(admin.ModelAdmin):
 @admin.register(UWHControl)
 class UWHControlAdmin(admin.ModelAdmin):
     list_display = ["status", "status_message", "updated_at"]
+
+
+@admin.register(DashboardKPI)
+class DashboardKPIAdmin(admin.ModelAdmin):
+    list_display = [
+        "role", "total_schools", "students_trained", "pending_submissions",
+        "pending_photos", "pending_projects", "updated_at",
+    ]
+
+
+@admin.register(IdempotencyRecord)
+class IdempotencyRecordAdmin(admin.ModelAdmin):
+    list_display = ["user", "method", "path", "status_code", "created_at"]
+    search_fields = ["key", "user__email"]
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ["name", "queue", "status", "priority", "attempts", "run_at", "finished_at"]
+    list_filter = ["status", "queue", "name"]
+    readonly_fields = ["last_error", "locked_by", "locked_at", "created_at", "finished_at"]
+    actions = ["retry_dead"]
+
+    @admin.action(description="Retry selected dead tasks")
+    def retry_dead(self, request, queryset):
+        count = tasks.retry(queryset)
+        self.message_user(request, f"Requeued {count} task(s).")
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ["subject", "status", "priority", "attempts", "created_at", "sent_at"]
+    list_filter = ["status"]
+    search_fields = ["subject", "to"]
+    readonly_fields = ["last_error", "claimed_at", "sent_at", "created_at"]
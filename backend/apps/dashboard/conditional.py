@@ -0,0 +1,46 @@
+"""
+Conditional GET support for polled dashboard endpoints.
+
+    @api_view(["GET"])
+    @permission_classes([IsAuthenticated, IsAdmin])
+    @versioned_etag("submissions", "photos")
+    def swinfy_submissions(request): ...
+
+The ETag is derived from the change versions of the listed resources (see
+services/versions.py), the user and the full request path. When the client's
+If-None-Match still matches, the view body — its queryset and serializer —
+never runs and a 304 is returned.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .services import versions
+
+
+def versioned_etag(*resources):
+    def etag_func(request, *args, **kwargs):
+        stamp = versions.current(resources)
+        raw = "|".join([
+            str(request.user.pk),
+            request.get_full_path(),
+            *(f"{name}={stamp[name]}" for name in resources),
+        ])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def decorator(func):
+        conditional = condition(etag_func=etag_func)(func)
+
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            response = conditional(request, *args, **kwargs)
+            # Let browsers keep the body and revalidate with If-None-Match
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return inner
+
+    return decorator
@@ -0,0 +1,142 @@
+"""
+Idempotency-Key support for trainer write endpoints.
+
+    @api_view(["POST"])
+    @permission_classes([IsAuthenticated, IsTrainer])
+    @idempotent
+    def trainer_create_project(request): ...
+
+Trainers submit from phones on patchy networks, so a request can succeed
+while its response is lost. The client then retries. When the request
+carries an Idempotency-Key header, the first successful (2xx/3xx) response
+is stored per user and key for IDEMPOTENCY_TTL seconds. A retry with the
+same key gets that response back, marked with Idempotent-Replayed: true,
+and the view does not run again.
+
+A key is bound to its request: the endpoint and a SHA-256 of the parsed
+body (form fields, plus the contents of any uploaded files). Reusing a key
+on a different endpoint, or with a body that changed, gets a 422 instead of
+someone else's response; clients send a new key when the form changes.
+Views that also stream uploads put @limit_uploads above @idempotent so the
+limits apply while the body is parsed for hashing.
+
+Only successful responses are kept. After a 4xx or 5xx the key is
+released, so the trainer can fix the form and retry with the same key.
+A retry that arrives while the first request is still running gets a
+409.
+
+Requests without the header behave exactly as before.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+IN_PROGRESS_TIMEOUT = timedelta(minutes=5)
+
+
+def _expired(record, now):
+    if record.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_TTL):
+        return True
+    # A claim whose request never finished (the worker died) is abandoned
+    return record.status_code is None and record.created_at < now - IN_PROGRESS_TIMEOUT
+
+
+def _body_hash(request):
+    """SHA-256 of the parsed request body; uploaded files count by content."""
+
+    def encode(value):
+        if isinstance(value, UploadedFile):
+            digest = hashlib.sha256()
+            for chunk in value.chunks():
+                digest.update(chunk)
+            value.seek(0)
+            return {"file": value.name, "sha256": digest.hexdigest()}
+        return value
+
+    data = request.data
+    if hasattr(data, "lists"):  # QueryDict from a form / multipart body
+        data = {name: [encode(v) for v in values] for name, values in data.lists()}
+    raw = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _claim(request, key, body_hash):
+    """Return (record, None) for a new request or (None, response) to send instead."""
+    existing = IdempotencyRecord.objects.filter(user=request.user, key=key).first()
+    if existing is not None and _expired(existing, timezone.now()):
+        existing.delete()
+        existing = None
+
+    if existing is None:
+        try:
+            with transaction.atomic():
+                record = IdempotencyRecord.objects.create(
+                    user=request.user, key=key, method=request.method, path=request.path,
+                    body_hash=body_hash,
+                )
+            return record, None
+        except IntegrityError:
+            # A concurrent retry claimed the key first
+            pass
+    elif (existing.method, existing.path, existing.body_hash) != (
+        request.method, request.path, body_hash,
+    ):
+        return None, Response(
+            {"detail": "This Idempotency-Key was used for a different request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    elif existing.status_code is not None:
+        response = Response(existing.response_body, status=existing.status_code)
+        response["Idempotent-Replayed"] = "true"
+        return None, response
+
+    return None, Response(
+        {"detail": "A request with this Idempotency-Key is still in progress"},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+def idempotent(func):
+    @wraps(func)
+    def inner(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return func(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        record, replay = _claim(request, key, _body_hash(request))
+        if replay is not None:
+            return replay
+        try:
+            response = func(request, *args, **kwargs)
+        except BaseException:
+            record.delete()
+            raise
+
+        if response.status_code >= 400:
+            record.delete()
+        else:
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=["status_code", "response_body"])
+        return response
+
+    return inner
@@ -0,0 +1,57 @@
+"""
+Batched relation loaders for list serializers.
+
+Each loader takes a page of objects (list or queryset) and fetches one
+relation for all of them in a single query, attaching the result where the
+matching serializer method looks for it. Serializers fall back to a per-row
+query when the attribute is absent, so loaders are an optimisation only.
+"""
+
+from django.db.models import Prefetch, prefetch_related_objects
+
+from .models import ProjectHighlight, Student, TrainerAssignment
+
+# School attribute filled by trainer_assignments_prefetch()
+TRAINER_ASSIGNMENTS_ATTR = "_prefetched_trainer_assignments"
+
+
+def load_group_members(projects):
+    """Attach ``group.prefetched_members`` to every project's group in one query."""
+    prefetch_related_objects(
+        [p for p in projects if p.group_id],
+        Prefetch(
+            "group__members",
+            queryset=Student.objects.only("id", "name", "group_id"),
+            to_attr="prefetched_members",
+        ),
+    )
+
+
+def submission_projects_prefetch():
+    """Prefetch for Submission.project_highlights with the FKs the serializer reads."""
+    return Prefetch(
+        "project_highlights",
+        queryset=ProjectHighlight.objects.select_related("school", "group"),
+    )
+
+
+def trainer_assignments_prefetch():
+    """Prefetch for School.trainer_assignments (with trainer) read by the school serializers."""
+    return Prefetch(
+        "trainer_assignments",
+        queryset=TrainerAssignment.objects.select_related("trainer"),
+        to_attr=TRAINER_ASSIGNMENTS_ATTR,
+    )
+
+
+def school_trainer_assignments(school):
+    """The school's assignments, from the prefetch when present."""
+    assignments = getattr(school, TRAINER_ASSIGNMENTS_ATTR, None)
+    if assignments is None:
+        assignments = school.trainer_assignments.select_related("trainer").all()
+    return assignments
+
+
+def group_members_prefetch():
+    """Prefetch for StudentGroup.members with the FKs StudentSerializer reads."""
+    return Prefetch("members", queryset=Student.objects.select_related("school", "group"))
@@ -0,0 +1,271 @@
+"""
+In-process latency benchmark for the dashboard and auth APIs.
+
+Calls every read endpoint as the role that uses it (admin, trainer, sponsor,
+anonymous) through the Django test client against the configured database.
+Per endpoint it reports p50/p95/p99 latency, SQL queries per request and
+response bytes. Run it against seed_synthetic data to see how views.py
+behaves at scale.
+
+Only reads are benchmarked (plus login, which does not write): write endpoints
+would change the data under measurement from one iteration to the next, and
+the SSE stream never completes.
+
+Usage:
+  python manage.py bench_api                              # 50 requests / endpoint
+  python manage.py bench_api --requests 200 --concurrency 8
+  python manage.py bench_api --output bench/baseline.json
+  python manage.py bench_api --compare bench/baseline.json --threshold 0.2
+"""
+
+import json
+import platform
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.dashboard.models import School, Submission
+
+# role -> endpoint paths (relative to /api/); {placeholders} are filled from the data
+ENDPOINTS = {
+    "admin": [
+        "dashboard/summary/",
+        "dashboard/districts/",
+        "dashboard/schools/",
+        "dashboard/schools/{school}/",
+        "dashboard/curriculum/",
+        "dashboard/swinfy/trainers/",
+        "dashboard/swinfy/submissions/",
+        "dashboard/swinfy/submissions/{submission}/",
+        "dashboard/swinfy/photos/pending/",
+        "dashboard/swinfy/projects/pending/",
+        "dashboard/swinfy/uwh-control/",
+        "dashboard/swinfy/activity-log/",
+        "dashboard/swinfy/learning-gains/",
+    ],
+    "trainer": [
+        "dashboard/schools/",
+        "dashboard/curriculum/",
+        "dashboard/trainer/profile/",
+        "dashboard/trainer/submissions/",
+        "dashboard/trainer/submissions/{trainer_submission}/",
+        "dashboard/trainer/students/",
+        "dashboard/trainer/groups/",
+        "dashboard/trainer/projects/",
+        "dashboard/trainer/gallery/",
+        "dashboard/trainer/schools/",
+    ],
+    "sponsor": [
+        "dashboard/summary/",
+        "dashboard/districts/",
+        "dashboard/schools/",
+        "dashboard/uwh/summary/",
+        "dashboard/uwh/gallery/",
+        "dashboard/uwh/projects/",
+        "dashboard/uwh/activity-feed/",
+        "dashboard/uwh/district-progress/",
+        "dashboard/uwh/learning-gains/",
+    ],
+    "anonymous": [
+        "auth/public-schools/",
+        "POST auth/login/",
+    ],
+}
+
+# Compared against the baseline by --compare
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries", "bytes")
+
+
+def percentile(cuts, p):
+    """``cuts`` is statistics.quantiles(n=100); p in 1..99."""
+    return cuts[p - 1]
+
+
+class Command(BaseCommand):
+    help = "Benchmark API endpoints in-process and report p50/p95/p99 latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50,
+                            help="Timed requests per endpoint (default 50)")
+        parser.add_argument("--warmup", type=int, default=3,
+                            help="Untimed requests per endpoint before measuring")
+        parser.add_argument("--concurrency", type=int, default=1,
+                            help="Worker threads issuing requests (default 1)")
+        parser.add_argument("--roles", nargs="+", choices=list(ENDPOINTS),
+                            default=list(ENDPOINTS), help="Roles to benchmark")
+        parser.add_argument("--admin", help="Email of the admin to call as")
+        parser.add_argument("--trainer", help="Email of the trainer to call as")
+        parser.add_argument("--sponsor", help="Email of the sponsor to call as")
+        parser.add_argument("--password", default="synthetic",
+                            help="Admin password for the login benchmark")
+        parser.add_argument("--output", help="Write results to this JSON baseline file")
+        parser.add_argument("--compare", help="Compare against a previous baseline file")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Allowed relative growth before --compare fails (default 0.2)")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2 to compute percentiles")
+
+        users = self.resolve_users(options)
+        ids = self.resolve_ids(users)
+
+        results = {}
+        # The test client sends Host: testserver
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for role in options["roles"]:
+                if role != "anonymous" and users.get(role) is None:
+                    self.stdout.write(self.style.WARNING(f"No {role} user; skipping {role} endpoints"))
+                    continue
+                for endpoint in ENDPOINTS[role]:
+                    method, _, template = endpoint.rpartition(" ")
+                    method = method or "GET"
+                    try:
+                        path = "/api/" + template.format(**ids)
+                    except KeyError as missing:
+                        self.stdout.write(self.style.WARNING(f"  {role:<9} {template}: no {missing} to use"))
+                        continue
+                    key = f"{role} {method} {template}"
+                    results[key] = self.bench(users.get(role), method.lower(), path, options)
+                    self.print_row(key, results[key])
+
+        if options["output"]:
+            baseline = {
+                "created_at": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "requests": options["requests"],
+                "concurrency": options["concurrency"],
+                "endpoints": results,
+            }
+            with open(options["output"], "w") as fh:
+                json.dump(baseline, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['output']}"))
+
+        if options["compare"]:
+            self.compare(results, options["compare"], options["threshold"])
+
+    # ── Setup ────────────────────────────────────────────────────
+
+    def resolve_users(self, options):
+        users = {}
+        for role in ("admin", "sponsor"):
+            qs = User.objects.filter(role=role, is_active=True)
+            users[role] = (qs.filter(email=options[role]) if options[role] else qs.order_by("pk")).first()
+        trainers = User.objects.filter(role="trainer", is_active=True)
+        if options["trainer"]:
+            users["trainer"] = trainers.filter(email=options["trainer"]).first()
+        else:
+            # The busiest trainer exercises the trainer endpoints hardest
+            users["trainer"] = trainers.annotate(n=Count("submissions")).order_by("-n", "pk").first()
+        return users
+
+    def resolve_ids(self, users):
+        ids = {}
+        school = School.objects.order_by("name").first()
+        if school:
+            ids["school"] = school.pk
+        submission = Submission.objects.exclude(status="draft").order_by("-submitted_at").first()
+        if submission:
+            ids["submission"] = submission.pk
+        if users.get("trainer"):
+            own = Submission.objects.filter(trainer=users["trainer"]).order_by("-created_at").first()
+            if own:
+                ids["trainer_submission"] = own.pk
+        return ids
+
+    # ── Measurement ──────────────────────────────────────────────
+
+    def bench(self, user, method, path, options):
+        data = None
+        if path.endswith("/auth/login/"):
+            admin = User.objects.filter(role="admin").order_by("pk").first()
+            data = {"email": admin.email if admin else "", "password": options["password"]}
+
+        def call():
+            client = APIClient()
+            if user is not None:
+                client.force_authenticate(user=user)
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, data, format="json")
+                elapsed = time.perf_counter() - started
+            return elapsed, len(ctx.captured_queries), len(response.content), response.status_code
+
+        def worker(count):
+            try:
+                return [call() for _ in range(count)]
+            finally:
+                # Each thread opened its own connection
+                connection.close()
+
+        def run(count):
+            workers = options["concurrency"]
+            if workers <= 1:
+                return [call() for _ in range(count)]
+            shares = [count // workers + (i < count % workers) for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return [s for batch in pool.map(worker, shares) for s in batch]
+
+        run(options["warmup"])
+        samples = run(options["requests"])
+        timings = [s[0] * 1000 for s in samples]
+        cuts = statistics.quantiles(timings, n=100, method="inclusive")
+        return {
+            "p50_ms": round(percentile(cuts, 50), 2),
+            "p95_ms": round(percentile(cuts, 95), 2),
+            "p99_ms": round(percentile(cuts, 99), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "queries": max(s[1] for s in samples),
+            "bytes": max(s[2] for s in samples),
+            "errors": sum(1 for s in samples if s[3] >= 400),
+            "status": samples[-1][3],
+        }
+
+    def print_row(self, key, r):
+        line = (
+            f"  {key:<62} p50 {r['p50_ms']:>8.1f}ms  p95 {r['p95_ms']:>8.1f}ms  "
+            f"p99 {r['p99_ms']:>8.1f}ms  {r['queries']:>3}q  {r['bytes']:>9,}B"
+        )
+        if r["errors"]:
+            self.stdout.write(self.style.ERROR(f"{line}  HTTP {r['status']} x{r['errors']}"))
+        else:
+            self.stdout.write(line)
+
+    # ── Baseline comparison ──────────────────────────────────────
+
+    def compare(self, results, path, threshold):
+        try:
+            with open(path) as fh:
+                baseline = json.load(fh)["endpoints"]
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read baseline {path}: {exc}")
+
+        regressions = []
+        for key, current in results.items():
+            previous = baseline.get(key)
+            if previous is None:
+                continue
+            for metric in METRICS:
+                before, after = previous.get(metric), current[metric]
+                if before is None:
+                    continue
+                # Query counts are exact; any increase is a regression
+                limit = before if metric == "queries" else before * (1 + threshold)
+                if after > limit:
+                    regressions.append(f"  {key}: {metric} {before} -> {after}")
+
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(line))
+            raise CommandError(f"{len(regressions)} regression(s) against {path}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}."))
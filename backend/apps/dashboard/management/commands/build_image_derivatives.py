@@ -0,0 +1,41 @@
+"""
+Build thumbnail / medium / WebP derivatives for images that lack them.
+
+New uploads get derivatives automatically (services/derivatives.py); this
+backfills rows uploaded before the pipeline existed or whose build failed.
+
+Usage:
+    python manage.py build_image_derivatives            # stale rows only
+    python manage.py build_image_derivatives --force    # rebuild everything
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.services import derivatives
+
+
+class Command(BaseCommand):
+    help = "Generate missing image derivatives for session photos and projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild derivatives even where they are up to date",
+        )
+
+    def handle(self, *args, **options):
+        for model in derivatives.MODELS:
+            rows = model.objects.exclude(image="").exclude(image__isnull=True).only(
+                "pk", "image", "thumbnail"
+            )
+            built = failed = 0
+            for row in rows.iterator():
+                if not options["force"] and not derivatives.is_stale(row):
+                    continue
+                if derivatives.generate(model, row.pk):
+                    built += 1
+                else:
+                    failed += 1
+            self.stdout.write(f"  {model.__name__}: {built} built, {failed} skipped")
+        self.stdout.write(self.style.SUCCESS("Derivatives up to date."))
@@ -0,0 +1,89 @@
+"""
+Import a student roster (CSV or XLSX) into a school.
+
+Same rules as POST trainer/students/import/ (see services/roster.py): every
+row is validated first and nothing is written if any row is invalid; names
+the school already has are skipped.
+
+Usage:
+    python manage.py import_students roster.csv --school "Khairatabad"
+    python manage.py import_students roster.xlsx --school <uuid> --added-by trainer@example.com
+    python manage.py import_students roster.csv --school "Khairatabad" --dry-run
+"""
+
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dashboard.models import School, TrainerAssignment
+from apps.dashboard.services import roster
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import students for a school from a CSV / XLSX roster"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Roster file (.csv or .xlsx)")
+        parser.add_argument("--school", required=True, help="School id, or part of its name")
+        parser.add_argument(
+            "--added-by",
+            help="Email of the user recorded as adding the students "
+                 "(default: the school's trainer)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Validate without writing")
+
+    def handle(self, *args, **options):
+        school = self._school(options["school"])
+        user = self._user(school, options["added_by"])
+
+        try:
+            with open(options["path"], "rb") as fh:
+                result = roster.import_students(
+                    school, user, roster.read_rows(fh, options["path"]),
+                    dry_run=options["dry_run"],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except roster.RosterError as exc:
+            raise CommandError(str(exc))
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if result["errors"]:
+            raise CommandError(f"{len(result['errors'])} invalid row(s); nothing was imported.")
+
+        verb = "Would create" if options["dry_run"] else "Created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['created']} student(s), skipped {len(result['skipped'])} "
+            f"already in '{school.name}'."
+        ))
+
+    def _school(self, value):
+        try:
+            return School.objects.get(pk=uuid.UUID(value))
+        except (ValueError, School.DoesNotExist):
+            pass
+        matches = list(School.objects.filter(name__icontains=value)[:2])
+        if len(matches) != 1:
+            raise CommandError(
+                f"No school matches '{value}'." if not matches
+                else f"More than one school matches '{value}'; use its id."
+            )
+        return matches[0]
+
+    def _user(self, school, email):
+        if email:
+            user = User.objects.filter(email=email).first()
+            if user is None:
+                raise CommandError(f"No user with email {email}.")
+            return user
+        assignment = (
+            TrainerAssignment.objects.filter(school=school).select_related("trainer").first()
+        )
+        user = assignment.trainer if assignment else User.objects.filter(role="admin").first()
+        if user is None:
+            raise CommandError("No trainer or admin user found; pass --added-by.")
+        return user
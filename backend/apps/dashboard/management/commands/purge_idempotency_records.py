@@ -0,0 +1,26 @@
+"""
+Delete stored Idempotency-Key responses older than IDEMPOTENCY_TTL.
+
+Expired records are already ignored (and replaced) when their key is reused;
+this only keeps the table from growing. Run it daily from cron.
+
+Usage:
+    python manage.py purge_idempotency_records
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.dashboard.models import IdempotencyRecord
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than IDEMPOTENCY_TTL"
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_TTL)
+        deleted, _ = IdempotencyRecord.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired record(s)."))
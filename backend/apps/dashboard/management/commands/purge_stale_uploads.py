@@ -0,0 +1,37 @@
+"""
+Delete chunked media uploads and direct-upload drafts that were abandoned.
+
+Removes uploads untouched for --hours (default 24): the temporary file of an
+unfinished upload, or the stored file of a completed upload that was never
+attached to a project. Also deletes draft submissions older than
+DIRECT_UPLOAD_EXPIRES, with the photos uploaded for them. Run it daily from
+cron.
+
+Usage:
+    python manage.py purge_stale_uploads
+    python manage.py purge_stale_uploads --hours 6
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.services import chunked_uploads, direct_upload
+
+
+class Command(BaseCommand):
+    help = "Delete abandoned chunked uploads, direct-upload drafts and their files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours", type=int,
+            default=int(chunked_uploads.STALE_AFTER.total_seconds() // 3600),
+            help="Age in hours after which an untouched upload is abandoned",
+        )
+
+    def handle(self, *args, **options):
+        count = chunked_uploads.purge_stale(timedelta(hours=options["hours"]))
+        drafts = direct_upload.purge_stale_drafts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {count} stale upload(s) and {drafts} abandoned draft(s)."
+        ))
@@ -0,0 +1,47 @@
+"""
+Rebuild the dashboard KPI snapshot from scratch and report any drift.
+
+Usage:
+    python manage.py rebuild_kpis            # report drift, then rebuild
+    python manage.py rebuild_kpis --check    # report drift only; exit 1 if any
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.dashboard.services import kpi
+
+
+class Command(BaseCommand):
+    help = "Rebuild the DashboardKPI snapshot and check it for drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the stored snapshot with fresh values; do not write",
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        drift = kpi.check()
+
+        for role, fields in drift.items():
+            for field, (stored, actual) in fields.items():
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"  {role}.{field}: stored={stored} actual={actual}"
+                    )
+                )
+
+        if options["check"]:
+            if drift:
+                raise CommandError("KPI snapshot has drifted from the source data.")
+            self.stdout.write(self.style.SUCCESS("KPI snapshot is up to date."))
+            return
+
+        kpi.rebuild()
+        fixed = sum(len(fields) for fields in drift.values())
+        self.stdout.write(
+            self.style.SUCCESS(f"KPI snapshot rebuilt ({fixed} drifted values corrected).")
+        )
@@ -0,0 +1,128 @@
+"""
+Run background tasks from the database queue (see services/tasks.py).
+
+Starts --concurrency worker threads that claim and run due tasks, sleeping
+--poll-interval seconds when the queue is empty. Once a minute the main
+thread sends the heartbeat for the tasks its threads are running, requeues
+tasks abandoned by crashed workers, and purges old finished tasks and sent
+emails. SIGTERM / Ctrl-C lets running tasks finish, then exits.
+
+Nothing else starts it: run one or more under a process supervisor
+(systemd, supervisord) next to the web server, e.g. as Procfile entries:
+
+    web:      uvicorn config.asgi:application --workers 2
+    worker:   python manage.py run_worker --concurrency 4
+    priority: python manage.py run_worker --queues priority --concurrency 1
+
+The small priority-lane worker keeps OTP emails moving while the general
+workers are busy with batches. Without any worker, queued tasks just wait;
+the web process logs a warning at startup when that has been happening.
+Development servers run tasks in-process instead (TASK_QUEUE_EAGER, on by
+default under DEBUG).
+
+Usage:
+    python manage.py run_worker
+    python manage.py run_worker --concurrency 4
+    python manage.py run_worker --queues priority
+    python manage.py run_worker --once        # drain the queue, then exit
+"""
+
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from apps.dashboard.services import email, tasks
+
+MAINTENANCE_INTERVAL = tasks.HEARTBEAT_INTERVAL.total_seconds()
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=2,
+            help="Number of worker threads",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0,
+            help="Seconds to wait when no task is due",
+        )
+        parser.add_argument(
+            "--queues",
+            type=lambda value: [q.strip() for q in value.split(",") if q.strip()],
+            help="Comma-separated lanes to serve (default: all)",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Exit once no task is due instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        name = f"{socket.gethostname()}:{os.getpid()}"
+
+        if options["once"]:
+            tasks.requeue_stale()
+            beat = threading.Thread(target=self._beat, args=([name],), name="task-heartbeat")
+            beat.start()
+            try:
+                ran = tasks.run_pending(name, options["queues"])
+            finally:
+                self.stop.set()
+                beat.join()
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} task(s)."))
+            return
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: self.stop.set())
+
+        workers = [f"{name}:{i}" for i in range(options["concurrency"])]
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(worker, options["queues"], options["poll_interval"]),
+                name=f"task-worker-{i}",
+            )
+            for i, worker in enumerate(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"Worker {name} started with {len(threads)} thread(s).")
+
+        while not self.stop.is_set():
+            tasks.heartbeat(workers)
+            tasks.requeue_stale()
+            tasks.purge_finished()
+            email.purge_sent()
+            close_old_connections()
+            self.stop.wait(MAINTENANCE_INTERVAL)
+
+        self.stdout.write("Stopping; waiting for running tasks to finish...")
+        for thread in threads:
+            thread.join()
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
+
+    def _beat(self, workers):
+        """Heartbeat for ``workers`` until stopped (the --once run has no main loop)."""
+        try:
+            while not self.stop.wait(MAINTENANCE_INTERVAL):
+                tasks.heartbeat(workers)
+        finally:
+            connection.close()
+
+    def _work(self, worker, queues, poll_interval):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                task = tasks.claim(worker, queues)
+                if task is None:
+                    self.stop.wait(poll_interval)
+                else:
+                    tasks.execute(task)
+        finally:
+            connection.close()
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from apps.dashboard.models import School, Student
+from apps.dashboard.services import roster
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -94,26 +95,18 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR("No trainer or admin user found."))
             return
 
-        created = 0
-        skipped = 0
-        for name, baseline in STUDENTS:
-            _, was_created = Student.objects.get_or_create(
-                name=name,
-                school=school,
-                defaults={
-                    "added_by": trainer,
-                    "baseline_marks": baseline,
-                },
-            )
-            if was_created:
-                created += 1
-            else:
-                skipped += 1
-
-        school.total_students = Student.objects.filter(school=school).count()
-        school.save(update_fields=["total_students"])
+        # One lookup for existing names and one bulk insert (see services/roster.py)
+        rows = [
+            (i, {"name": name} if baseline is None else {"name": name, "baseline_marks": baseline})
+            for i, (name, baseline) in enumerate(STUDENTS, start=1)
+        ]
+        result = roster.import_students(school, trainer, rows)
+        if result["errors"]:
+            self.stderr.write(self.style.ERROR(f"Invalid rows: {result['errors']}"))
+            return
 
         self.stdout.write(self.style.SUCCESS(
-            f"Done: {created} created, {skipped} already existed. "
-            f"School '{school.name}' now has {school.total_students} students."
+            f"Done: {result['created']} created, {len(result['skipped'])} already existed. "
+            f"School '{school.name}' now has "
+            f"{Student.objects.filter(school=school).count()} students."
         ))
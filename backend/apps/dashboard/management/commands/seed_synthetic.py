@@ -0,0 +1,336 @@
+"""
+Generate a synthetic programme at N× the size of the real TMREIS roll-out.
+
+Scale 1 mirrors the real programme (40 schools across 7 districts, 4 days);
+every other volume grows linearly with --scale:
+
+  per school   1–2 trainers, 57 students in 6 groups, 4 submissions
+               with 5 photos each, 10 projects
+  globally     7 districts, 1 admin and 1 sponsor per 40 schools
+
+Rows are written with bulk_create in batches. UUID primary keys, names,
+statuses and marks are drawn from a seeded RNG, so the same --seed always
+yields the same dataset. bulk_create skips signals, so the KPI snapshot and
+resource versions are rebuilt once at the end. All synthetic users share the
+password "synthetic".
+
+Usage:
+  python manage.py seed_synthetic --scale 10
+  python manage.py seed_synthetic --scale 100 --images none --seed 7
+  python manage.py seed_synthetic --flush     # remove synthetic rows and photo files
+"""
+
+import io
+import random
+import time
+import uuid
+from itertools import islice
+
+from PIL import Image
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.dashboard.models import (
+    Curriculum,
+    District,
+    ProjectHighlight,
+    School,
+    SessionPhoto,
+    Student,
+    StudentGroup,
+    Submission,
+    TrainerAssignment,
+    UWHControl,
+)
+from apps.dashboard import signals
+from apps.dashboard.services import kpi, versions
+
+EMAIL_DOMAIN = "synthetic.test"
+DISTRICT_PREFIX = "Synthetic"
+PASSWORD = "synthetic"
+# Generated photo files; --flush empties it
+PHOTO_DIR = "session_photos/synthetic"
+
+SCHOOLS_PER_SCALE = 40
+DISTRICTS_PER_SCALE = 7
+DAYS = 4
+STUDENTS_PER_SCHOOL = 57
+GROUPS_PER_SCHOOL = 6
+PHOTOS_PER_SUBMISSION = 5
+PROJECTS_PER_SCHOOL = 10
+
+FIRST_NAMES = [
+    "Aafiya", "Akhila", "Amna", "Asma", "Ayesha", "Fatima", "Iram", "Kavya",
+    "Keerthi", "Mahek", "Mercy", "Nuha", "Pallavi", "Saloni", "Sameera",
+    "Shanvi", "Sidra", "Srivalli", "Varshitha", "Zareen",
+]
+LAST_NAMES = ["Begum", "Khan", "Reddy", "Rao", "Sulthana", "Naaz", "Parveen", "Fathima"]
+PROJECT_WORDS = [
+    "Smart", "Green", "Water", "Solar", "Health", "Safety", "Story", "Music",
+    "Traffic", "Farm", "Quiz", "Helper", "Tracker", "Garden", "Robot",
+]
+SUBMISSION_STATUSES = ["verified", "verified", "submitted", "flagged", "rejected"]
+PHOTO_STATUSES = ["approved", "approved", "pending", "rejected"]
+PROJECT_STATUSES = ["approved", "featured", "pending", "pending", "rejected"]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def jpeg_bytes(rng, size=(320, 240)):
+    colour = tuple(rng.randrange(256) for _ in range(3))
+    buf = io.BytesIO()
+    Image.new("RGB", size, color=colour).save(buf, format="JPEG", quality=70)
+    return buf.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic dataset at N× the real programme size"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", type=int, default=1,
+            help="Multiple of the real 40-school programme to generate (default 1)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="RNG seed; the same seed always produces the same rows",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Rows per bulk_create batch",
+        )
+        parser.add_argument(
+            "--images", choices=["placeholder", "real", "none"], default="placeholder",
+            help="placeholder: one shared JPEG; real: one JPEG per photo; "
+                 "none: photo rows point at files that do not exist",
+        )
+        parser.add_argument(
+            "--flush", action="store_true",
+            help="Delete previously generated synthetic data and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            self.flush()
+            return
+        if options["scale"] < 1:
+            raise CommandError("--scale must be at least 1")
+        if District.objects.filter(name__startswith=f"{DISTRICT_PREFIX} ").exists():
+            raise CommandError(
+                "Synthetic data already exists; run with --flush first."
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.images = options["images"]
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        with transaction.atomic():
+            counts = self.generate(options["scale"])
+            kpi.rebuild()
+            versions.bump(*versions.RESOURCES)
+
+        elapsed = time.monotonic() - started
+        total = sum(counts.values())
+        for label, count in counts.items():
+            self.stdout.write(f"  {label:<12} {count:>10,}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {total:,} rows in {elapsed:.1f}s.")
+        )
+
+    # ── Generation ───────────────────────────────────────────────
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def insert(self, model, rows):
+        count = 0
+        for batch in batched(rows, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            count += len(batch)
+        return count
+
+    def generate(self, scale):
+        rng = self.rng
+        n_schools = SCHOOLS_PER_SCALE * scale
+        password = make_password(PASSWORD)  # hashed once, shared by every row
+        counts = {}
+
+        for c in range(1, DAYS + 1):
+            Curriculum.objects.get_or_create(day_number=c, defaults={"title": f"Day {c}"})
+        UWHControl.load()
+
+        district_ids = [self.uuid() for _ in range(DISTRICTS_PER_SCALE * scale)]
+        counts["districts"] = self.insert(District, (
+            District(id=pk, name=f"{DISTRICT_PREFIX} {i + 1:04d}")
+            for i, pk in enumerate(district_ids)
+        ))
+
+        staff = []
+        for i in range(scale):
+            staff.append(User(
+                email=f"admin{i}@{EMAIL_DOMAIN}", username=f"synthetic-admin-{i}",
+                role="admin", password=password, is_email_verified=True,
+            ))
+            staff.append(User(
+                email=f"sponsor{i}@{EMAIL_DOMAIN}", username=f"synthetic-sponsor-{i}",
+                role="sponsor", password=password, is_email_verified=True,
+            ))
+        User.objects.bulk_create(staff)
+        admin_id = staff[0].pk
+
+        trainers = []  # per school: indexes into trainer_rows
+        trainer_rows = []
+        for s in range(n_schools):
+            ids = []
+            for t in range(1 + (s % 2)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                trainer_rows.append(User(
+                    email=f"trainer{s}-{t}@{EMAIL_DOMAIN}",
+                    username=f"synthetic-trainer-{s}-{t}",
+                    first_name=first, last_name=last, role="trainer",
+                    password=password, is_email_verified=True,
+                ))
+                ids.append(len(trainer_rows) - 1)
+            trainers.append(ids)
+        counts["users"] = len(staff) + self.insert(User, trainer_rows)
+        # bulk_create sets the database-assigned integer pks on the instances
+        trainers = [[trainer_rows[i].pk for i in ids] for ids in trainers]
+
+        school_ids = [self.uuid() for _ in range(n_schools)]
+        counts["schools"] = self.insert(School, (
+            School(
+                id=pk, name=f"Synthetic School {s + 1:05d}",
+                district_id=district_ids[s % len(district_ids)],
+                total_students=STUDENTS_PER_SCHOOL,
+                status=rng.choice(["completed", "in_progress", "in_progress", "not_started"]),
+                poc_name=self.name(), poc_phone=f"9{rng.randrange(10**9):09d}",
+            )
+            for s, pk in enumerate(school_ids)
+        ))
+
+        counts["assignments"] = self.insert(TrainerAssignment, (
+            TrainerAssignment(
+                id=self.uuid(), trainer_id=trainer_id, school_id=school_ids[s],
+                role="primary" if t == 0 else "secondary", assigned_by_id=admin_id,
+            )
+            for s, ids in enumerate(trainers)
+            for t, trainer_id in enumerate(ids)
+        ))
+
+        group_ids = [[self.uuid() for _ in range(GROUPS_PER_SCHOOL)] for _ in school_ids]
+        counts["groups"] = self.insert(StudentGroup, (
+            StudentGroup(
+                id=group_ids[s][g], name=f"Team {g + 1}", school_id=school_ids[s],
+                created_by_id=trainers[s][0],
+            )
+            for s in range(n_schools)
+            for g in range(GROUPS_PER_SCHOOL)
+        ))
+
+        counts["students"] = self.insert(Student, (
+            Student(
+                id=self.uuid(), name=self.name(), age=rng.randint(11, 15),
+                grade=str(rng.randint(6, 9)), school_id=school_ids[s],
+                group_id=group_ids[s][i % GROUPS_PER_SCHOOL],
+                added_by_id=trainers[s][0],
+                baseline_marks=rng.randint(20, 60), endline_marks=rng.randint(50, 95),
+            )
+            for s in range(n_schools)
+            for i in range(STUDENTS_PER_SCHOOL)
+        ))
+
+        submission_ids = [[self.uuid() for _ in range(DAYS)] for _ in school_ids]
+        counts["submissions"] = self.insert(Submission, (
+            Submission(
+                id=submission_ids[s][d], school_id=school_ids[s],
+                trainer_id=trainers[s][d % len(trainers[s])], day_number=d + 1,
+                student_count=rng.randint(40, STUDENTS_PER_SCHOOL),
+                status=rng.choice(SUBMISSION_STATUSES), submitted_at=self.now,
+                topics_covered=["AI basics"], trainer_notes="Synthetic session",
+            )
+            for s in range(n_schools)
+            for d in range(DAYS)
+        ))
+
+        counts["photos"] = self.insert(SessionPhoto, (
+            SessionPhoto(
+                id=pk, submission_id=submission_id, image=self.photo_name(pk),
+                approval_status=status, is_featured=status == "approved" and rng.random() < 0.1,
+            )
+            for submissions in submission_ids
+            for submission_id in submissions
+            for pk, status in (
+                (self.uuid(), rng.choice(PHOTO_STATUSES))
+                for _ in range(PHOTOS_PER_SUBMISSION)
+            )
+        ))
+
+        counts["projects"] = self.insert(ProjectHighlight, (
+            ProjectHighlight(
+                id=self.uuid(), school_id=school_ids[s], trainer_id=trainers[s][0],
+                submission_id=submission_ids[s][p % DAYS] if p % 2 else None,
+                group_id=group_ids[s][p % GROUPS_PER_SCHOOL],
+                student_name=f"Team {p % GROUPS_PER_SCHOOL + 1}",
+                title=" ".join(rng.sample(PROJECT_WORDS, 2)),
+                description="A student-built project from the AI literacy programme.",
+                approval_status=rng.choice(PROJECT_STATUSES),
+            )
+            for s in range(n_schools)
+            for p in range(PROJECTS_PER_SCHOOL)
+        ))
+        return counts
+
+    def photo_name(self, pk):
+        if self.images == "none":
+            return f"{PHOTO_DIR}/{pk}.jpg"
+        if self.images == "placeholder":
+            if not hasattr(self, "placeholder"):
+                self.placeholder = default_storage.save(
+                    f"{PHOTO_DIR}/placeholder.jpg",
+                    ContentFile(jpeg_bytes(random.Random(0))),
+                )
+            return self.placeholder
+        return default_storage.save(
+            f"{PHOTO_DIR}/{pk}.jpg", ContentFile(jpeg_bytes(self.rng))
+        )
+
+    # ── Cleanup ──────────────────────────────────────────────────
+
+    def flush(self):
+        # Per-row KPI / version receivers would fire for every cascaded row;
+        # with them off each table is one DELETE and both are rebuilt once
+        with signals.muted(), transaction.atomic():
+            # Schools cascade to assignments, groups, students, submissions,
+            # photos and projects
+            School.objects.filter(district__name__startswith=f"{DISTRICT_PREFIX} ").delete()
+            District.objects.filter(name__startswith=f"{DISTRICT_PREFIX} ").delete()
+            User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").delete()
+            kpi.rebuild()
+            versions.bump(*versions.RESOURCES)
+        removed = self.delete_photo_files()
+        self.stdout.write(self.style.WARNING(
+            f"Synthetic data removed ({removed} photo files deleted)."
+        ))
+
+    def delete_photo_files(self):
+        try:
+            _, names = default_storage.listdir(PHOTO_DIR)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            default_storage.delete(f"{PHOTO_DIR}/{name}")
+        return len(names)
@@ -3,10 +3,14 @@ Management command to send scheduled emails.
 
 Run daily via cron / task scheduler:
     python manage.py send_scheduled_emails
+    python manage.py send_scheduled_emails --flush   # send the outbox now
 
 Handles:
   - Principal same-day session confirmation (sessions happening today)
   - Session reminder for trainer + principal (sessions happening tomorrow)
+
+Emails are written to the outbox and delivered over one SMTP connection by
+`python manage.py run_worker`, or by this command with --flush.
 """
 
 from datetime import date, timedelta
@@ -15,6 +19,7 @@ from django.core.management.base import BaseCommand
 
 from apps.dashboard.models import School, TrainerAssignment
 from apps.dashboard.program_config import DAY_SCHEDULE
+from apps.dashboard.services import email
 from apps.dashboard.services.notifications import (
     notify_principal_session_today,
     notify_session_reminder,
@@ -24,6 +29,12 @@ from apps.dashboard.services.notifications import (
 class Command(BaseCommand):
     help = "Send scheduled session emails (same-day confirmations + 24h reminders)"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flush", action="store_true",
+            help="Send the outbox before exiting instead of leaving it to run_worker",
+        )
+
     def handle(self, *args, **options):
         today = date.today()
         tomorrow = today + timedelta(days=1)
@@ -36,6 +47,9 @@ class Command(BaseCommand):
                 f"Done. Today confirmations: {today_sent}, Tomorrow reminders: {reminder_sent}"
             )
         )
+        if options["flush"]:
+            sent, retry = email.send_outbox()
+            self.stdout.write(f"Outbox: {sent} sent, {retry} left for retry.")
 
     def _send_today_confirmations(self, today: date) -> int:
         """Send principal same-day confirmation for sessions happening today."""
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.11 on 2026-10-18 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0013_remove_school_assigned_trainer_and_second_trainer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardKPI',
+            fields=[
+                ('role', models.CharField(choices=[('admin', 'Admin'), ('sponsor', 'Sponsor')], max_length=20, primary_key=True, serialize=False)),
+                ('total_schools', models.IntegerField(default=0)),
+                ('schools_completed', models.IntegerField(default=0)),
+                ('schools_in_progress', models.IntegerField(default=0)),
+                ('total_students', models.IntegerField(default=0)),
+                ('total_districts', models.IntegerField(default=0)),
+                ('students_trained', models.IntegerField(default=0)),
+                ('total_sessions', models.IntegerField(default=0)),
+                ('pending_submissions', models.IntegerField(default=0)),
+                ('pending_photos', models.IntegerField(default=0)),
+                ('pending_projects', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard KPI',
+                'verbose_name_plural': 'Dashboard KPIs',
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.11 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0015_resourceversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projecthighlight',
+            name='image_medium',
+            field=models.ImageField(blank=True, editable=False, upload_to='project_images/derived/'),
+        ),
+        migrations.AddField(
+            model_name='projecthighlight',
+            name='image_webp',
+            field=models.ImageField(blank=True, editable=False, upload_to='project_images/derived/'),
+        ),
+        migrations.AddField(
+            model_name='projecthighlight',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='project_images/derived/'),
+        ),
+        migrations.AddField(
+            model_name='sessionphoto',
+            name='image_medium',
+            field=models.ImageField(blank=True, editable=False, upload_to='session_photos/derived/'),
+        ),
+        migrations.AddField(
+            model_name='sessionphoto',
+            name='image_webp',
+            field=models.ImageField(blank=True, editable=False, upload_to='session_photos/derived/'),
+        ),
+        migrations.AddField(
+            model_name='sessionphoto',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='session_photos/derived/'),
+        ),
+    ]
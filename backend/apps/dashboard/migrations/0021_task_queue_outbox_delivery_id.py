@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-18 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0020_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_claim_idx',
+        ),
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='delivery_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='queue',
+            field=models.CharField(default='default', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['queue', 'status', '-priority', 'run_at'], name='task_claim_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-18 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0021_task_queue_outbox_delivery_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projecthighlight',
+            index=models.Index(fields=['created_at', 'id'], name='highlight_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sessionphoto',
+            index=models.Index(fields=['uploaded_at', 'id'], name='photo_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['created_at', 'id'], name='student_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['created_at', 'id'], name='submission_keyset_idx'),
+        ),
+    ]
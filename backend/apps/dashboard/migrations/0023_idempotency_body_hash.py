@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-18 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0022_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencyrecord',
+            name='body_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.11 on 2026-10-18 23:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0023_idempotency_body_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='baseline_marks',
+            field=models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='endline_marks',
+            field=models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
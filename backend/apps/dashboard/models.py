@@ -1,6 +1,13 @@
 import uuid
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
+
+from .program_config import MAX_MARKS
+
+MARKS_VALIDATORS = [MinValueValidator(0), MaxValueValidator(MAX_MARKS)]
 
 
 class District(models.Model):
@@ -136,13 +143,17 @@ class Student(models.Model):
     parent_name = models.CharField(max_length=255, blank=True)
     parent_phone = models.CharField(max_length=20, blank=True)
     notes = models.TextField(blank=True)
-    baseline_marks = models.IntegerField(blank=True, null=True)
-    endline_marks = models.IntegerField(blank=True, null=True)
+    baseline_marks = models.IntegerField(blank=True, null=True, validators=MARKS_VALIDATORS)
+    endline_marks = models.IntegerField(blank=True, null=True, validators=MARKS_VALIDATORS)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # Keyset pagination seeks on (created_at, id); see pagination.py
+            models.Index(fields=["created_at", "id"], name="student_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.school.name})"
@@ -227,6 +238,9 @@ class Submission(models.Model):
     class Meta:
         ordering = ["-created_at"]
         unique_together = ["school", "day_number"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="submission_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.school.name} - Day {self.day_number}"
@@ -245,6 +259,11 @@ class SessionPhoto(models.Model):
     image = models.ImageField(upload_to="session_photos/")
     caption = models.CharField(max_length=500, blank=True)
 
+    # --- Derivatives (filled off the request path by services/derivatives.py) ---
+    thumbnail = models.ImageField(upload_to="session_photos/derived/", blank=True, editable=False)
+    image_medium = models.ImageField(upload_to="session_photos/derived/", blank=True, editable=False)
+    image_webp = models.ImageField(upload_to="session_photos/derived/", blank=True, editable=False)
+
     # --- Swinfy Control ---
     approval_status = models.CharField(
         max_length=20,
@@ -266,6 +285,9 @@ class SessionPhoto(models.Model):
 
     class Meta:
         ordering = ["uploaded_at"]
+        indexes = [
+            models.Index(fields=["uploaded_at", "id"], name="photo_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"Photo for {self.submission} ({self.approval_status})"
@@ -319,6 +341,9 @@ class ProjectHighlight(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     image = models.ImageField(upload_to="project_images/", blank=True, null=True)
+    thumbnail = models.ImageField(upload_to="project_images/derived/", blank=True, editable=False)
+    image_medium = models.ImageField(upload_to="project_images/derived/", blank=True, editable=False)
+    image_webp = models.ImageField(upload_to="project_images/derived/", blank=True, editable=False)
     media_file = models.FileField(upload_to="project_media/", blank=True, null=True)
     website_url = models.URLField(max_length=500, blank=True)
 
@@ -344,6 +369,9 @@ class ProjectHighlight(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="highlight_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.student_name}"
@@ -423,3 +451,190 @@ class UWHControl(models.Model):
     def load(cls):
         obj, _ = cls.objects.get_or_create(pk=1)
         return obj
+
+
+class DashboardKPI(models.Model):
+    """Precomputed dashboard counters — one row per role.
+
+    Kept up to date incrementally by the signals in signals.py; rebuild or
+    check for drift with ``python manage.py rebuild_kpis``.
+    """
+
+    class Role(models.TextChoices):
+        ADMIN = "admin", "Admin"
+        SPONSOR = "sponsor", "Sponsor"
+
+    role = models.CharField(max_length=20, choices=Role.choices, primary_key=True)
+    total_schools = models.IntegerField(default=0)
+    schools_completed = models.IntegerField(default=0)
+    schools_in_progress = models.IntegerField(default=0)
+    total_students = models.IntegerField(default=0)
+    total_districts = models.IntegerField(default=0)
+    students_trained = models.IntegerField(default=0)
+    total_sessions = models.IntegerField(default=0)
+    pending_submissions = models.IntegerField(default=0)
+    pending_photos = models.IntegerField(default=0)
+    pending_projects = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Dashboard KPI"
+        verbose_name_plural = "Dashboard KPIs"
+
+    def __str__(self):
+        return f"KPIs — {self.role}"
+
+
+class ResourceVersion(models.Model):
+    """Change counter per API resource, bumped on every write to its models.
+
+    Polled views derive their ETag from these counters (see conditional.py).
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class IdempotencyRecord(models.Model):
+    """Response to a trainer write, replayed when its Idempotency-Key is retried.
+
+    status_code is null while the first request is still running. Rows
+    expire after IDEMPOTENCY_TTL (see idempotency.py).
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_records",
+    )
+    key = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    # SHA-256 of the request body; a key is not replayed for a different body
+    body_hash = models.CharField(max_length=64, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ["user", "key"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} [{self.key}]"
+
+
+class ChunkedUpload(models.Model):
+    """A resumable upload of a large project media file (see services/chunked_uploads.py).
+
+    Chunks are written at their offsets into a temporary file; once every
+    byte has arrived the file is moved to storage and ``stored_name`` is set.
+    """
+
+    class Status(models.TextChoices):
+        UPLOADING = "uploading", "Uploading"
+        COMPLETE = "complete", "Complete"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="chunked_uploads",
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.UPLOADING
+    )
+    stored_name = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+class Task(models.Model):
+    """A unit of background work run by ``manage.py run_worker`` (see services/tasks.py).
+
+    ``name`` is the dotted path of a function decorated with @tasks.task;
+    ``args`` / ``kwargs`` must be JSON-serialisable.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        DEAD = "dead", "Dead"
+
+    name = models.CharField(max_length=255)
+    # Lane; run_worker --queues picks which lanes a worker serves
+    queue = models.CharField(max_length=50, default="default")
+    args = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    # Higher runs first
+    priority = models.SmallIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["queue", "status", "-priority", "run_at"], name="task_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
+
+
+class EmailOutbox(models.Model):
+    """A rendered email waiting to be sent (see services/email.py).
+
+    send_email() writes rows here; the outbox sender drains them in
+    priority order over one SMTP connection and records each outcome.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    to = models.JSONField(default=list)
+    # Set on messages whose delivery a client may poll (OTP emails)
+    delivery_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+    subject = models.CharField(max_length=255)
+    text_body = models.TextField()
+    html_body = models.TextField(blank=True)
+    reply_to = models.CharField(max_length=254, blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    # Higher sends first
+    priority = models.SmallIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "email outbox"
+        indexes = [
+            models.Index(fields=["status", "-priority", "created_at"], name="outbox_send_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} [{self.status}]"
@@ -0,0 +1,158 @@
+import base64
+import binascii
+import json
+import operator
+from datetime import datetime
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.db.models.fields.tuple_lookups import Tuple, TupleGreaterThan, TupleLessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (seek) pagination over a stable ordering.
+
+    List endpoints keep returning a plain array unless the client sends
+    ?page_size= or ?cursor=, in which case they return
+    {"next": <url>, "previous": <url>, "results": [...]}.
+
+    The cursor holds the full ordering key of the row it points at, e.g.
+    (created_at, id), and a page is a row-value comparison on that tuple:
+
+        (created_at, id) < (c, i)
+
+    which Postgres answers with one seek on the matching composite index
+    (see the Meta.indexes of the paginated models). Rows sharing a
+    timestamp are neither skipped nor repeated, and deep pages cost the
+    same as the first one (no OFFSET). Backends without row values get the
+    equivalent OR-expanded WHERE from Django.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering):
+        # e.g. ("-created_at", "-id"); the last field must be unique
+        self.ordering = tuple(ordering)
+        self.has_next = self.has_previous = False
+        self.page = []
+
+    def get_page_size(self, request):
+        params = request.query_params
+        if self.page_size_query_param not in params and self.cursor_query_param not in params:
+            return None
+        try:
+            size = int(params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        if size <= 0:
+            size = self.page_size
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if page_size is None:
+            return None
+
+        self.request = request
+        self.model = queryset.model
+        cursor = self.decode_cursor(request)
+        backwards = bool(cursor and cursor["reverse"])
+
+        ordering = self._reversed(self.ordering) if backwards else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(ordering, cursor["position"]))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        self.page = rows[:page_size]
+        if backwards:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = cursor is not None, has_more
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        # Full precision: DjangoJSONEncoder would cut datetimes to milliseconds
+        position = [
+            value.isoformat() if isinstance(value, datetime) else str(value)
+            for value in (getattr(row, name.lstrip("-")) for name in self.ordering)
+        ]
+        raw = json.dumps({"p": position, "r": int(reverse)})
+        token = base64.urlsafe_b64encode(raw.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position = [
+                self.model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, data["p"], strict=True)
+            ]
+            return {"position": position, "reverse": bool(data.get("r"))}
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    @staticmethod
+    def _reversed(ordering):
+        return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+    @staticmethod
+    def _after(ordering, position):
+        """Rows strictly after ``position`` in ``ordering``."""
+        directions = {name.startswith("-") for name in ordering}
+        if len(directions) == 1:
+            columns = Tuple(*(F(name.lstrip("-")) for name in ordering))
+            lookup = TupleLessThan if directions.pop() else TupleGreaterThan
+            return lookup(columns, tuple(position))
+        # Mixed directions have no row-value form; expand lexicographically
+        terms = []
+        for i, name in enumerate(ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            equal = {other.lstrip("-"): value for other, value in zip(ordering[:i], position)}
+            terms.append(Q(**equal, **{f"{name.lstrip('-')}__{lookup}": position[i]}))
+        return reduce(operator.or_, terms)
+
+
+def paginated_response(request, queryset, ordering, serialize):
+    """
+    Serialize ``queryset`` whole, or one keyset page of it if the client
+    asked for pagination. ``serialize`` maps a queryset/list to response data.
+    """
+    paginator = KeysetPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    if page is None:
+        return Response(serialize(queryset))
+    return paginator.get_paginated_response(serialize(page))
@@ -41,7 +41,22 @@ DAY_SCHEDULE = {
 }
 
 # Media upload limits
+MIN_PHOTOS_PER_SESSION = 3  # photos required to submit a day's session
+MAX_PHOTOS_PER_SESSION = 5
 MAX_PHOTOS_PER_SUBMISSION = 20
 MAX_PHOTO_SIZE_MB = 10
 ALLOWED_PHOTO_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp"]
 MAX_PROJECTS_PER_SUBMISSION = 10
+MAX_MEDIA_SIZE_MB = 500  # project video / music, uploaded in chunks
+ALLOWED_MEDIA_EXTENSIONS = [".mp4", ".mov", ".webm", ".m4v", ".mp3", ".m4a", ".wav", ".ogg", ".aac"]
+
+# Student roster import (CSV / XLSX)
+MAX_ROSTER_SIZE_MB = 5
+MAX_ROSTER_ROWS = 2000
+ALLOWED_ROSTER_EXTENSIONS = [".csv", ".xlsx"]
+
+# Baseline / endline assessment marks, whole numbers from 0 to MAX_MARKS
+MAX_MARKS = 100
+
+# Bulk baseline / endline marks entry
+MAX_MARKS_PER_REQUEST = 2000
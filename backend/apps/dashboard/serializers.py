@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models import Prefetch
 from .models import (
     District,
     School,
@@ -13,10 +15,22 @@ from .models import (
     StudentGroup,
     TrainerAssignment,
 )
+from .loaders import load_group_members, school_trainer_assignments
+from .program_config import MAX_MARKS
 
 User = get_user_model()
 
 
+def _file_url(serializer, file):
+    """Absolute URL for a stored file (when a request is in context), else None."""
+    if not file:
+        return None
+    request = serializer.context.get("request")
+    if request:
+        return request.build_absolute_uri(file.url)
+    return file.url
+
+
 class DistrictSerializer(serializers.ModelSerializer):
     school_count = serializers.IntegerField(read_only=True, default=0)
 
@@ -38,9 +52,6 @@ class SchoolListSerializer(serializers.ModelSerializer):
         ]
 
     def get_trainers_list(self, obj):
-        assignments = getattr(obj, "_prefetched_trainer_assignments", None)
-        if assignments is None:
-            assignments = obj.trainer_assignments.select_related("trainer").all()
         return [
             {
                 "id": str(a.trainer_id),
@@ -49,7 +60,7 @@ class SchoolListSerializer(serializers.ModelSerializer):
                 "role": a.role,
                 "assignment_id": str(a.id),
             }
-            for a in assignments
+            for a in school_trainer_assignments(obj)
         ]
 
 
@@ -69,11 +80,13 @@ class SchoolDetailSerializer(serializers.ModelSerializer):
                 "name": a.trainer.get_full_name() or a.trainer.username,
                 "role": a.role,
             }
-            for a in obj.trainer_assignments.select_related("trainer").all()
+            for a in school_trainer_assignments(obj)
         ]
 
     def get_submissions(self, obj):
-        return SubmissionListSerializer(obj.submissions.all(), many=True).data
+        return SubmissionListSerializer(
+            obj.submissions.select_related("school", "trainer"), many=True
+        ).data
 
 
 class CurriculumSerializer(serializers.ModelSerializer):
@@ -84,11 +97,15 @@ class CurriculumSerializer(serializers.ModelSerializer):
 
 class SessionPhotoSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    medium_url = serializers.SerializerMethodField()
+    webp_url = serializers.SerializerMethodField()
 
     class Meta:
         model = SessionPhoto
         fields = [
-            "id", "image", "image_url", "caption", "approval_status",
+            "id", "image", "image_url", "thumbnail_url", "medium_url", "webp_url",
+            "caption", "approval_status",
             "is_featured", "rejection_reason", "uploaded_at",
         ]
         read_only_fields = [
@@ -104,9 +121,31 @@ class SessionPhotoSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    # Derivatives are built after upload; null until they exist
+    def get_thumbnail_url(self, obj):
+        return _file_url(self, obj.thumbnail)
+
+    def get_medium_url(self, obj):
+        return _file_url(self, obj.image_medium)
+
+    def get_webp_url(self, obj):
+        return _file_url(self, obj.image_webp)
+
+
+class ProjectHighlightListSerializer(serializers.ListSerializer):
+    """Batch-loads group members for the whole list before rendering rows."""
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        load_group_members(rows)
+        return super().to_representation(rows)
+
 
 class ProjectHighlightSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    medium_url = serializers.SerializerMethodField()
+    webp_url = serializers.SerializerMethodField()
     media_file_url = serializers.SerializerMethodField()
     display_description = serializers.SerializerMethodField()
     group_name = serializers.CharField(source="group.name", read_only=True, default=None)
@@ -118,6 +157,7 @@ class ProjectHighlightSerializer(serializers.ModelSerializer):
         fields = [
             "id", "student_name", "student_age", "student_grade",
             "title", "description", "image", "image_url",
+            "thumbnail_url", "medium_url", "webp_url",
             "project_type", "group", "group_name", "group_members",
             "media_file", "media_file_url", "website_url", "school_name",
             "approval_status", "rejection_reason", "uwh_description",
@@ -127,6 +167,7 @@ class ProjectHighlightSerializer(serializers.ModelSerializer):
             "id", "approval_status", "rejection_reason",
             "uwh_description", "swinfy_notes", "created_at",
         ]
+        list_serializer_class = ProjectHighlightListSerializer
 
     def get_image_url(self, obj):
         if obj.image:
@@ -136,6 +177,16 @@ class ProjectHighlightSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    # Derivatives are built after upload; null until they exist
+    def get_thumbnail_url(self, obj):
+        return _file_url(self, obj.thumbnail)
+
+    def get_medium_url(self, obj):
+        return _file_url(self, obj.image_medium)
+
+    def get_webp_url(self, obj):
+        return _file_url(self, obj.image_webp)
+
     def get_media_file_url(self, obj):
         if obj.media_file:
             request = self.context.get("request")
@@ -149,9 +200,13 @@ class ProjectHighlightSerializer(serializers.ModelSerializer):
         return obj.uwh_description or obj.description
 
     def get_group_members(self, obj):
-        if obj.group:
-            return list(obj.group.members.values_list("name", flat=True))
-        return []
+        if not obj.group:
+            return []
+        # Filled by load_group_members() when serialized as a list
+        members = getattr(obj.group, "prefetched_members", None)
+        if members is not None:
+            return [m.name for m in members]
+        return list(obj.group.members.values_list("name", flat=True))
 
     def get_school_name(self, obj):
         if obj.school:
@@ -254,6 +309,25 @@ class StudentCreateSerializer(serializers.ModelSerializer):
         }
 
 
+class StudentMarksSerializer(serializers.Serializer):
+    """One student's entry in a bulk marks update; either mark may be omitted."""
+
+    # Same bounds as the model's MARKS_VALIDATORS
+    baseline = serializers.IntegerField(
+        source="baseline_marks", required=False, allow_null=True,
+        min_value=0, max_value=MAX_MARKS,
+    )
+    endline = serializers.IntegerField(
+        source="endline_marks", required=False, allow_null=True,
+        min_value=0, max_value=MAX_MARKS,
+    )
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Give a baseline and/or endline mark.")
+        return attrs
+
+
 class StudentGroupSerializer(serializers.ModelSerializer):
     members = StudentSerializer(many=True, read_only=True)
     member_count = serializers.IntegerField(read_only=True, default=0)
@@ -311,19 +385,29 @@ class TrainerProfileSerializer(serializers.ModelSerializer):
         return None
 
     def _get_school_entries(self, obj):
+        # Both assigned_school and assigned_schools read these, so build once
+        cached = getattr(self, "_school_entries", None)
+        if cached is not None and cached[0] == obj.pk:
+            return cached[1]
+
         assignments = TrainerAssignment.objects.filter(
             trainer=obj
-        ).select_related("school__district").order_by("-assigned_at")
+        ).select_related("school__district").prefetch_related(
+            Prefetch(
+                "school__trainer_assignments",
+                queryset=TrainerAssignment.objects.select_related("trainer"),
+                to_attr="all_assignments",
+            )
+        ).order_by("-assigned_at")
 
         entries = []
         for a in assignments:
             school = a.school
-            # Get co-trainers for this school (other trainers assigned)
+            # Co-trainers for this school (other trainers assigned)
             co_trainers = [
                 ca.trainer.get_full_name() or ca.trainer.username
-                for ca in TrainerAssignment.objects.filter(
-                    school=school
-                ).exclude(trainer=obj).select_related("trainer")
+                for ca in school.all_assignments
+                if ca.trainer_id != obj.pk
             ]
             entries.append({
                 "id": str(school.id),
@@ -340,6 +424,7 @@ class TrainerProfileSerializer(serializers.ModelSerializer):
                 "co_trainers": co_trainers,
                 "role": a.role,
             })
+        self._school_entries = (obj.pk, entries)
         return entries
 
     def get_assigned_schools(self, obj):
@@ -348,7 +433,8 @@ class TrainerProfileSerializer(serializers.ModelSerializer):
     def get_assigned_school(self, obj):
         entries = self._get_school_entries(obj)
         if entries:
-            entry = entries[0]
+            # Copy so the memoized entry shared with assigned_schools is untouched
+            entry = dict(entries[0])
             # Backward compat: flatten co_trainers to co_trainer
             entry["co_trainer"] = entry["co_trainers"][0] if entry["co_trainers"] else None
             return entry
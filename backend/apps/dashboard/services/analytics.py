@@ -0,0 +1,423 @@
+"""
+Learning-gain analytics over Student baseline / endline marks.
+
+A student's gain is ``endline_marks - baseline_marks``; students missing
+either mark are left out. compute() reports, for the programme overall and
+per district, school, trainer and group:
+
+    assessed                               students with both marks
+    mean_baseline, mean_endline, mean_gain
+    median_gain, percentiles               p10 / p25 / p75 / p90 of the gain
+    improved_share                         fraction with a gain above 0
+    histogram                              gain counts over the shared ``bins``
+
+Percentiles use linear interpolation, as numpy.percentile does. A student
+counts towards every trainer assigned to their school.
+
+On PostgreSQL the whole report is computed in the database: one grouped
+query per dimension returns the counts, means, improved share and one
+filtered count per histogram bin, and percentile_cont() gives the median
+and percentiles. Only one row per district / school / trainer / group
+crosses the wire.
+
+Other databases (SQLite in development and tests) have no percentile_cont,
+so the students' marks are read ordered by gain in one query and summarised
+in Python. With NumPy installed (optional) each dimension is grouped with
+vectorised operations; without it a pure-Python path fills each bucket in
+gain order, so every bucket is already sorted and its percentiles are index
+lookups. All paths give the same numbers.
+
+load() caches the result under the current versions of the resources it
+reads (see versions.py), so it is recomputed only after marks, rosters,
+schools or assignments change. The cache is Django's configured cache; with
+the default per-process cache each worker builds its own copy once.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Aggregate, Avg, Count, F, FloatField, Max, Min, Q, TextField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from apps.dashboard.models import District, School, Student, StudentGroup, TrainerAssignment
+from apps.dashboard.services import versions
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python path is used instead
+    np = None
+
+# versions.py resources the result depends on (also the views' ETag)
+RESOURCES = ("students", "schools", "districts", "groups", "assignments")
+DIMENSIONS = ("districts", "schools", "trainers", "groups")
+PERCENTILES = (10, 25, 75, 90)
+HISTOGRAM_BINS = 10
+CACHE_TIMEOUT = 24 * 60 * 60
+# Student fields each dimension groups by in the database path
+GROUP_BY = {
+    "districts": "school__district_id",
+    "schools": "school_id",
+    "trainers": "school__trainer_assignments__trainer_id",
+    "groups": "group_id",
+}
+
+
+class PercentileCont(Aggregate):
+    """percentile_cont(q / 100) WITHIN GROUP (ORDER BY expression); PostgreSQL only."""
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, q, **extra):
+        super().__init__(expression, fraction=float(q) / 100, **extra)
+
+
+def load():
+    """Return compute() for the current data, from the cache when it is fresh."""
+    stamp = versions.current(RESOURCES)
+    key = "learning-gains:" + ":".join(str(stamp[name]) for name in RESOURCES)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def compute(use_numpy=None):
+    """Recompute the learning-gain report from the source tables.
+
+    On PostgreSQL the database does the work. Elsewhere ``use_numpy``
+    forces one in-process path or the other; by default NumPy is used when
+    it is installed.
+    """
+    result = _blank()
+    if connection.vendor == "postgresql":
+        return _database_report(result)
+
+    # School and group ids come back as text: building a uuid.UUID per row
+    # would cost more than all of the statistics together
+    rows = list(
+        Student.objects.filter(baseline_marks__isnull=False, endline_marks__isnull=False)
+        .annotate(
+            gain=F("endline_marks") - F("baseline_marks"),
+            school_key=Cast("school_id", TextField()),
+            group_key=Cast("group_id", TextField()),
+        )
+        .order_by("gain")
+        .values_list("baseline_marks", "endline_marks", "gain", "school_key", "group_key")
+    )
+    if not rows:
+        return result
+
+    baseline, endline, gain, school_keys, group_keys = zip(*rows)
+    width = max(1, math.ceil((gain[-1] - gain[0] + 1) / HISTOGRAM_BINS))
+    bins = {"start": gain[0], "width": width, "count": (gain[-1] - gain[0]) // width + 1}
+    result["bins"] = bins
+
+    lookups = _lookups()
+    use_numpy = np is not None if use_numpy is None else use_numpy
+    report = _numpy_report if use_numpy else _python_report
+    stats = report((baseline, endline, gain), school_keys, group_keys, lookups, bins)
+    return _labelled(result, stats, lookups["labels"])
+
+
+def _blank():
+    return {
+        "computed_at": timezone.now().isoformat(),
+        "bins": None,
+        "overall": {"assessed": 0},
+        **{name: [] for name in DIMENSIONS},
+    }
+
+
+def _labelled(result, stats, labels):
+    """Fill ``result`` from per-dimension ``stats``, named and sorted by name."""
+    result["overall"] = stats["overall"]
+    for name in DIMENSIONS:
+        result[name] = sorted(
+            (
+                {"id": str(pk), **labels[name][pk], **values}
+                for pk, values in stats[name].items()
+                if pk in labels[name]  # deleted since the stats were read
+            ),
+            key=lambda entry: (entry["name"], entry["id"]),
+        )
+    return result
+
+
+def _assessed():
+    return Student.objects.filter(
+        baseline_marks__isnull=False, endline_marks__isnull=False
+    ).annotate(gain=F("endline_marks") - F("baseline_marks"))
+
+
+def _lookups():
+    """Schools and groups by their text key, trainers by school, and labels."""
+    labels = {name: {} for name in DIMENSIONS}
+    schools, groups = {}, {}
+    for key, pk, name, district_id in School.objects.annotate(
+        key=Cast("id", TextField())
+    ).order_by().values_list("key", "id", "name", "district_id"):
+        schools[key] = (pk, district_id)
+        labels["schools"][pk] = {"name": name, "district": str(district_id)}
+    for key, pk, name, school_id in StudentGroup.objects.annotate(
+        key=Cast("id", TextField())
+    ).order_by().values_list("key", "id", "name", "school_id"):
+        groups[key] = pk
+        labels["groups"][pk] = {"name": name, "school": str(school_id)}
+    trainers = defaultdict(list)
+    for school_id, trainer_id, name in TrainerAssignment.objects.order_by().values_list(
+        "school_id", "trainer_id", "trainer__username"
+    ):
+        trainers[school_id].append(trainer_id)
+        labels["trainers"][trainer_id] = {"name": name}
+    for pk, name in District.objects.order_by().values_list("id", "name"):
+        labels["districts"][pk] = {"name": name}
+    return {"schools": schools, "groups": groups, "trainers": trainers, "labels": labels}
+
+
+# ---------------------------------------------------------------------------
+# Database (PostgreSQL)
+# ---------------------------------------------------------------------------
+def _database_report(result, percentiles=True):
+    """compute() as grouped aggregates; ``percentiles`` needs percentile_cont."""
+    span = _assessed().aggregate(low=Min("gain"), high=Max("gain"))
+    if span["low"] is None:
+        return result
+    width = max(1, math.ceil((span["high"] - span["low"] + 1) / HISTOGRAM_BINS))
+    bins = {
+        "start": span["low"],
+        "width": width,
+        "count": (span["high"] - span["low"]) // width + 1,
+    }
+    result["bins"] = bins
+
+    aggregates = _aggregates(bins, percentiles)
+    stats = {"overall": _stats_database(_assessed().aggregate(**aggregates), bins)}
+    for name, field in GROUP_BY.items():
+        rows = (
+            _assessed()
+            .filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(**aggregates)
+            .order_by()
+        )
+        stats[name] = {row[field]: _stats_database(row, bins) for row in rows}
+    return _labelled(result, stats, _lookups()["labels"])
+
+
+def _aggregates(bins, percentiles):
+    edges = [bins["start"] + b * bins["width"] for b in range(bins["count"] + 1)]
+    aggregates = {
+        "assessed": Count("id"),
+        "mean_baseline": Avg("baseline_marks"),
+        "mean_endline": Avg("endline_marks"),
+        "mean_gain": Avg("gain"),
+        "improved": Count("id", filter=Q(gain__gt=0)),
+        **{
+            f"bin_{b}": Count("id", filter=Q(gain__gte=lo, gain__lt=hi))
+            for b, (lo, hi) in enumerate(zip(edges, edges[1:]))
+        },
+    }
+    if percentiles:
+        aggregates["median_gain"] = PercentileCont("gain", 50)
+        aggregates.update({f"p{q}": PercentileCont("gain", q) for q in PERCENTILES})
+    return aggregates
+
+
+def _stats_database(row, bins):
+    n = row["assessed"]
+    stats = {
+        "assessed": n,
+        "mean_baseline": round(row["mean_baseline"], 2),
+        "mean_endline": round(row["mean_endline"], 2),
+        "mean_gain": round(row["mean_gain"], 2),
+        "improved_share": round(row["improved"] / n, 3),
+        "histogram": [row[f"bin_{b}"] for b in range(bins["count"])],
+    }
+    if "median_gain" in row:
+        stats["median_gain"] = round(row["median_gain"], 2)
+        stats["percentiles"] = {f"p{q}": round(row[f"p{q}"], 2) for q in PERCENTILES}
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Pure Python
+# ---------------------------------------------------------------------------
+def _python_report(columns, school_keys, group_keys, lookups, bins):
+    # {key: row indices}; rows are appended in gain order, so each is sorted
+    school_rows, group_rows = defaultdict(list), defaultdict(list)
+    for i, key in enumerate(school_keys):
+        school_rows[key].append(i)
+    for i, key in enumerate(group_keys):
+        group_rows[key].append(i)
+
+    buckets = {name: defaultdict(list) for name in DIMENSIONS}
+    for key, members in school_rows.items():
+        if key not in lookups["schools"]:
+            continue  # deleted since the rows were read
+        school_id, district_id = lookups["schools"][key]
+        buckets["schools"][school_id] = members
+        # Districts and trainers are unions of schools, re-sorted below
+        buckets["districts"][district_id].extend(members)
+        for trainer_id in lookups["trainers"].get(school_id, ()):
+            buckets["trainers"][trainer_id].extend(members)
+    for name in ("districts", "trainers"):
+        for members in buckets[name].values():
+            members.sort()
+    for key, members in group_rows.items():
+        if key in lookups["groups"]:
+            buckets["groups"][lookups["groups"][key]] = members
+
+    # Lower edge of every histogram bin after the first
+    edges = [bins["start"] + b * bins["width"] for b in range(1, bins["count"])]
+    report = {"overall": _stats_python(range(len(school_keys)), *columns, edges)}
+    for name in DIMENSIONS:
+        report[name] = {
+            pk: _stats_python(members, *columns, edges) for pk, members in buckets[name].items()
+        }
+    return report
+
+
+def _stats_python(rows, baseline, endline, gain, edges):
+    n = len(rows)
+    gains = list(map(gain.__getitem__, rows))  # ascending: rows are in gain order
+    cuts = [0, *(bisect_left(gains, edge) for edge in edges), n]
+    return {
+        "assessed": n,
+        "mean_baseline": round(sum(map(baseline.__getitem__, rows)) / n, 2),
+        "mean_endline": round(sum(map(endline.__getitem__, rows)) / n, 2),
+        "mean_gain": round(sum(gains) / n, 2),
+        "median_gain": round(_percentile(gains, 50), 2),
+        "percentiles": {f"p{q}": round(_percentile(gains, q), 2) for q in PERCENTILES},
+        "improved_share": round((n - bisect_right(gains, 0)) / n, 3),
+        "histogram": [hi - lo for lo, hi in zip(cuts, cuts[1:])],
+    }
+
+
+def _percentile(ordered, q):
+    position = (len(ordered) - 1) * q / 100
+    lo = int(position)
+    hi = min(lo + 1, len(ordered) - 1)
+    return float(ordered[lo] + (ordered[hi] - ordered[lo]) * (position - lo))
+
+
+# ---------------------------------------------------------------------------
+# NumPy
+# ---------------------------------------------------------------------------
+def _numpy_report(columns, school_keys, group_keys, lookups, bins):
+    columns = tuple(np.array(column, dtype=np.int64) for column in columns)
+    everyone = np.arange(len(school_keys))
+    report = {
+        "overall": _stats_numpy(columns, everyone, np.zeros_like(everyone), [True], bins)[True]
+    }
+
+    # school_code[i] indexes ``keys`` for row i
+    keys, school_code = np.unique(np.array(school_keys), return_inverse=True)
+    school_code = school_code.ravel()
+    known = [lookups["schools"].get(key) for key in keys]  # None: deleted since
+    report["schools"] = _stats_numpy(
+        columns, everyone, school_code, [s and s[0] for s in known], bins
+    )
+
+    district_ids = list(dict.fromkeys(s[1] for s in known if s))
+    district_index = {pk: i for i, pk in enumerate(district_ids)}
+    district_of = np.array([district_index[s[1]] if s else -1 for s in known])
+    district_code = district_of[school_code]
+    mapped = district_code >= 0
+    report["districts"] = _stats_numpy(
+        columns, everyone[mapped], district_code[mapped], district_ids, bins
+    )
+
+    # Trainers: one (school, trainer) pair per assignment, expanded to the
+    # school's rows
+    trainer_ids, pair_school, pair_trainer = {}, [], []
+    for s, school in enumerate(known):
+        for trainer_id in lookups["trainers"].get(school[0], ()) if school else ():
+            pair_school.append(s)
+            pair_trainer.append(trainer_ids.setdefault(trainer_id, len(trainer_ids)))
+    by_school = np.argsort(school_code, kind="stable")
+    counts = np.bincount(school_code, minlength=len(keys))
+    starts = np.cumsum(counts) - counts
+    sizes = counts[pair_school]
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    rows = by_school[np.repeat(starts[pair_school], sizes) + offsets]
+    report["trainers"] = _stats_numpy(
+        columns, rows, np.repeat(np.array(pair_trainer, dtype=np.int64), sizes),
+        list(trainer_ids), bins,
+    )
+
+    keys, group_code = np.unique(np.array([key or "" for key in group_keys]), return_inverse=True)
+    report["groups"] = _stats_numpy(
+        columns, everyone, group_code.ravel(), [lookups["groups"].get(key) for key in keys], bins
+    )
+    return report
+
+
+def _stats_numpy(columns, rows, codes, keys, bins):
+    """Stats per ``keys[code]`` over ``rows`` (row indices) grouped by ``codes``.
+
+    Keys that are None are left out.
+    """
+    if not len(rows):
+        return {}
+    baseline, endline, gain = columns
+    m = len(keys)
+    # Group by code; within a code rows stay in index (= gain) order
+    order = np.lexsort((rows, codes))
+    rows, codes = rows[order], codes[order]
+    counts = np.bincount(codes, minlength=m)
+    starts = np.cumsum(counts) - counts
+    sizes = np.maximum(counts, 1)
+    gains = gain[rows]
+    last = len(gains) - 1
+
+    def percentile(q):
+        position = (sizes - 1) * q / 100
+        lo = np.floor(position).astype(np.int64)
+        hi = np.minimum(lo + 1, sizes - 1)
+        # Empty buckets are clamped to a valid index and dropped below
+        low = gains[np.minimum(starts + lo, last)]
+        high = gains[np.minimum(starts + hi, last)]
+        return low + (high - low) * (position - lo)
+
+    def mean(values):
+        return np.bincount(codes, weights=values, minlength=m) / sizes
+
+    slots = (gains - bins["start"]) // bins["width"]
+    histograms = np.bincount(codes * bins["count"] + slots, minlength=m * bins["count"])
+    histograms = histograms.reshape(m, bins["count"]).tolist()
+    values = {
+        "mean_baseline": mean(baseline[rows]),
+        "mean_endline": mean(endline[rows]),
+        "mean_gain": mean(gains),
+        "median_gain": percentile(50),
+        **{f"p{q}": percentile(q) for q in PERCENTILES},
+        "improved_share": mean(gains > 0),
+    }
+    # Python's round() on the floats, so both paths agree to the last digit
+    values = {
+        name: [round(v, 3 if name == "improved_share" else 2) for v in column.tolist()]
+        for name, column in values.items()
+    }
+    counts = counts.tolist()
+
+    return {
+        key: {
+            "assessed": counts[k],
+            "mean_baseline": values["mean_baseline"][k],
+            "mean_endline": values["mean_endline"][k],
+            "mean_gain": values["mean_gain"][k],
+            "median_gain": values["median_gain"][k],
+            "percentiles": {f"p{q}": values[f"p{q}"][k] for q in PERCENTILES},
+            "improved_share": values["improved_share"][k],
+            "histogram": histograms[k],
+        }
+        for k, key in enumerate(keys)
+        if key is not None and counts[k]
+    }
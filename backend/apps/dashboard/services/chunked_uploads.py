@@ -0,0 +1,187 @@
+"""
+Resumable chunked uploads for large project media (video / music).
+
+A single multipart request for a 200 MB video has to start over when the
+connection drops at 90%. This module backs a three-step protocol instead:
+
+    POST trainer/uploads/                 {"filename", "size"} -> {"id", "offset": 0, ...}
+    PUT  trainer/uploads/<id>/            raw bytes, Upload-Offset: <n>  -> {"offset"}
+    GET  trainer/uploads/<id>/            -> {"offset"}   (where to resume)
+    POST trainer/uploads/<id>/complete/   -> {"id", "status": "complete"}
+
+Each PUT streams the request body into a temporary file at its offset in
+READ_SIZE pieces, so memory per upload stays bounded whatever the chunk or
+file size. A chunk cut off by a dropped connection still counts up to the
+last byte written. The client asks for the offset and carries on from
+there. No database transaction is held while a chunk or the finished
+file is being transferred. complete() streams the finished file into default storage under
+project_media/. The project endpoints accept ``media_upload=<id>`` in
+place of a ``media_file`` part.
+
+Temporary files live in CHUNKED_UPLOAD_DIR. Run purge_stale_uploads to
+drop uploads that were abandoned part-way.
+"""
+
+import fcntl
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from apps.dashboard.models import ChunkedUpload, ProjectHighlight
+from apps.dashboard.program_config import ALLOWED_MEDIA_EXTENSIONS, MAX_MEDIA_SIZE_MB
+
+MAX_BYTES = MAX_MEDIA_SIZE_MB * 1024 * 1024
+MAX_CHUNK_BYTES = 8 * 1024 * 1024
+READ_SIZE = 64 * 1024
+STALE_AFTER = timedelta(days=1)
+
+
+class UploadError(Exception):
+    """The request does not fit the upload's current state."""
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, offset):
+        super().__init__(f"Expected Upload-Offset {offset}")
+        self.offset = offset
+
+
+def temp_path(upload):
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload.pk}.part")
+
+
+def create(user, filename, size):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in ALLOWED_MEDIA_EXTENSIONS:
+        raise UploadError(f"{filename}: only {', '.join(ALLOWED_MEDIA_EXTENSIONS)} files are allowed")
+    if not 0 < size <= MAX_BYTES:
+        raise UploadError(f"{filename}: size must be between 1 byte and {MAX_MEDIA_SIZE_MB} MB")
+
+    upload = ChunkedUpload.objects.create(user=user, filename=filename, size=size)
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(temp_path(upload), "wb").close()
+    return upload
+
+
+def write_chunk(upload_id, user, offset, stream, length):
+    """Append ``length`` bytes from ``stream`` at ``offset``; return the new offset.
+
+    No transaction or row lock is held while the body arrives: a slow phone
+    would keep it open for the whole chunk. The offset is advanced with a
+    compare-and-set on the offset the chunk was written at, so of two PUTs
+    racing for the same offset only one counts and the other gets
+    OffsetMismatch (409).
+    """
+    if length > MAX_CHUNK_BYTES:
+        raise UploadError(f"Chunks may be at most {MAX_CHUNK_BYTES} bytes")
+
+    upload = ChunkedUpload.objects.get(pk=upload_id, user=user)
+    if upload.status != ChunkedUpload.Status.UPLOADING:
+        raise UploadError("Upload is already complete")
+    if offset != upload.offset:
+        raise OffsetMismatch(upload.offset)
+    if offset + length > upload.size:
+        raise UploadError("Chunk runs past the declared size")
+
+    with open(temp_path(upload), "r+b") as fh:
+        try:
+            # Keeps a racing PUT from writing into the same bytes
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise OffsetMismatch(upload.offset)
+        written = 0
+        fh.seek(offset)
+        while written < length:
+            piece = stream.read(min(READ_SIZE, length - written))
+            if not piece:
+                break  # client went away; keep what arrived
+            fh.write(piece)
+            written += len(piece)
+        fh.truncate()
+        fh.flush()
+
+        advanced = ChunkedUpload.objects.filter(
+            pk=upload.pk, status=ChunkedUpload.Status.UPLOADING, offset=offset
+        ).update(offset=offset + written, updated_at=timezone.now())
+    if not advanced:
+        current = ChunkedUpload.objects.filter(pk=upload.pk).values_list("offset", flat=True).first()
+        raise OffsetMismatch(current)
+    return offset + written
+
+
+def complete(upload_id, user):
+    """Move a fully received upload into storage.
+
+    The copy to storage (S3 in production) runs before anything is written
+    to the row, outside any transaction; a single conditional UPDATE then
+    marks the upload complete. If a concurrent complete() got there first,
+    this call's copy is deleted and the winner's row returned.
+    """
+    upload = ChunkedUpload.objects.get(pk=upload_id, user=user)
+    if upload.status == ChunkedUpload.Status.COMPLETE:
+        return upload
+    if upload.offset != upload.size:
+        raise OffsetMismatch(upload.offset)
+
+    field = ProjectHighlight._meta.get_field("media_file")
+    path = temp_path(upload)
+    try:
+        with open(path, "rb") as fh:
+            stored_name = default_storage.save(
+                field.generate_filename(None, upload.filename), File(fh)
+            )
+    except FileNotFoundError:
+        # Another complete() finished and removed the part file
+        upload.refresh_from_db()
+        if upload.status == ChunkedUpload.Status.COMPLETE:
+            return upload
+        raise
+
+    completed = ChunkedUpload.objects.filter(
+        pk=upload.pk, status=ChunkedUpload.Status.UPLOADING
+    ).update(
+        stored_name=stored_name,
+        status=ChunkedUpload.Status.COMPLETE,
+        updated_at=timezone.now(),
+    )
+    if not completed:
+        default_storage.delete(stored_name)
+    else:
+        os.remove(path)
+    upload.refresh_from_db()
+    return upload
+
+
+def claim(upload_id, user):
+    """Storage name of a completed upload, which is used up by the call."""
+    try:
+        upload = ChunkedUpload.objects.filter(
+            pk=upload_id, user=user, status=ChunkedUpload.Status.COMPLETE
+        ).first()
+    except (ValueError, ValidationError):
+        upload = None
+    if upload is None:
+        raise UploadError("media_upload is not a completed upload")
+    upload.delete()
+    return upload.stored_name
+
+
+def purge_stale(max_age):
+    """Delete uploads untouched for ``max_age`` and their temporary files."""
+    stale = ChunkedUpload.objects.filter(updated_at__lt=timezone.now() - max_age)
+    count = 0
+    for upload in stale:
+        if upload.status == ChunkedUpload.Status.UPLOADING:
+            if os.path.exists(temp_path(upload)):
+                os.remove(temp_path(upload))
+        elif upload.stored_name:
+            # Completed but never attached to a project
+            default_storage.delete(upload.stored_name)
+        upload.delete()
+        count += 1
+    return count
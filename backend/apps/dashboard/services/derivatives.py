@@ -0,0 +1,124 @@
+"""
+Image derivatives for gallery endpoints.
+
+Phone uploads are 3–10 MB each, which makes galleries unusable on school
+connections. After an image is saved, a background task writes three
+derivatives next to the original and records them on the row:
+
+    thumbnail      JPEG, fits 320×320   (grid tiles)
+    image_medium   JPEG, fits 1280×1280 (lightbox)
+    image_webp     WebP, fits 1920×1920 (browsers that support it)
+
+Derivative names are derived from the original's full file name, extension
+included (photo.jpg -> derived/photo.jpg_thumb.jpg), so photo.jpg and
+photo.png never share derivatives, and a row whose thumbnail does not match
+its current image is stale and gets rebuilt. The
+work runs on the task queue (services/tasks.py) at low priority, behind
+emails; the task row commits with the image row, so it never sees
+uncommitted data.
+"""
+
+import io
+import logging
+import os
+
+from PIL import Image, ImageOps
+from django.apps import apps
+from django.core.files.base import ContentFile
+
+from apps.dashboard.models import ProjectHighlight, SessionPhoto
+from apps.dashboard.services import tasks, versions
+
+logger = logging.getLogger(__name__)
+
+# field -> (max size, format, suffix)
+DERIVATIVES = {
+    "thumbnail": ((320, 320), "JPEG", "_thumb.jpg"),
+    "image_medium": ((1280, 1280), "JPEG", "_medium.jpg"),
+    "image_webp": ((1920, 1920), "WEBP", ".webp"),
+}
+QUALITY = {"JPEG": 82, "WEBP": 80}
+
+# model -> resource bumped when its derivatives change
+MODELS = {SessionPhoto: "photos", ProjectHighlight: "projects"}
+
+
+def derivative_names(name):
+    """{field: storage name} for the derivatives of the original ``name``."""
+    folder, filename = os.path.split(name)
+    return {
+        field: os.path.join(folder, "derived", filename + suffix)
+        for field, (_, _, suffix) in DERIVATIVES.items()
+    }
+
+
+def is_stale(instance):
+    """True when the row has an image whose derivatives are missing or outdated."""
+    if not instance.image:
+        return False
+    return instance.thumbnail.name != derivative_names(instance.image.name)["thumbnail"]
+
+
+def render(fileobj):
+    """Return {field: encoded bytes} for an open original image."""
+    with Image.open(fileobj) as original:
+        # Phone cameras store rotation in EXIF rather than in the pixels
+        image = ImageOps.exif_transpose(original).convert("RGB")
+    rendered = {}
+    for field, (size, fmt, _) in DERIVATIVES.items():
+        copy = image.copy()
+        copy.thumbnail(size, Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        copy.save(buf, format=fmt, quality=QUALITY[fmt], optimize=fmt == "JPEG")
+        rendered[field] = buf.getvalue()
+    return rendered
+
+
+def generate(model, pk):
+    """Build and store the derivatives for one row. Returns True if it did."""
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not instance.image:
+        return False
+    original = instance.image.name
+    try:
+        with instance.image.open("rb") as fh:
+            rendered = render(fh)
+    except (OSError, Image.DecompressionBombError):
+        logger.warning("Cannot build derivatives for %s %s (%s)", model.__name__, pk, original)
+        return False
+
+    storage = instance.image.storage
+    previous = {field: getattr(instance, field).name for field in DERIVATIVES}
+    stored = {}
+    for field, name in derivative_names(original).items():
+        # Overwrite in place so the stored name stays predictable
+        storage.delete(name)
+        stored[field] = storage.save(name, ContentFile(rendered[field]))
+
+    # update() skips signals (and a re-schedule); only apply if the image is unchanged
+    if not model.objects.filter(pk=pk, image=original).update(**stored):
+        return False
+    # Derivatives of a replaced image (or from an older naming scheme)
+    for field, name in previous.items():
+        if name and name != stored[field]:
+            storage.delete(name)
+    versions.bump(MODELS[model])
+    return True
+
+
+def delete_files(instance):
+    """Remove the stored derivatives of ``instance`` (the original is left alone)."""
+    for field in DERIVATIVES:
+        file = getattr(instance, field)
+        if file:
+            file.delete(save=False)
+
+
+@tasks.task(max_attempts=3, priority=tasks.LOW)
+def build(model_label, pk):
+    generate(apps.get_model(model_label), pk)
+
+
+def schedule(instance):
+    """Queue derivative generation for ``instance`` (runs once the transaction commits)."""
+    build.delay(instance._meta.label, instance.pk)
@@ -0,0 +1,144 @@
+"""
+Direct-to-storage uploads for session photos.
+
+Uploading 3–5 phone photos through the API ties up a worker for the whole
+transfer on slow school connections. Instead the trainer's client asks for
+one upload slot per photo, POSTs each file straight to storage, and then
+finalizes the submission with the keys it uploaded:
+
+    1. POST trainer/submit/                      {..., "uploads": [{name, content_type, size}]}
+       -> draft submission + [{key, url, fields}]
+    2. POST <url>  multipart: fields + file      (S3, or the local stand-in)
+    3. POST trainer/submissions/<id>/finalize/   {"keys": [...]}
+
+With USE_S3 the slots are S3 presigned POSTs. Otherwise a local stand-in
+implements the same protocol: the "policy" field is a signed token naming
+the key, content type and size limit, and uploads/direct/ checks it before
+writing to default_storage. Clients treat both the same way.
+
+A draft that is never finalized is deleted together with whatever was
+uploaded under its prefix, either when the trainer retries the same day or
+by purge_stale_uploads once its slots have expired.
+"""
+
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.dashboard.models import Submission
+from apps.dashboard.services.photo_uploads import MAX_BYTES
+
+SALT = "dashboard.direct-upload"
+
+
+class InvalidUpload(Exception):
+    """Raised when a local stand-in upload does not match its policy."""
+
+
+def key_prefix(submission):
+    """Every key issued for ``submission`` lives under this prefix."""
+    return f"session_photos/{submission.pk}/"
+
+
+def new_key(submission, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{key_prefix(submission)}{uuid.uuid4().hex}{ext}"
+
+
+def presign(request, key, content_type):
+    """Return ``{"key", "url", "fields"}`` for one upload of ``key``."""
+    if settings.USE_S3:
+        return _presign_s3(key, content_type)
+    return _presign_local(request, key, content_type)
+
+
+def _presign_s3(key, content_type):
+    client = default_storage.connection.meta.client
+    post = client.generate_presigned_post(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=default_storage._normalize_name(key),
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, MAX_BYTES],
+        ],
+        ExpiresIn=settings.DIRECT_UPLOAD_EXPIRES,
+    )
+    return {"key": key, "url": post["url"], "fields": post["fields"]}
+
+
+def _presign_local(request, key, content_type):
+    policy = signing.dumps(
+        {"key": key, "content_type": content_type, "max_bytes": MAX_BYTES}, salt=SALT
+    )
+    return {
+        "key": key,
+        "url": request.build_absolute_uri(reverse("direct-upload")),
+        "fields": {"key": key, "Content-Type": content_type, "policy": policy},
+    }
+
+
+def store_local(fields, file):
+    """Check a stand-in upload against its policy and write it to storage."""
+    try:
+        policy = signing.loads(
+            fields.get("policy", ""), salt=SALT, max_age=settings.DIRECT_UPLOAD_EXPIRES
+        )
+    except signing.SignatureExpired:
+        raise InvalidUpload("Policy expired")
+    except signing.BadSignature:
+        raise InvalidUpload("Invalid policy")
+
+    if fields.get("key") != policy["key"]:
+        raise InvalidUpload("Key does not match policy")
+    if fields.get("Content-Type") != policy["content_type"]:
+        raise InvalidUpload("Content-Type does not match policy")
+    if file is None or not 0 < file.size <= policy["max_bytes"]:
+        raise InvalidUpload("File size outside the allowed range")
+
+    # S3 overwrites on a repeated POST; keep the issued name exact
+    default_storage.delete(policy["key"])
+    return default_storage.save(policy["key"], file)
+
+
+def uploaded(keys):
+    """The subset of ``keys`` that exist in storage."""
+    return [key for key in keys if default_storage.exists(key)]
+
+
+def delete_draft(submission):
+    """Delete a draft ``submission`` and, once that commits, its uploaded objects."""
+    prefix = key_prefix(submission)
+    submission.delete()
+    transaction.on_commit(lambda: _delete_prefix(prefix), robust=True)
+
+
+def purge_stale_drafts():
+    """Delete drafts whose upload slots have all expired; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=settings.DIRECT_UPLOAD_EXPIRES)
+    stale = Submission.objects.filter(status="draft", created_at__lt=cutoff)
+    count = 0
+    for pk in stale.values_list("pk", flat=True):
+        with transaction.atomic():
+            # Skip a draft that a concurrent finalize has just submitted
+            draft = Submission.objects.select_for_update().filter(pk=pk, status="draft").first()
+            if draft is not None:
+                delete_draft(draft)
+                count += 1
+    return count
+
+
+def _delete_prefix(prefix):
+    try:
+        _, names = default_storage.listdir(prefix)
+    except FileNotFoundError:
+        return
+    for name in names:
+        default_storage.delete(prefix + name)
@@ -5,17 +5,45 @@ All emails go through send_email(). This is the single point for:
 - Template rendering (HTML + plain text fallback)
 - Reply-To configuration
 - Logging and error handling
-- Future: swap to async task queue by changing only this file
+- Batching: send_email() renders the message into the EmailOutbox table and
+  queues a flush() task (services/tasks.py), so callers never wait on SMTP.
+
+flush() drains the outbox in priority order over a single SMTP connection,
+EMAIL_BATCH_SIZE rows per claim, at no more than EMAIL_SEND_RATE messages
+a second. Every row records its own outcome; a message that fails is tried
+again on the next flush, up to MAX_ATTEMPTS times, then marked failed.
+
+Urgent messages (OTP codes) skip the batch: queue(urgent=True) enqueues
+send_now() for that one row on the task queue's priority lane, and gives
+the row a ``delivery_id`` the client can poll with delivery_status().
 """
 
 import logging
+import time
+import uuid
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
 from django.template.loader import render_to_string
+from django.utils import timezone
+
+from apps.dashboard.models import EmailOutbox, Task
+from apps.dashboard.services import tasks
 
 logger = logging.getLogger("emails")
 
+MAX_ATTEMPTS = 3
+# A claimed row whose sender has been silent this long goes back to pending
+STALE_AFTER = timedelta(minutes=10)
+# Sent rows are deleted after this long; failed ones are kept
+KEEP_SENT = timedelta(days=30)
+
+
+class EmailDeliveryError(Exception):
+    """Raised by flush() when messages were left for a retry."""
+
 
 def send_email(
     to: str | list[str],
@@ -23,9 +51,10 @@ def send_email(
     template_name: str,
     context: dict | None = None,
     reply_to: str | None = None,
+    priority: int = tasks.NORMAL,
 ) -> bool:
     """
-    Send an HTML email with plain text fallback.
+    Queue an HTML email with plain text fallback.
 
     Args:
         to: Recipient email(s)
@@ -34,33 +63,197 @@ def send_email(
                        Looks for emails/{template_name}.html and .txt
         context: Template context dict
         reply_to: Override reply-to address (defaults to EMAIL_REPLY_TO setting)
+        priority: Outbox priority (tasks.HIGH for emails a user is waiting on)
 
     Returns:
-        True if sent successfully, False otherwise
+        True if queued successfully, False otherwise
     """
-    if isinstance(to, str):
-        to = [to]
-
     context = context or {}
-    reply_to = reply_to or getattr(settings, "EMAIL_REPLY_TO", settings.DEFAULT_FROM_EMAIL)
 
     try:
         text_body = render_to_string(f"emails/{template_name}.txt", context)
         html_body = render_to_string(f"emails/{template_name}.html", context)
-
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=to,
-            reply_to=[reply_to],
-        )
-        msg.attach_alternative(html_body, "text/html")
-        msg.send(fail_silently=False)
-
-        logger.info("Email sent: subject='%s' to=%s", subject, to)
+        queue(to, subject, text_body, html_body, reply_to=reply_to, priority=priority)
         return True
 
     except Exception:
-        logger.exception("Email failed: subject='%s' to=%s", subject, to)
+        logger.exception("Email not queued: subject='%s' to=%s", subject, to)
         return False
+
+
+def queue(to, subject, text_body, html_body="", reply_to=None, priority=tasks.NORMAL,
+          urgent=False):
+    """Write a rendered email to the outbox and make sure it will be sent.
+
+    ``urgent`` sends it on its own on the priority lane instead of with the
+    next batch, and sets ``delivery_id`` for status polling.
+    """
+    if isinstance(to, str):
+        to = [to]
+    message = EmailOutbox.objects.create(
+        to=to,
+        delivery_id=uuid.uuid4() if urgent else None,
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        reply_to=reply_to or getattr(settings, "EMAIL_REPLY_TO", settings.DEFAULT_FROM_EMAIL),
+        priority=tasks.HIGH if urgent else priority,
+    )
+    if urgent:
+        send_now.delay(message.pk)
+        return message
+
+    # One queued flush drains every pending row; a fan-out adds only one
+    waiting = Task.objects.filter(
+        name=flush.task_name, status=Task.Status.QUEUED, priority__gte=priority
+    )
+    if not waiting.exists():
+        tasks.enqueue(flush, priority=priority)
+    return message
+
+
+@tasks.task(max_attempts=5)
+def flush():
+    """Send the outbox. Raises if a message failed, so the queue retries later."""
+    sent, retry = send_outbox()
+    if retry:
+        raise EmailDeliveryError(f"{retry} message(s) left for a retry ({sent} sent)")
+
+
+@tasks.task(max_attempts=MAX_ATTEMPTS, priority=tasks.HIGH, queue=tasks.PRIORITY_QUEUE)
+def send_now(pk):
+    """Send one outbox row on its own connection, unless a flush got to it first."""
+    claimed = EmailOutbox.objects.filter(pk=pk, status=EmailOutbox.Status.PENDING).update(
+        status=EmailOutbox.Status.SENDING, claimed_at=timezone.now()
+    )
+    if not claimed:
+        return
+    message = EmailOutbox.objects.get(pk=pk)
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.send_messages([_build(message, connection)])
+    except Exception as exc:
+        logger.warning("Email failed: subject='%s' to=%s (%s)", message.subject, message.to, exc)
+        if _failed(message, exc):
+            raise EmailDeliveryError(f"Outbox message {pk} left for a retry") from exc
+        return
+    _sent([pk])
+    logger.info("Email sent: subject='%s' to=%s", message.subject, message.to)
+
+
+def delivery_status(delivery_id):
+    """Status of the tracked message ``delivery_id``, or None if unknown."""
+    return (
+        EmailOutbox.objects.filter(delivery_id=delivery_id)
+        .values_list("status", flat=True)
+        .first()
+    )
+
+
+def send_outbox(batch_size=None, rate=None):
+    """Send pending outbox rows over one connection.
+
+    Returns ``(sent, retry)``: messages sent, and failed messages that are
+    still pending. A message is tried at most once per call.
+    """
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    rate = settings.EMAIL_SEND_RATE if rate is None else rate
+    interval = 1 / rate if rate else 0
+    _release_stale()
+
+    sent = retry = 0
+    tried = []
+    connection = None
+    next_send = time.monotonic()
+    try:
+        while batch := _claim(batch_size, exclude=tried):
+            tried.extend(message.pk for message in batch)
+            delivered = []
+            for message in batch:
+                time.sleep(max(0.0, next_send - time.monotonic()))
+                next_send = time.monotonic() + interval
+                try:
+                    if connection is None:
+                        connection = get_connection(fail_silently=False)
+                        connection.open()
+                    connection.send_messages([_build(message, connection)])
+                except Exception as exc:
+                    logger.warning("Email failed: subject='%s' to=%s (%s)", message.subject, message.to, exc)
+                    # The connection may be dead; open a fresh one for the next message
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+                    if _failed(message, exc):
+                        retry += 1
+                    continue
+                delivered.append(message.pk)
+                logger.info("Email sent: subject='%s' to=%s", message.subject, message.to)
+            _sent(delivered)
+            sent += len(delivered)
+    finally:
+        if connection is not None:
+            connection.close()
+    return sent, retry
+
+
+def purge_sent():
+    """Delete rows sent more than KEEP_SENT ago. Returns the count."""
+    deleted, _ = EmailOutbox.objects.filter(
+        status=EmailOutbox.Status.SENT, sent_at__lt=timezone.now() - KEEP_SENT
+    ).delete()
+    return deleted
+
+
+def _claim(batch_size, exclude):
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.Status.PENDING)
+            .exclude(pk__in=exclude)
+            .order_by("-priority", "created_at", "pk")[:batch_size]
+        )
+        EmailOutbox.objects.filter(pk__in=[m.pk for m in batch]).update(
+            status=EmailOutbox.Status.SENDING, claimed_at=timezone.now()
+        )
+    return batch
+
+
+def _build(message, connection):
+    msg = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.text_body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=message.to,
+        reply_to=[message.reply_to] if message.reply_to else None,
+        connection=connection,
+    )
+    if message.html_body:
+        msg.attach_alternative(message.html_body, "text/html")
+    return msg
+
+
+def _sent(pks):
+    EmailOutbox.objects.filter(pk__in=pks).update(
+        status=EmailOutbox.Status.SENT,
+        sent_at=timezone.now(),
+        last_error="",
+    )
+
+
+def _failed(message, error):
+    """Record a failed attempt. Returns True if the message will be retried."""
+    attempts = message.attempts + 1
+    retry = attempts < MAX_ATTEMPTS
+    EmailOutbox.objects.filter(pk=message.pk).update(
+        status=EmailOutbox.Status.PENDING if retry else EmailOutbox.Status.FAILED,
+        attempts=attempts,
+        last_error=str(error),
+    )
+    return retry
+
+
+def _release_stale():
+    EmailOutbox.objects.filter(
+        status=EmailOutbox.Status.SENDING,
+        claimed_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=EmailOutbox.Status.PENDING)
@@ -0,0 +1,275 @@
+"""
+Streaming CSV / XLSX exports of submissions, students, projects and photos.
+
+The JSON list endpoints serialize model instances a page at a time; an
+export of the whole programme through them holds every row in memory. An
+export instead reads plain tuples with ``values_list().iterator()`` (no
+model instances, and a server-side cursor on PostgreSQL) and writes them
+out as they arrive:
+
+    GET swinfy/export/submissions/?district=<uuid>&status=verified
+    GET swinfy/export/students/?file_format=xlsx
+
+CSV is encoded and flushed in ~64 KB chunks. XLSX goes through openpyxl's
+write-only mode, which spills rows to a temporary file rather than building
+the workbook in memory; the finished file is then streamed from disk in the
+same size chunks. Either way memory stays flat whatever the export size.
+
+Under ASGI (config.asgi) the chunks are pulled through an async iterator,
+one ``sync_to_async`` call per chunk; a plain generator would make Django
+collect the whole response before sending it.
+
+Text cells that a spreadsheet would read as a formula (starting with =, +,
+-, @, tab or carriage return) are written with a leading apostrophe: names,
+captions and reasons are typed by trainers and must not run in the admin's
+Excel.
+
+XLSX needs the optional ``openpyxl`` package; CSV works without it.
+"""
+
+import csv
+import io
+import tempfile
+import uuid
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+FORMATS = ("csv", "xlsx")
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# Rows fetched per database round trip
+CHUNK_SIZE = 2000
+# Bytes buffered before a chunk is sent
+FLUSH_BYTES = 64 * 1024
+# Leading characters that make Excel / Sheets / LibreOffice evaluate a cell
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Column header -> values_list() lookup, per dataset. Lookups not on the
+# model itself are added by the dataset's ``annotate``; ``files`` columns
+# hold storage names and are written out as URLs.
+DATASETS = {
+    "submissions": {
+        "columns": (
+            ("id", "id"),
+            ("school", "school__name"),
+            ("district", "school__district__name"),
+            ("trainer", "trainer__username"),
+            ("trainer_email", "trainer__email"),
+            ("day", "day_number"),
+            ("status", "status"),
+            ("student_count", "student_count"),
+            ("photos", "photo_count"),
+            ("projects", "project_count"),
+            ("expense_amount", "expense_amount"),
+            ("submitted_at", "submitted_at"),
+            ("verified_by", "verified_by__username"),
+            ("verified_at", "verified_at"),
+            ("flag_reason", "flag_reason"),
+            ("rejection_reason", "rejection_reason"),
+            ("created_at", "created_at"),
+        ),
+        "annotate": lambda: {
+            "photo_count": Count("photos", distinct=True),
+            "project_count": Count("project_highlights", distinct=True),
+        },
+        "order": ("-created_at", "-id"),
+    },
+    "students": {
+        "columns": (
+            ("id", "id"),
+            ("name", "name"),
+            ("age", "age"),
+            ("grade", "grade"),
+            ("school", "school__name"),
+            ("district", "school__district__name"),
+            ("group", "group__name"),
+            ("parent_name", "parent_name"),
+            ("parent_phone", "parent_phone"),
+            ("baseline_marks", "baseline_marks"),
+            ("endline_marks", "endline_marks"),
+            ("created_at", "created_at"),
+        ),
+        "order": ("school__name", "name", "id"),
+    },
+    "projects": {
+        "columns": (
+            ("id", "id"),
+            ("title", "title"),
+            ("project_type", "project_type"),
+            ("student_name", "student_name"),
+            ("student_age", "student_age"),
+            ("student_grade", "student_grade"),
+            ("school", "school_name"),
+            ("district", "district_name"),
+            ("trainer", "trainer_name"),
+            ("group", "group__name"),
+            ("day", "submission__day_number"),
+            ("approval_status", "approval_status"),
+            ("image", "image"),
+            ("media_file", "media_file"),
+            ("website_url", "website_url"),
+            ("created_at", "created_at"),
+        ),
+        # Final projects have direct school / trainer links; session
+        # projects reach them through their submission
+        "annotate": lambda: {
+            "school_name": Coalesce("school__name", "submission__school__name"),
+            "district_name": Coalesce(
+                "school__district__name", "submission__school__district__name"
+            ),
+            "trainer_name": Coalesce("trainer__username", "submission__trainer__username"),
+        },
+        "files": ("image", "media_file"),
+        "order": ("-created_at", "-id"),
+    },
+    "photos": {
+        "columns": (
+            ("id", "id"),
+            ("submission", "submission_id"),
+            ("school", "submission__school__name"),
+            ("district", "submission__school__district__name"),
+            ("trainer", "submission__trainer__username"),
+            ("day", "submission__day_number"),
+            ("caption", "caption"),
+            ("approval_status", "approval_status"),
+            ("is_featured", "is_featured"),
+            ("image", "image"),
+            ("uploaded_at", "uploaded_at"),
+        ),
+        "files": ("image",),
+        "order": ("uploaded_at", "id"),
+    },
+}
+
+
+class ExportError(Exception):
+    """The export cannot be produced (unknown format, missing dependency)."""
+
+
+def response(request, dataset, queryset, file_format="csv"):
+    """Stream ``queryset`` (already filtered) as a ``dataset`` file download.
+
+    Raises ExportError before anything is sent when ``file_format`` is not
+    supported on this server.
+    """
+    if file_format not in FORMATS:
+        raise ExportError(f"Unsupported format '{file_format}'. Allowed: {', '.join(FORMATS)}")
+    if file_format == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise ExportError("XLSX export is not available on this server; use CSV instead.")
+
+    spec = DATASETS[dataset]
+    headers = [header for header, _ in spec["columns"]]
+    rows = _rows(request, spec, queryset)
+    if file_format == "xlsx":
+        chunks = _xlsx_chunks(dataset, headers, rows)
+    else:
+        chunks = _csv_chunks(headers, rows)
+    filename = f"{dataset}-{timezone.localdate():%Y-%m-%d}.{file_format}"
+    return download(request, chunks, filename, CONTENT_TYPES[file_format])
+
+
+def download(request, chunks, filename, content_type):
+    """A streamed attachment of the byte ``chunks``, async under ASGI."""
+    # DRF wraps the Django request
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = _async_chunks(chunks)
+    return StreamingHttpResponse(
+        chunks,
+        content_type=content_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+def _rows(request, spec, queryset):
+    if "annotate" in spec:
+        queryset = queryset.annotate(**spec["annotate"]())
+    lookups = [lookup for _, lookup in spec["columns"]]
+    files = [lookups.index(name) for name in spec.get("files", ())]
+    rows = (
+        queryset.order_by(*spec["order"])
+        .values_list(*lookups)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    if not files:
+        yield from rows
+        return
+    for row in rows:
+        row = list(row)
+        for i in files:
+            if row[i]:
+                row[i] = request.build_absolute_uri(default_storage.url(row[i]))
+        yield row
+
+
+def _csv_chunks(headers, rows):
+    buffer = io.StringIO()
+    # The BOM lets Excel open the UTF-8 file with Telugu / Urdu names intact
+    buffer.write("\ufeff")
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _xlsx_chunks(dataset, headers, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(dataset)
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+    with tempfile.TemporaryFile() as fh:
+        workbook.save(fh)
+        fh.seek(0)
+        while chunk := fh.read(FLUSH_BYTES):
+            yield chunk
+
+
+async def _async_chunks(chunks):
+    # thread_sensitive keeps every next() on the thread holding the cursor
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    return _text(value)
+
+
+def _xlsx_value(value):
+    # Excel has no time zones: write local wall-clock time
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return _text(value)
+
+
+def _text(value):
+    # User-entered text must not be evaluated as a formula (CSV injection)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
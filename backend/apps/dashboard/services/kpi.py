@@ -0,0 +1,228 @@
+"""
+Dashboard KPI snapshot.
+
+summary / uwh_summary read one DashboardKPI row per role instead of running
+the COUNT/SUM queries on every poll. The signals in signals.py keep the rows
+current by applying the difference between a row's contribution before and
+after each write; rebuild() recomputes everything from scratch.
+"""
+
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.dashboard.models import (
+    DashboardKPI,
+    District,
+    ProjectHighlight,
+    School,
+    SessionPhoto,
+    Submission,
+)
+
+ADMIN = DashboardKPI.Role.ADMIN
+SPONSOR = DashboardKPI.Role.SPONSOR
+ROLES = [ADMIN, SPONSOR]
+
+KPI_FIELDS = [
+    "total_schools",
+    "schools_completed",
+    "schools_in_progress",
+    "total_students",
+    "total_districts",
+    "students_trained",
+    "total_sessions",
+    "pending_submissions",
+    "pending_photos",
+    "pending_projects",
+]
+
+
+# ---------------------------------------------------------------------------
+# Per-row contributions
+# ---------------------------------------------------------------------------
+def _same_for_all_roles(row):
+    return {role: row for role in ROLES}
+
+
+def _school_contribution(values):
+    return _same_for_all_roles({
+        "total_schools": 1,
+        "schools_completed": int(values["status"] == "completed"),
+        "schools_in_progress": int(values["status"] == "in_progress"),
+        "total_students": int(values["total_students"] or 0),
+    })
+
+
+def _district_contribution(values):
+    return _same_for_all_roles({"total_districts": 1})
+
+
+def _submission_contribution(values):
+    # Swinfy sees every non-draft submission; UWH only verified ones.
+    sub_status = values["status"]
+    students = int(values["student_count"] or 0)
+    submitted = sub_status != "draft"
+    verified = sub_status == "verified"
+    pending = int(sub_status == "submitted")
+    return {
+        ADMIN: {
+            "students_trained": students if submitted else 0,
+            "total_sessions": int(submitted),
+            "pending_submissions": pending,
+        },
+        SPONSOR: {
+            "students_trained": students if verified else 0,
+            "total_sessions": int(verified),
+            "pending_submissions": pending,
+        },
+    }
+
+
+def _photo_contribution(values):
+    return _same_for_all_roles({
+        "pending_photos": int(values["approval_status"] == "pending"),
+    })
+
+
+def _project_contribution(values):
+    return _same_for_all_roles({
+        "pending_projects": int(values["approval_status"] == "pending"),
+    })
+
+
+# model -> (fields the contribution depends on, contribution function)
+TRACKED = {
+    School: (("status", "total_students"), _school_contribution),
+    District: ((), _district_contribution),
+    Submission: (("status", "student_count"), _submission_contribution),
+    SessionPhoto: (("approval_status",), _photo_contribution),
+    ProjectHighlight: (("approval_status",), _project_contribution),
+}
+
+
+def contribution(instance):
+    """KPI contribution of ``instance`` as it is in memory."""
+    fields, fn = TRACKED[type(instance)]
+    return fn({f: getattr(instance, f) for f in fields})
+
+
+def stored_contribution(instance, update_fields=None):
+    """
+    KPI contribution of ``instance`` as it is currently stored.
+
+    Returns None when the save cannot change any KPI (an ``update_fields``
+    save that touches none of the tracked fields).
+    """
+    fields, fn = TRACKED[type(instance)]
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return None
+    if instance._state.adding:
+        return {}
+    if not fields:
+        return fn({})
+    values = type(instance).objects.filter(pk=instance.pk).values(*fields).first()
+    return fn(values) if values else {}
+
+
+# ---------------------------------------------------------------------------
+# Applying changes
+# ---------------------------------------------------------------------------
+def apply_delta(before, after):
+    """Add ``after - before`` to the stored rows with a single UPDATE per role."""
+    for role in ROLES:
+        old, new = before.get(role, {}), after.get(role, {})
+        changes = {}
+        for field in KPI_FIELDS:
+            diff = new.get(field, 0) - old.get(field, 0)
+            if diff:
+                changes[field] = F(field) + diff
+        if changes:
+            # A missing row is left alone — load() rebuilds it on first read.
+            DashboardKPI.objects.filter(role=role).update(
+                updated_at=timezone.now(), **changes
+            )
+
+
+def adjust(**changes):
+    """Apply the same delta to every role — for queryset.update() code paths."""
+    apply_delta({}, _same_for_all_roles(changes))
+
+
+# ---------------------------------------------------------------------------
+# Full recompute
+# ---------------------------------------------------------------------------
+def compute():
+    """Recompute every role's KPIs from the source tables."""
+    schools = School.objects.aggregate(
+        total=Count("id"),
+        completed=Count("id", filter=Q(status="completed")),
+        in_progress=Count("id", filter=Q(status="in_progress")),
+        students=Sum("total_students"),
+    )
+    subs = Submission.objects.aggregate(
+        submitted=Count("id", filter=~Q(status="draft")),
+        submitted_students=Sum("student_count", filter=~Q(status="draft")),
+        verified=Count("id", filter=Q(status="verified")),
+        verified_students=Sum("student_count", filter=Q(status="verified")),
+        pending=Count("id", filter=Q(status="submitted")),
+    )
+    shared = {
+        "total_schools": schools["total"],
+        "schools_completed": schools["completed"],
+        "schools_in_progress": schools["in_progress"],
+        "total_students": schools["students"] or 0,
+        "total_districts": District.objects.count(),
+        "pending_submissions": subs["pending"],
+        "pending_photos": SessionPhoto.objects.filter(
+            approval_status="pending").count(),
+        "pending_projects": ProjectHighlight.objects.filter(
+            approval_status="pending").count(),
+    }
+    return {
+        ADMIN: {
+            **shared,
+            "students_trained": subs["submitted_students"] or 0,
+            "total_sessions": subs["submitted"],
+        },
+        SPONSOR: {
+            **shared,
+            "students_trained": subs["verified_students"] or 0,
+            "total_sessions": subs["verified"],
+        },
+    }
+
+
+def rebuild():
+    """Overwrite the stored rows with freshly computed values."""
+    rows = {}
+    for role, values in compute().items():
+        rows[role], _ = DashboardKPI.objects.update_or_create(
+            role=role, defaults=values
+        )
+    return rows
+
+
+def check():
+    """
+    Compare stored rows against a fresh computation.
+
+    Returns {role: {field: (stored, actual)}} for every field that drifted;
+    an empty dict means the snapshot is accurate.
+    """
+    stored = {row.role: row for row in DashboardKPI.objects.all()}
+    drift = {}
+    for role, values in compute().items():
+        row = stored.get(role)
+        for field, actual in values.items():
+            current = getattr(row, field) if row else None
+            if current != actual:
+                drift.setdefault(role, {})[field] = (current, actual)
+    return drift
+
+
+def load(role):
+    """Return the KPI row for ``role``, building the snapshot if it is missing."""
+    try:
+        return DashboardKPI.objects.get(pk=role)
+    except DashboardKPI.DoesNotExist:
+        return rebuild()[role]
@@ -0,0 +1,133 @@
+"""
+Validating and saving session photos.
+
+validation_error() checks a whole set of photos against the program_config
+limits (count, extension, size). Both submit paths call it before any row
+or file is written, so a rejected upload touches neither the database nor
+storage.
+
+The multipart submit path used to save each photo with its own
+SessionPhoto.objects.create(), so a request waited for 3–5 storage round
+trips one after another. store_session_photos() writes the files
+concurrently through a bounded, process-wide thread pool
+(STORAGE_WRITE_WORKERS); if any write fails, the files that did land are
+deleted and PhotoUploadError is raised. Call it before opening the
+transaction: the inserts update the shared DashboardKPI and ResourceVersion
+rows, and those must not stay locked while files travel to storage.
+
+insert_session_photos() then attaches the stored photos to their submission
+with one bulk_create, inside the short transaction that inserts the
+submission. Storage does not roll back with the database, so pass the
+photos to discard() if that transaction fails.
+
+bulk_create skips signals. This module therefore does the work the
+SessionPhoto signals would have done: the pending_photos KPI, the "photos"
+version and derivative scheduling.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from apps.dashboard.models import SessionPhoto
+from apps.dashboard.program_config import (
+    ALLOWED_PHOTO_EXTENSIONS,
+    MAX_PHOTO_SIZE_MB,
+    MAX_PHOTOS_PER_SESSION,
+    MIN_PHOTOS_PER_SESSION,
+)
+from apps.dashboard.services import derivatives, kpi, versions
+
+MAX_BYTES = MAX_PHOTO_SIZE_MB * 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class PhotoUploadError(Exception):
+    """A photo could not be written to storage."""
+
+
+def validation_error(photos):
+    """
+    First problem with ``photos`` — a list of (name, size) pairs — or None
+    when the whole set may be stored.
+    """
+    if len(photos) < MIN_PHOTOS_PER_SESSION:
+        return f"Minimum {MIN_PHOTOS_PER_SESSION} photos required"
+    if len(photos) > MAX_PHOTOS_PER_SESSION:
+        return f"Maximum {MAX_PHOTOS_PER_SESSION} photos allowed"
+    for name, size in photos:
+        if os.path.splitext(name)[1].lower() not in ALLOWED_PHOTO_EXTENSIONS:
+            return f"{name}: only {', '.join(ALLOWED_PHOTO_EXTENSIONS)} files are allowed"
+        if size <= 0:
+            return f"{name}: file is empty"
+        if size > MAX_BYTES:
+            return f"{name}: larger than {MAX_PHOTO_SIZE_MB} MB"
+    return None
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.STORAGE_WRITE_WORKERS,
+                thread_name_prefix="storage-writes",
+            )
+    return _executor
+
+
+def store_session_photos(files):
+    """Store ``files`` in parallel; returns unsaved SessionPhoto objects for them."""
+    field = SessionPhoto._meta.get_field("image")
+    storage = field.storage
+    photos = [SessionPhoto() for _ in files]
+
+    futures = [
+        _pool().submit(
+            storage.save,
+            field.generate_filename(photo, f.name),
+            f,
+            max_length=field.max_length,
+        )
+        for photo, f in zip(photos, files)
+    ]
+    names, failure = [], None
+    for future in futures:
+        try:
+            names.append(future.result())
+        except Exception as exc:
+            failure = failure or exc
+    if failure is not None:
+        _delete(storage, names)
+        raise PhotoUploadError(str(failure)) from failure
+
+    for photo, name in zip(photos, names):
+        photo.image = name
+    return photos
+
+
+def insert_session_photos(submission, photos):
+    """Insert the rows of stored ``photos`` under ``submission``."""
+    for photo in photos:
+        photo.submission = submission
+    SessionPhoto.objects.bulk_create(photos)
+    kpi.adjust(pending_photos=len(photos))
+    versions.bump("photos")
+    for photo in photos:
+        derivatives.schedule(photo)
+    return photos
+
+
+def discard(photos):
+    """Delete the stored files of ``photos`` whose rows were never committed."""
+    storage = SessionPhoto._meta.get_field("image").storage
+    _delete(storage, [photo.image.name for photo in photos if photo.image])
+
+
+def _delete(storage, names):
+    for name in names:
+        storage.delete(name)
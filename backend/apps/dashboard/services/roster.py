@@ -0,0 +1,178 @@
+"""
+Bulk student roster import from CSV or XLSX.
+
+Adding a class of 57 students one POST at a time means 57 round trips. An
+import takes the whole roster in one file instead:
+
+    name,age,grade,parent_name,parent_phone,baseline_marks
+    Asma Begum,12,7,Rahim,9876543210,7
+
+Only ``name`` is required; unknown columns are ignored and common header
+spellings ("Student Name", "Class", "Baseline") are accepted. Rows are read
+one at a time (CSV line by line, XLSX through openpyxl's read-only mode), so
+a large file is never held in memory as a whole.
+
+import_students() validates every row before writing anything; when any row
+is invalid the import writes nothing and returns every row-level error at
+once. Otherwise it skips names the school already has (and repeats within
+the file) using one lookup, inserts the rest with bulk_create, and refreshes
+School.total_students once.
+
+XLSX support needs the optional ``openpyxl`` package; CSV works without it.
+"""
+
+import codecs
+import csv
+import os
+
+from django.db import transaction
+
+from apps.dashboard.models import Student
+from apps.dashboard.program_config import ALLOWED_ROSTER_EXTENSIONS, MAX_ROSTER_ROWS
+from apps.dashboard.serializers import StudentCreateSerializer
+from apps.dashboard.services import versions
+
+COLUMNS = (
+    "name", "age", "grade", "parent_name", "parent_phone", "notes",
+    "baseline_marks", "endline_marks",
+)
+ALIASES = {
+    "student": "name",
+    "student_name": "name",
+    "full_name": "name",
+    "class": "grade",
+    "standard": "grade",
+    "parent": "parent_name",
+    "guardian": "parent_name",
+    "guardian_name": "parent_name",
+    "phone": "parent_phone",
+    "parent_mobile": "parent_phone",
+    "mobile": "parent_phone",
+    "baseline": "baseline_marks",
+    "endline": "endline_marks",
+}
+# Spreadsheet row of the first data row (row 1 is the header)
+FIRST_ROW = 2
+
+
+class RosterError(Exception):
+    """The file as a whole cannot be imported (format, header, size)."""
+
+
+def read_rows(file, filename):
+    """Yield ``(row_number, {column: value})`` for each non-blank data row."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in ALLOWED_ROSTER_EXTENSIONS:
+        raise RosterError(
+            f"Unsupported file type '{ext}'. Allowed: {', '.join(ALLOWED_ROSTER_EXTENSIONS)}"
+        )
+    rows = _xlsx_rows(file) if ext == ".xlsx" else _csv_rows(file)
+
+    try:
+        header = next(rows)
+    except StopIteration:
+        raise RosterError("The file is empty.")
+    columns = [_column(cell) for cell in header]
+    if "name" not in columns:
+        raise RosterError("The first row must be a header with a 'name' column.")
+
+    for number, cells in enumerate(rows, start=FIRST_ROW):
+        values = {}
+        for column, cell in zip(columns, cells):
+            cell = _clean(cell)
+            if column and cell != "":
+                values[column] = cell
+        if not values:
+            continue
+        if number - FIRST_ROW >= MAX_ROSTER_ROWS:
+            raise RosterError(f"A roster may have at most {MAX_ROSTER_ROWS} rows.")
+        yield number, values
+
+
+def import_students(school, user, rows, dry_run=False):
+    """Validate and insert ``rows`` (from read_rows) as students of ``school``.
+
+    Returns ``{"created", "skipped", "errors"}``: the number of students
+    created (or that would be, with ``dry_run``), ``[{"row", "name"}]`` for
+    names already present, and ``[{"row", "errors"}]`` for invalid rows.
+    Nothing is written when there are errors or when ``dry_run`` is set.
+    """
+    valid, errors = [], []
+    for number, values in rows:
+        serializer = StudentCreateSerializer(data=values)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({"row": number, "errors": serializer.errors})
+
+    existing = {
+        _key(name)
+        for name in Student.objects.filter(school=school).values_list("name", flat=True)
+    }
+    new, skipped = [], []
+    for number, data in valid:
+        key = _key(data["name"])
+        if key in existing:
+            skipped.append({"row": number, "name": data["name"]})
+            continue
+        existing.add(key)
+        new.append(Student(school=school, added_by=user, **data))
+
+    if errors:
+        return {"created": 0, "skipped": skipped, "errors": errors}
+    if dry_run or not new:
+        return {"created": len(new), "skipped": skipped, "errors": []}
+
+    with transaction.atomic():
+        # bulk_create skips post_save, so bump the ETag version by hand
+        Student.objects.bulk_create(new, batch_size=500)
+        versions.bump("students")
+        school.total_students = Student.objects.filter(school=school).count()
+        school.save(update_fields=["total_students"])
+    return {"created": len(new), "skipped": skipped, "errors": []}
+
+
+def _csv_rows(file):
+    # Iterating an uploaded file yields lines without reading it all
+    lines = codecs.iterdecode(file, "utf-8-sig")
+    try:
+        yield from csv.reader(lines)
+    except UnicodeDecodeError:
+        raise RosterError("CSV files must be UTF-8 encoded.")
+    except csv.Error as exc:
+        raise RosterError(f"Could not read the CSV file: {exc}")
+
+
+def _xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterError("XLSX import is not available on this server; upload a CSV instead.")
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise RosterError("Could not read the XLSX file.")
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _column(cell):
+    column = "_".join(str(cell or "").strip().lower().split())
+    column = ALIASES.get(column, column)
+    return column if column in COLUMNS else None
+
+
+def _clean(cell):
+    if cell is None:
+        return ""
+    # Spreadsheets store whole numbers (ages, marks, phones) as floats
+    if isinstance(cell, float) and cell.is_integer():
+        cell = int(cell)
+    return str(cell).strip()
+
+
+def _key(name):
+    """Names match regardless of case and spacing."""
+    return " ".join(name.split()).casefold()
@@ -0,0 +1,257 @@
+"""
+Database-backed background task queue.
+
+Slow side effects (SMTP, image processing) should not hold a request open.
+A function decorated with @task can be enqueued from a view or a signal and
+runs later in ``manage.py run_worker``:
+
+    @tasks.task(max_attempts=3)
+    def deliver(to, subject, body): ...
+
+    deliver.delay(["a@example.com"], "Hello", "...")
+
+The queued row is written in the caller's transaction, so a task never sees
+rows that were rolled back or not yet committed. Arguments are stored as
+JSON and the function is looked up by its dotted path when it runs.
+
+Workers claim tasks with ``SELECT ... FOR UPDATE SKIP LOCKED``, highest
+priority first, so several workers can poll one table without blocking one
+another. Each task belongs to a lane (``queue``). A worker started with
+``--queues priority`` serves only the priority lane, so a user-facing task
+such as an OTP email never waits behind a long batch in the default lane.
+
+A failing task is retried with exponential backoff. After ``max_attempts``
+it is marked dead and kept for inspection in the admin.
+While a worker runs a task it refreshes the task's locked_at every
+HEARTBEAT_INTERVAL (heartbeat()), however long the task takes. A running
+task whose locked_at is older than STALE_AFTER therefore belongs to a worker
+that died, and requeue_stale() puts it back on the queue.
+
+Production runs ``manage.py run_worker`` next to the web server (see
+run_worker for supervision); nothing else starts it. TASK_QUEUE_EAGER runs
+each task after commit in the calling process instead, and defaults to on
+when DEBUG is, so a development server needs no worker. At startup the web
+process logs a warning (check_workers_at_startup) when due tasks are
+piling up and no worker has claimed one recently.
+"""
+
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.dashboard.models import Task
+
+logger = logging.getLogger(__name__)
+
+HIGH = 10
+NORMAL = 0
+LOW = -10
+
+DEFAULT_QUEUE = "default"
+PRIORITY_QUEUE = "priority"
+
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=1)
+# Workers refresh locked_at on their running tasks this often
+HEARTBEAT_INTERVAL = timedelta(minutes=1)
+# A running task whose worker has been silent this long is requeued
+STALE_AFTER = timedelta(minutes=10)
+# Finished tasks are deleted after this long; dead ones are kept
+KEEP_DONE = timedelta(days=7)
+# Due tasks waiting this long with no claim in the meantime mean no worker
+UNATTENDED_AFTER = timedelta(minutes=5)
+
+
+def task(max_attempts=DEFAULT_MAX_ATTEMPTS, priority=NORMAL, queue=DEFAULT_QUEUE):
+    """Register ``func`` as a task and give it a ``.delay(*args, **kwargs)``."""
+
+    def decorator(func):
+        func.task_name = f"{func.__module__}.{func.__qualname__}"
+        func.max_attempts = max_attempts
+        func.priority = priority
+        func.queue = queue
+        func.delay = lambda *args, **kwargs: enqueue(func, args, kwargs)
+        return func
+
+    return decorator
+
+
+def enqueue(func, args=(), kwargs=None, *, priority=None, delay=None):
+    """Queue ``func(*args, **kwargs)``. Returns the Task, or None when eager."""
+    kwargs = kwargs or {}
+    if getattr(settings, "TASK_QUEUE_EAGER", False):
+        transaction.on_commit(lambda: func(*args, **kwargs), robust=True)
+        return None
+    return Task.objects.create(
+        name=func.task_name,
+        queue=func.queue,
+        args=list(args),
+        kwargs=kwargs,
+        priority=func.priority if priority is None else priority,
+        max_attempts=func.max_attempts,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+
+
+def claim(worker, queues=None):
+    """Lock the next due task for ``worker`` and mark it running, or return None.
+
+    ``queues`` limits the lanes considered; None means every lane.
+    """
+    now = timezone.now()
+    due = Task.objects.filter(status=Task.Status.QUEUED, run_at__lte=now)
+    if queues is not None:
+        due = due.filter(queue__in=queues)
+    with transaction.atomic():
+        task = (
+            due.select_for_update(skip_locked=True)
+            .order_by("-priority", "run_at", "pk")
+            .first()
+        )
+        if task is None:
+            return None
+        task.status = Task.Status.RUNNING
+        task.attempts += 1
+        task.locked_by = worker
+        task.locked_at = now
+        task.save(update_fields=["status", "attempts", "locked_by", "locked_at"])
+    return task
+
+
+def execute(task):
+    """Run a claimed task and record the outcome. Returns True on success."""
+    try:
+        func = import_string(task.name)
+        func(*task.args, **task.kwargs)
+    except Exception:
+        logger.exception("Task %s (%s) failed, attempt %s", task.pk, task.name, task.attempts)
+        _failed(task, traceback.format_exc())
+        return False
+    Task.objects.filter(pk=task.pk).update(
+        status=Task.Status.DONE,
+        finished_at=timezone.now(),
+        locked_by="",
+        locked_at=None,
+    )
+    return True
+
+
+def backoff(attempts):
+    """Delay before retry number ``attempts`` (1-based), with jitter."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(1, 1.25)
+
+
+def _failed(task, error):
+    now = timezone.now()
+    if task.attempts >= task.max_attempts:
+        changes = {"status": Task.Status.DEAD, "finished_at": now}
+    else:
+        changes = {"status": Task.Status.QUEUED, "run_at": now + backoff(task.attempts)}
+    Task.objects.filter(pk=task.pk).update(
+        last_error=error, locked_by="", locked_at=None, **changes
+    )
+
+
+def run_pending(worker="inline", queues=None):
+    """Run due tasks in this process until none are left. Returns the count run."""
+    count = 0
+    while (task := claim(worker, queues)) is not None:
+        execute(task)
+        count += 1
+    return count
+
+
+def heartbeat(workers):
+    """Refresh locked_at on the tasks ``workers`` are running. Returns the count."""
+    return Task.objects.filter(status=Task.Status.RUNNING, locked_by__in=workers).update(
+        locked_at=timezone.now()
+    )
+
+
+def requeue_stale():
+    """Requeue tasks whose worker died mid-run (or dead-letter them). Returns the count."""
+    now = timezone.now()
+    stale = Task.objects.filter(
+        status=Task.Status.RUNNING, locked_at__lt=now - STALE_AFTER
+    )
+    dead = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.Status.DEAD,
+        finished_at=now,
+        last_error="Worker stopped while running the task.",
+        locked_by="",
+        locked_at=None,
+    )
+    requeued = stale.update(
+        status=Task.Status.QUEUED, run_at=now, locked_by="", locked_at=None
+    )
+    return dead + requeued
+
+
+def retry(queryset):
+    """Put dead tasks back on the queue with a fresh attempt budget."""
+    return queryset.filter(status=Task.Status.DEAD).update(
+        status=Task.Status.QUEUED,
+        attempts=0,
+        run_at=timezone.now(),
+        finished_at=None,
+    )
+
+
+def unattended():
+    """Due tasks waiting over UNATTENDED_AFTER while no worker claimed anything."""
+    cutoff = timezone.now() - UNATTENDED_AFTER
+    recent = Task.objects.filter(Q(locked_at__gte=cutoff) | Q(finished_at__gte=cutoff))
+    if recent.exists():
+        return 0
+    return Task.objects.filter(status=Task.Status.QUEUED, run_at__lt=cutoff).count()
+
+
+def warn_if_unattended():
+    """Log a warning at startup when queued tasks have no worker to run them."""
+    if getattr(settings, "TASK_QUEUE_EAGER", False):
+        return
+    try:
+        waiting = unattended()
+    except DatabaseError:
+        return  # not migrated yet, or the database is down; not ours to report
+    if waiting:
+        logger.warning(
+            "%s background tasks have been due for over %s and no worker has "
+            "claimed any; start `manage.py run_worker` (or set TASK_QUEUE_EAGER=True "
+            "in development).",
+            waiting, UNATTENDED_AFTER,
+        )
+
+
+def check_workers_at_startup():
+    """warn_if_unattended() on a short-lived thread, for config.asgi / config.wsgi.
+
+    ASGI servers import the application inside their event loop, where
+    Django refuses synchronous queries; a thread also keeps a slow database
+    from delaying startup.
+    """
+    def run():
+        try:
+            warn_if_unattended()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, name="task-queue-check", daemon=True).start()
+
+
+def purge_finished():
+    """Delete tasks that finished more than KEEP_DONE ago. Returns the count."""
+    deleted, _ = Task.objects.filter(
+        status=Task.Status.DONE, finished_at__lt=timezone.now() - KEEP_DONE
+    ).delete()
+    return deleted
@@ -0,0 +1,63 @@
+"""
+Per-resource change versions.
+
+Every write to a tracked model bumps the counter of the resource it belongs
+to (wired up in signals.py). Polled views turn the counters they depend on
+into an ETag, so a poll that finds nothing changed is answered with a 304
+after a single primary-key lookup.
+
+queryset.update() does not fire signals — code paths that use it call
+bump() themselves.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.utils import timezone
+
+from apps.dashboard.models import (
+    ActivityLog,
+    District,
+    ProjectHighlight,
+    ResourceVersion,
+    School,
+    SessionPhoto,
+    Student,
+    StudentGroup,
+    Submission,
+    TrainerAssignment,
+    UWHControl,
+)
+
+# resource name -> model whose writes change it
+RESOURCES = {
+    "activity": ActivityLog,
+    "assignments": TrainerAssignment,
+    "districts": District,
+    "groups": StudentGroup,
+    "photos": SessionPhoto,
+    "projects": ProjectHighlight,
+    "schools": School,
+    "students": Student,
+    "submissions": Submission,
+    "users": get_user_model(),
+    "uwh_control": UWHControl,
+}
+
+
+def bump(*names):
+    """Mark ``names`` as changed."""
+    now = timezone.now()
+    for name in names:
+        updated = ResourceVersion.objects.filter(name=name).update(
+            version=F("version") + 1, updated_at=now
+        )
+        if not updated:
+            ResourceVersion.objects.get_or_create(name=name, defaults={"version": 1})
+
+
+def current(names):
+    """Return {name: version} for ``names`` in one query (0 if never bumped)."""
+    found = dict(
+        ResourceVersion.objects.filter(name__in=names).values_list("name", "version")
+    )
+    return {name: found.get(name, 0) for name in names}
@@ -1,6 +1,9 @@
-from django.db.models.signals import pre_save
+from contextlib import contextmanager
+
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .models import Submission, ActivityLog
+from .services import derivatives, kpi, versions
 
 
 @receiver(pre_save, sender=Submission)
@@ -72,3 +75,89 @@ def on_submission_status_change(sender, instance, **kwargs):
                 "submission_id": str(instance.pk),
             },
         )
+
+
+# ─────────────────────────────────────────
+#  Dashboard KPI snapshot
+# ─────────────────────────────────────────
+
+
+def _kpi_before_save(sender, instance, update_fields=None, **kwargs):
+    instance._kpi_before = kpi.stored_contribution(instance, update_fields)
+
+
+def _kpi_after_save(sender, instance, **kwargs):
+    before = instance.__dict__.pop("_kpi_before", None)
+    if before is None:
+        return
+    kpi.apply_delta(before, kpi.contribution(instance))
+
+
+def _kpi_after_delete(sender, instance, **kwargs):
+    kpi.apply_delta(kpi.contribution(instance), {})
+
+
+# (signal, receiver, sender, dispatch_uid) of every per-row receiver below,
+# so muted() can take them off and put them back
+_connections = []
+
+
+def _connect(signal, func, sender, dispatch_uid):
+    signal.connect(func, sender=sender, dispatch_uid=dispatch_uid)
+    _connections.append((signal, func, sender, dispatch_uid))
+
+
+@contextmanager
+def muted():
+    """
+    Disconnect the KPI, version and derivative receivers for the block.
+
+    For bulk maintenance (seed_synthetic --flush) that rebuilds the KPI
+    snapshot and bumps versions once itself. With no receivers left, the
+    ORM deletes cascaded rows with one DELETE per table instead of loading
+    and signalling them one by one. Not for request code: the receivers are
+    process-wide.
+    """
+    for signal, _, sender, dispatch_uid in _connections:
+        signal.disconnect(sender=sender, dispatch_uid=dispatch_uid)
+    try:
+        yield
+    finally:
+        for signal, func, sender, dispatch_uid in _connections:
+            signal.connect(func, sender=sender, dispatch_uid=dispatch_uid)
+
+
+for _model in kpi.TRACKED:
+    _connect(pre_save, _kpi_before_save, _model, f"kpi_pre_save_{_model.__name__}")
+    _connect(post_save, _kpi_after_save, _model, f"kpi_post_save_{_model.__name__}")
+    _connect(post_delete, _kpi_after_delete, _model, f"kpi_post_delete_{_model.__name__}")
+
+
+# ─────────────────────────────────────────
+#  Resource change versions (ETags)
+# ─────────────────────────────────────────
+
+
+def _bump_resource(sender, **kwargs):
+    versions.bump(_resource_for[sender])
+
+
+_resource_for = {model: name for name, model in versions.RESOURCES.items()}
+
+for _model in _resource_for:
+    _connect(post_save, _bump_resource, _model, f"version_post_save_{_model.__name__}")
+    _connect(post_delete, _bump_resource, _model, f"version_post_delete_{_model.__name__}")
+
+
+# ─────────────────────────────────────────
+#  Image derivatives
+# ─────────────────────────────────────────
+
+
+def _schedule_derivatives(sender, instance, **kwargs):
+    if derivatives.is_stale(instance):
+        derivatives.schedule(instance)
+
+
+for _model in derivatives.MODELS:
+    _connect(post_save, _schedule_derivatives, _model, f"derivatives_post_save_{_model.__name__}")
@@ -0,0 +1,185 @@
+"""
+Server-Sent Events for the Swinfy moderation queues.
+
+One broadcaster per worker process watches the resource versions bumped by
+submission / photo / project / ActivityLog writes (services/versions.py).
+That is a single primary-key query per tick no matter how many admins are
+connected. When something changed it fans out to every open stream:
+
+    event: counts     {"pending_submissions": 3, "pending_photos": 12, ...}
+    event: changed    {"resources": ["photos"]}
+    event: activity   {...ActivityLog entry...}
+
+EventSource cannot send an Authorization header, so the client first
+POSTs swinfy/stream/ticket/ (JWT in the header) for a signed ticket that is
+good for STREAM_TICKET_EXPIRES seconds and only for this stream, then opens
+``swinfy/stream/?ticket=...``. Access tokens are never put in the URL, where
+proxies and access logs would keep them.
+
+Each worker process with at least one open stream polls every
+STREAM_POLL_SECONDS (one query per tick; the loop stops when the last
+client disconnects). Raise it to trade latency for database load when many
+workers are running.
+
+Serve the app under ASGI (config.asgi:application) so that each idle
+connection is a suspended coroutine rather than a blocked worker thread.
+"""
+
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .models import ActivityLog
+from .serializers import ActivityLogSerializer
+from .services import kpi, versions
+
+logger = logging.getLogger(__name__)
+
+WATCHED_RESOURCES = ("submissions", "photos", "projects", "activity")
+QUEUE_RESOURCES = ("submissions", "photos", "projects")
+HEARTBEAT_SECONDS = 15
+MAX_PENDING_EVENTS = 100
+TICKET_SALT = "dashboard.swinfy-stream"
+
+
+def issue_ticket(user):
+    """A signed ``?ticket=`` for ``user``, valid for STREAM_TICKET_EXPIRES seconds."""
+    return signing.dumps({"user": str(user.pk)}, salt=TICKET_SALT)
+
+
+def authenticate(request):
+    """
+    Resolve the user from a Bearer header or a stream ``?ticket=``. Returns
+    None when neither is present or valid.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    if header:
+        raw_token = auth.get_raw_token(header)
+        if not raw_token:
+            return None
+        try:
+            return auth.get_user(auth.get_validated_token(raw_token))
+        except (InvalidToken, AuthenticationFailed):
+            return None
+
+    ticket = request.GET.get("ticket")
+    if not ticket:
+        return None
+    try:
+        payload = signing.loads(
+            ticket, salt=TICKET_SALT, max_age=settings.STREAM_TICKET_EXPIRES
+        )
+    except signing.BadSignature:  # includes SignatureExpired
+        return None
+    return get_user_model().objects.filter(pk=payload["user"], is_active=True).first()
+
+
+def queue_counts():
+    row = kpi.load("admin")
+    return {
+        "pending_submissions": row.pending_submissions,
+        "pending_photos": row.pending_photos,
+        "pending_projects": row.pending_projects,
+    }
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class QueueBroadcaster:
+    """Polls once per process and pushes events to every subscriber queue."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._task = None
+        self._versions = None
+        self._last_activity = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+
+    async def _run(self):
+        self._versions = None
+        while self._subscribers:
+            try:
+                events = await sync_to_async(self._poll)()
+            except Exception:
+                logger.exception("Swinfy stream poll failed")
+                events = []
+            for queue in list(self._subscribers):
+                for event in events:
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        # Slow client — it will resync from the next counts event
+                        pass
+            await asyncio.sleep(settings.STREAM_POLL_SECONDS)
+
+    def _poll(self):
+        close_old_connections()
+        current = versions.current(WATCHED_RESOURCES)
+        if self._versions is None:
+            self._versions = current
+            self._last_activity = (
+                ActivityLog.objects.order_by("-timestamp")
+                .values_list("timestamp", flat=True)
+                .first()
+            )
+            return []
+
+        changed = [name for name in WATCHED_RESOURCES if current[name] != self._versions[name]]
+        self._versions = current
+        if not changed:
+            return []
+
+        events = [("changed", {"resources": changed})]
+        if any(name in QUEUE_RESOURCES for name in changed):
+            events.append(("counts", queue_counts()))
+        if "activity" in changed:
+            entries = ActivityLog.objects.select_related("user").order_by("timestamp")
+            if self._last_activity:
+                entries = entries.filter(timestamp__gt=self._last_activity)
+            entries = list(entries[:MAX_PENDING_EVENTS])
+            if entries:
+                self._last_activity = entries[-1].timestamp
+            events.extend(
+                ("activity", data)
+                for data in ActivityLogSerializer(entries, many=True).data
+            )
+        return events
+
+
+broadcaster = QueueBroadcaster()
+
+
+async def event_stream():
+    queue = broadcaster.subscribe()
+    try:
+        yield format_event("counts", await sync_to_async(queue_counts)())
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event, data)
+    finally:
+        broadcaster.unsubscribe(queue)
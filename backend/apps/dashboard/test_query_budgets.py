@@ -0,0 +1,519 @@
+"""
+Per-endpoint query and payload budgets.
+
+Seeds a programme-sized dataset (40 schools × 4 days × 5 photos, 10 projects
+and 25 students per school) and calls every route in apps/dashboard/urls.py
+and apps/accounts/urls.py once. Each call must stay within its SQL query
+budget and serialized payload budget; a failure lists the offending SQL so an
+N+1 or duplicated aggregate is obvious from the CI log.
+
+Budgets are measured against this dataset with a little headroom. Raise one
+only when the extra query or bytes are intentional. A new route fails
+test_every_route_has_a_budget until it is added to ROUTES (or EXEMPT).
+
+Clients authenticate with force_authenticate, so JWT user lookups are not
+counted.
+"""
+
+import io
+import tempfile
+from collections import namedtuple
+from datetime import timedelta
+
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts import otp_service
+from apps.accounts.models import User
+from apps.dashboard.models import (
+    ActivityLog,
+    Curriculum,
+    District,
+    ProjectHighlight,
+    School,
+    SessionPhoto,
+    Student,
+    StudentGroup,
+    Submission,
+    TrainerAssignment,
+    UWHControl,
+)
+from apps.dashboard.services import chunked_uploads, direct_upload, email, kpi
+
+SCHOOLS = 40
+DAYS = 4
+PHOTOS_PER_SUBMISSION = 5
+PROJECTS_PER_SCHOOL = 10
+STUDENTS_PER_SCHOOL = 25
+GROUPS_PER_SCHOOL = 3
+SCHOOLS_PER_DISTRICT = 5
+SCHOOLS_PER_TRAINER = 4
+
+# URL pattern (relative to /api/), method, path, user, data, max queries,
+# max payload bytes, request format.
+# Paths and data may reference seeded objects as {name}; see _ids().
+Route = namedtuple(
+    "Route", "pattern method path user data max_queries max_bytes fmt",
+    defaults=(None, 0, 0, "json"),
+)
+
+ROUTES = [
+    # ── Shared ──
+    Route("dashboard/summary/", "get", "dashboard/summary/", "admin", None, 2, 200),
+    Route("dashboard/districts/", "get", "dashboard/districts/", "admin", None, 1, 1_600),
+    Route("dashboard/schools/", "get", "dashboard/schools/", "admin", None, 2, 20_000),
+    Route("dashboard/schools/<uuid:pk>/", "get", "dashboard/schools/{school}/", "admin", None, 4, 3_000),
+    Route("dashboard/curriculum/", "get", "dashboard/curriculum/", "trainer", None, 1, 1_000),
+
+    # ── Trainer ──
+    Route("dashboard/trainer/profile/", "get", "dashboard/trainer/profile/", "trainer", None, 2, 1_900),
+    Route("dashboard/trainer/profile/", "patch", "dashboard/trainer/profile/", "trainer",
+          {"username": "Renamed"}, 5, 1_900, "multipart"),
+    Route("dashboard/trainer/submissions/", "get", "dashboard/trainer/submissions/", "trainer", None, 1, 7_000),
+    Route("dashboard/trainer/submit/", "post", "dashboard/trainer/submit/", "trainer",
+          "submit", 22, 2_000, "multipart"),
+    Route("dashboard/trainer/submit/", "post", "dashboard/trainer/submit/", "trainer",
+          {"school": "{trainer_school}", "day_number": DAYS + 1, "student_count": 20,
+           "uploads": [{"name": f"p{i}.jpg", "content_type": "image/jpeg", "size": 4_000}
+                       for i in range(3)]}, 10, 3_000),
+    Route("dashboard/trainer/submissions/<uuid:pk>/", "get",
+          "dashboard/trainer/submissions/{trainer_submission}/", "trainer", None, 4, 6_000),
+    Route("dashboard/trainer/submissions/<uuid:pk>/finalize/", "post",
+          "dashboard/trainer/submissions/{draft}/finalize/", "trainer",
+          {"keys": ["{draft_key_0}", "{draft_key_1}", "{draft_key_2}"]}, 38, 2_700),
+    Route("dashboard/trainer/submissions/<uuid:submission_pk>/projects/", "post",
+          "dashboard/trainer/submissions/{trainer_submission}/projects/", "trainer",
+          {"student_name": "Team", "title": "Robot", "description": "Demo"}, 10, 700, "multipart"),
+    Route("dashboard/trainer/students/", "get", "dashboard/trainer/students/", "trainer", None, 1, 55_000),
+    Route("dashboard/trainer/students/add/", "post", "dashboard/trainer/students/add/", "trainer",
+          {"school": "{trainer_school}", "name": "New Student"}, 7, 200),
+    # 30 rows: one name lookup, one bulk insert, one total_students refresh
+    Route("dashboard/trainer/students/import/", "post", "dashboard/trainer/students/import/", "trainer",
+          "roster", 20, 200, "multipart"),
+    # 25 students: one ownership lookup, one bulk UPDATE
+    Route("dashboard/trainer/students/marks/", "post", "dashboard/trainer/students/marks/", "trainer",
+          "marks", 9, 2_100, "json"),
+    Route("dashboard/trainer/students/<uuid:pk>/", "patch",
+          "dashboard/trainer/students/{student}/", "trainer", {"name": "Renamed"}, 9, 600),
+    Route("dashboard/trainer/students/<uuid:pk>/delete/", "delete",
+          "dashboard/trainer/students/{student}/delete/", "trainer", None, 7, 0),
+    Route("dashboard/trainer/groups/", "get", "dashboard/trainer/groups/", "trainer", None, 3, 60_000),
+    Route("dashboard/trainer/groups/create/", "post", "dashboard/trainer/groups/create/", "trainer",
+          {"name": "New Group"}, 8, 300),
+    Route("dashboard/trainer/groups/<uuid:pk>/", "patch",
+          "dashboard/trainer/groups/{group}/", "trainer", {"name": "Renamed Group"}, 9, 5_000),
+    Route("dashboard/trainer/groups/<uuid:pk>/delete/", "delete",
+          "dashboard/trainer/groups/{group}/delete/", "trainer", None, 16, 0),
+    Route("dashboard/trainer/groups/<uuid:pk>/assign-students/", "post",
+          "dashboard/trainer/groups/{group}/assign-students/", "trainer",
+          {"student_ids": ["{student}"]}, 8, 100),
+    Route("dashboard/trainer/groups/<uuid:pk>/remove-students/", "post",
+          "dashboard/trainer/groups/{group}/remove-students/", "trainer",
+          {"student_ids": ["{student}"]}, 8, 100),
+    Route("dashboard/trainer/projects/", "get", "dashboard/trainer/projects/", "trainer", None, 2, 55_000),
+    Route("dashboard/trainer/projects/create/", "post", "dashboard/trainer/projects/create/", "trainer",
+          {"student_name": "Team", "title": "Robot", "description": "Demo"}, 9, 700, "multipart"),
+    Route("dashboard/trainer/uploads/", "post", "dashboard/trainer/uploads/", "trainer",
+          {"filename": "demo.mp4", "size": 4}, 1, 200),
+    Route("dashboard/trainer/uploads/<uuid:pk>/", "get",
+          "dashboard/trainer/uploads/{upload_new}/", "trainer", None, 1, 200),
+    Route("dashboard/trainer/uploads/<uuid:pk>/", "put",
+          "dashboard/trainer/uploads/{upload_new}/", "trainer", "chunk", 2, 100),
+    Route("dashboard/trainer/uploads/<uuid:pk>/complete/", "post",
+          "dashboard/trainer/uploads/{upload_full}/complete/", "trainer", None, 3, 200),
+    Route("dashboard/trainer/gallery/", "get", "dashboard/trainer/gallery/", "trainer", None, 1, 35_000),
+    Route("dashboard/trainer/schools/", "get", "dashboard/trainer/schools/", "trainer", None, 2, 2_000),
+    Route("dashboard/uploads/direct/", "post", "dashboard/uploads/direct/", None,
+          "upload", 0, 0, "multipart"),
+
+    # ── Swinfy ──
+    Route("dashboard/swinfy/schools/<uuid:pk>/", "patch",
+          "dashboard/swinfy/schools/{school}/", "admin", {"poc_name": "Ravi"}, 10, 3_000),
+    Route("dashboard/swinfy/trainers/", "get", "dashboard/swinfy/trainers/", "admin", None, 4, 13_000),
+    Route("dashboard/swinfy/trainers/assign/", "post", "dashboard/swinfy/trainers/assign/", "admin",
+          {"trainer": "{trainer}", "school": "{unassigned_school}"}, 12, 400),
+    Route("dashboard/swinfy/trainers/assignments/<uuid:pk>/", "delete",
+          "dashboard/swinfy/trainers/assignments/{assignment}/", "admin", None, 7, 0),
+    Route("dashboard/swinfy/submissions/", "get", "dashboard/swinfy/submissions/", "admin", None, 2, 70_000),
+    Route("dashboard/swinfy/submissions/<uuid:pk>/", "get",
+          "dashboard/swinfy/submissions/{submission}/", "admin", None, 3, 4_000),
+    Route("dashboard/swinfy/submissions/<uuid:pk>/verify/", "patch",
+          "dashboard/swinfy/submissions/{submission}/verify/", "admin", {"notes": "ok"}, 19, 100),
+    Route("dashboard/swinfy/submissions/<uuid:pk>/flag/", "patch",
+          "dashboard/swinfy/submissions/{submission}/flag/", "admin", {"reason": "blurry"}, 19, 100),
+    Route("dashboard/swinfy/submissions/<uuid:pk>/reject/", "patch",
+          "dashboard/swinfy/submissions/{submission}/reject/", "admin", {"reason": "wrong"}, 19, 100),
+    Route("dashboard/swinfy/photos/pending/", "get", "dashboard/swinfy/photos/pending/", "admin", None, 2, 150_000),
+    Route("dashboard/swinfy/photos/<uuid:pk>/approve/", "patch",
+          "dashboard/swinfy/photos/{photo}/approve/", "admin", None, 19, 100),
+    Route("dashboard/swinfy/photos/<uuid:pk>/feature/", "patch",
+          "dashboard/swinfy/photos/{photo}/feature/", "admin", None, 11, 100),
+    Route("dashboard/swinfy/photos/<uuid:pk>/reject/", "patch",
+          "dashboard/swinfy/photos/{photo}/reject/", "admin", {"reason": "blurry"}, 19, 100),
+    Route("dashboard/swinfy/photos/<uuid:pk>/delete/", "delete",
+          "dashboard/swinfy/photos/{photo}/delete/", "admin", None, 9, 0),
+    Route("dashboard/swinfy/photos/bulk-approve/", "post", "dashboard/swinfy/photos/bulk-approve/", "admin",
+          {"photo_ids": ["{photo}"]}, 9, 100),
+    Route("dashboard/swinfy/photos/bulk-reject/", "post", "dashboard/swinfy/photos/bulk-reject/", "admin",
+          {"photo_ids": ["{photo}"], "reason": "blurry"}, 9, 100),
+    Route("dashboard/swinfy/projects/pending/", "get", "dashboard/swinfy/projects/pending/", "admin", None, 3, 205_000),
+    Route("dashboard/swinfy/projects/<uuid:pk>/approve/", "patch",
+          "dashboard/swinfy/projects/{project}/approve/", "admin", None, 16, 100),
+    Route("dashboard/swinfy/projects/<uuid:pk>/feature/", "patch",
+          "dashboard/swinfy/projects/{project}/feature/", "admin", None, 16, 100),
+    Route("dashboard/swinfy/projects/<uuid:pk>/reject/", "patch",
+          "dashboard/swinfy/projects/{project}/reject/", "admin", {"reason": "dup"}, 10, 100),
+    Route("dashboard/swinfy/projects/<uuid:pk>/edit-for-uwh/", "patch",
+          "dashboard/swinfy/projects/{project}/edit-for-uwh/", "admin", {"description": "Curated"}, 11, 1_100),
+    Route("dashboard/swinfy/uwh-control/", "get", "dashboard/swinfy/uwh-control/", "admin", None, 1, 200),
+    Route("dashboard/swinfy/uwh-control/status-banner/", "patch",
+          "dashboard/swinfy/uwh-control/status-banner/", "admin", {"message": "All good"}, 3, 200),
+    Route("dashboard/swinfy/uwh-control/financial-summary/", "patch",
+          "dashboard/swinfy/uwh-control/financial-summary/", "admin", {"data": {"spent": 10}}, 3, 300),
+    Route("dashboard/swinfy/activity-log/", "get", "dashboard/swinfy/activity-log/", "admin", None, 2, 16_000),
+    # Exports are the whole table in one streamed query
+    Route("dashboard/swinfy/stream/ticket/", "post", "dashboard/swinfy/stream/ticket/",
+          "admin", None, 0, 200),
+    Route("dashboard/swinfy/export/submissions/", "get", "dashboard/swinfy/export/submissions/",
+          "admin", None, 1, 30_000),
+    Route("dashboard/swinfy/export/students/", "get", "dashboard/swinfy/export/students/",
+          "admin", None, 1, 130_000),
+    Route("dashboard/swinfy/export/projects/", "get", "dashboard/swinfy/export/projects/",
+          "admin", None, 1, 62_000),
+    Route("dashboard/swinfy/export/photos/", "get", "dashboard/swinfy/export/photos/",
+          "admin", None, 1, 195_000),
+    # Versions twice (ETag, cache key), then students, schools, groups,
+    # assignments and districts once each
+    Route("dashboard/swinfy/learning-gains/", "get", "dashboard/swinfy/learning-gains/", "admin",
+          None, 7, 55_000),
+
+    # ── UWH ──
+    Route("dashboard/uwh/summary/", "get", "dashboard/uwh/summary/", "sponsor", None, 3, 400),
+    Route("dashboard/uwh/gallery/", "get", "dashboard/uwh/gallery/", "sponsor", None, 3, 75_000),
+    # Exists check, then one streamed query each for photos and project images
+    Route("dashboard/uwh/gallery/archive/", "get", "dashboard/uwh/gallery/archive/?school={school}",
+          "sponsor", None, 3, 1_000),
+    Route("dashboard/uwh/projects/", "get", "dashboard/uwh/projects/", "sponsor", None, 3, 205_000),
+    Route("dashboard/uwh/activity-feed/", "get", "dashboard/uwh/activity-feed/", "sponsor", None, 3, 14_000),
+    Route("dashboard/uwh/district-progress/", "get", "dashboard/uwh/district-progress/", "sponsor", None, 2, 1_200),
+    Route("dashboard/uwh/learning-gains/", "get", "dashboard/uwh/learning-gains/", "sponsor",
+          None, 7, 16_000),
+
+    # ── Accounts ──
+    Route("auth/register/", "post", "auth/register/", None,
+          {"email": "new@test.com", "username": "new", "password": "pass1234"}, 4, 800),
+    Route("auth/login/", "post", "auth/login/", None,
+          {"email": "admin@test.com", "password": "pass1234"}, 1, 800),
+    Route("auth/request-otp/", "post", "auth/request-otp/", None, {"email": "admin@test.com"}, 7, 200),
+    Route("auth/verify-otp/", "post", "auth/verify-otp/", None,
+          {"email": "admin@test.com", "code": "{otp}"}, 2, 100),
+    Route("auth/reset-password/", "post", "auth/reset-password/", None,
+          {"email": "admin@test.com", "code": "{otp}", "new_password": "newpass1"}, 5, 100),
+    Route("auth/trainer-register/", "post", "auth/trainer-register/", None,
+          {"email": "fresh@test.com", "first_name": "Fresh", "password": "pass1234",
+           "school": "{school}"}, 18, 200),
+    Route("auth/verify-registration/", "post", "auth/verify-registration/", None,
+          {"email": "pending@test.com", "code": "{pending_otp}"}, 5, 800),
+    Route("auth/resend-registration-otp/", "post", "auth/resend-registration-otp/", None,
+          {"email": "pending@test.com"}, 7, 200),
+    Route("auth/otp-delivery/<uuid:delivery_id>/", "get", "auth/otp-delivery/{delivery}/", None,
+          None, 1, 100),
+    Route("auth/public-schools/", "get", "auth/public-schools/", None, None, 1, 5_000),
+]
+
+# Routes that cannot be driven by a single request/response
+EXEMPT = {
+    "dashboard/swinfy/stream/": "infinite SSE stream; covered by SwinfyStreamTests",
+}
+
+
+def _all_patterns(resolver, prefix=""):
+    for entry in resolver.url_patterns:
+        if isinstance(entry, URLResolver):
+            yield from _all_patterns(entry, prefix + str(entry.pattern))
+        elif isinstance(entry, URLPattern):
+            yield prefix + str(entry.pattern)
+
+
+def _image(name):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), color="blue").save(buf, format="JPEG")
+    return SimpleUploadedFile(name, buf.getvalue(), content_type="image/jpeg")
+
+
+def _fill(value, ids):
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, list):
+        return [_fill(v, ids) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill(v, ids) for k, v in value.items()}
+    return value
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@test.com", username="Admin", password="pass1234",
+            role="admin", is_email_verified=True,
+        )
+        cls.sponsor = User.objects.create_user(
+            email="sponsor@test.com", username="Sponsor", password="pass1234",
+            role="sponsor", is_email_verified=True,
+        )
+        cls.pending = User.objects.create_user(
+            email="pending@test.com", username="Pending", password="pass1234",
+            role="trainer",
+        )
+        trainers = User.objects.bulk_create([
+            User(
+                email=f"trainer{i}@test.com", username=f"Trainer {i}",
+                first_name="Trainer", last_name=str(i), role="trainer",
+                is_email_verified=True,
+            )
+            for i in range(SCHOOLS // SCHOOLS_PER_TRAINER)
+        ])
+        districts = District.objects.bulk_create([
+            District(name=f"District {i}") for i in range(SCHOOLS // SCHOOLS_PER_DISTRICT)
+        ])
+        schools = School.objects.bulk_create([
+            School(
+                name=f"School {i:02d}", district=districts[i // SCHOOLS_PER_DISTRICT],
+                total_students=STUDENTS_PER_SCHOOL,
+                status="in_progress" if i % 3 else "completed",
+            )
+            for i in range(SCHOOLS)
+        ])
+        TrainerAssignment.objects.bulk_create([
+            TrainerAssignment(
+                trainer=trainers[i // SCHOOLS_PER_TRAINER], school=school,
+                role="primary",
+            )
+            for i, school in enumerate(schools[:-1])
+        ])
+        Curriculum.objects.bulk_create([
+            Curriculum(day_number=d, title=f"Day {d}") for d in range(1, DAYS + 1)
+        ])
+
+        statuses = ["submitted", "verified", "flagged", "verified"]
+        submissions = Submission.objects.bulk_create([
+            Submission(
+                school=school, trainer=trainers[i // SCHOOLS_PER_TRAINER],
+                day_number=d, student_count=STUDENTS_PER_SCHOOL,
+                status=statuses[d - 1], submitted_at=timezone.now(),
+            )
+            for i, school in enumerate(schools)
+            for d in range(1, DAYS + 1)
+        ])
+        photo_statuses = ["pending", "approved", "rejected", "approved", "pending"]
+        SessionPhoto.objects.bulk_create([
+            SessionPhoto(
+                submission=sub, image=f"session_photos/{sub.pk}_{p}.jpg",
+                approval_status=photo_statuses[p], is_featured=(p == 1),
+            )
+            for sub in submissions
+            for p in range(PHOTOS_PER_SUBMISSION)
+        ])
+        # The gallery archive reads {school}'s photos back from storage
+        for name in SessionPhoto.objects.filter(submission__school=schools[5]).values_list(
+            "image", flat=True
+        ):
+            default_storage.save(name, ContentFile(b"photo"))
+        groups = StudentGroup.objects.bulk_create([
+            StudentGroup(
+                name=f"Group {g}", school=school,
+                created_by=trainers[i // SCHOOLS_PER_TRAINER],
+            )
+            for i, school in enumerate(schools)
+            for g in range(GROUPS_PER_SCHOOL)
+        ])
+        Student.objects.bulk_create([
+            Student(
+                name=f"Student {i}-{s}", school=school, age=12, grade="7",
+                added_by=trainers[i // SCHOOLS_PER_TRAINER],
+                group=groups[i * GROUPS_PER_SCHOOL + s % GROUPS_PER_SCHOOL],
+                baseline_marks=40 + s, endline_marks=60 + s,
+            )
+            for i, school in enumerate(schools)
+            for s in range(STUDENTS_PER_SCHOOL)
+        ])
+        project_statuses = ["pending", "approved", "featured", "rejected", "pending"]
+        ProjectHighlight.objects.bulk_create([
+            ProjectHighlight(
+                school=school, trainer=trainers[i // SCHOOLS_PER_TRAINER],
+                submission=submissions[i * DAYS + p % DAYS] if p % 2 else None,
+                group=groups[i * GROUPS_PER_SCHOOL + p % GROUPS_PER_SCHOOL],
+                student_name="Team", title=f"Project {i}-{p}",
+                description="A student project " * 10,
+                approval_status=project_statuses[p % len(project_statuses)],
+            )
+            for i, school in enumerate(schools)
+            for p in range(PROJECTS_PER_SCHOOL)
+        ])
+        ActivityLog.objects.bulk_create([
+            ActivityLog(
+                user=trainers[i % len(trainers)], activity_type="submission_created",
+                title=f"Session {i} submitted", is_uwh_visible=bool(i % 2),
+            )
+            for i in range(SCHOOLS * DAYS)
+        ])
+        UWHControl.load()
+        kpi.rebuild()
+
+        cls.trainer = trainers[0]
+        trainer_school = (
+            School.objects.filter(trainer_assignments__trainer=cls.trainer)
+            .distinct().first()
+        )
+        # A direct-upload draft whose photos are already in storage
+        draft = Submission.objects.create(
+            school=trainer_school, trainer=cls.trainer, day_number=DAYS + 2,
+            student_count=20, status="draft",
+        )
+        draft_keys = [
+            default_storage.save(direct_upload.new_key(draft, "p.jpg"), _image("p.jpg"))
+            for _ in range(3)
+        ]
+        # Chunked uploads: one just started, one with every byte received
+        upload_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(upload_dir.cleanup)
+        cls.enterClassContext(override_settings(CHUNKED_UPLOAD_DIR=upload_dir.name))
+        otp_email = email.queue("admin@test.com", "Code", "123456", urgent=True)
+        upload_new = chunked_uploads.create(cls.trainer, "demo.mp4", 4)
+        upload_full = chunked_uploads.create(cls.trainer, "demo.mp4", 4)
+        chunked_uploads.write_chunk(upload_full.pk, cls.trainer, 0, io.BytesIO(b"data"), 4)
+
+        cls.ids = {
+            "school": schools[5].pk,
+            "unassigned_school": schools[-1].pk,
+            "trainer": cls.trainer.pk,
+            "trainer_school": trainer_school.pk,
+            "trainer_submission": Submission.objects.filter(trainer=cls.trainer).first().pk,
+            "submission": submissions[8].pk,
+            "photo": SessionPhoto.objects.filter(approval_status="pending").first().pk,
+            "project": ProjectHighlight.objects.filter(approval_status="pending").first().pk,
+            "group": StudentGroup.objects.filter(school=trainer_school).first().pk,
+            "student": Student.objects.filter(school=trainer_school).first().pk,
+            "assignment": TrainerAssignment.objects.filter(school=schools[5]).get().pk,
+            "draft": draft.pk,
+            "upload_new": upload_new.pk,
+            "upload_full": upload_full.pk,
+            "delivery": otp_email.delivery_id,
+            **{f"draft_key_{i}": key for i, key in enumerate(draft_keys)},
+        }
+
+    def setUp(self):
+        self.users = {"admin": self.admin, "sponsor": self.sponsor, "trainer": self.trainer}
+
+    def _ids(self):
+        ids = dict(self.ids)
+        # Rate limiting is per user, so back-date the codes rather than reuse them
+        earlier = timezone.now() - timedelta(minutes=5)
+        admin_otp = otp_service.create_otp(self.admin)
+        pending_otp = otp_service.create_otp(self.pending)
+        type(admin_otp).objects.filter(pk__in=[admin_otp.pk, pending_otp.pk]).update(
+            created_at=earlier
+        )
+        ids["otp"] = admin_otp.code
+        ids["pending_otp"] = pending_otp.code
+        return ids
+
+    def _request(self, route, ids):
+        client = APIClient()
+        user = self.users.get(route.user)
+        if user:
+            client.force_authenticate(user=user)
+        if route.data == "submit":
+            data = {
+                "school": str(ids["trainer_school"]), "day_number": DAYS + 1,
+                "student_count": 20,
+                "photos": [_image(f"p{i}.jpg") for i in range(3)],
+            }
+        elif route.data == "roster":
+            rows = "".join(f"Imported Student {i},{10 + i % 5},7\n" for i in range(30))
+            data = {
+                "school": str(ids["trainer_school"]),
+                "file": SimpleUploadedFile("roster.csv", f"name,age,grade\n{rows}".encode()),
+            }
+        elif route.data == "marks":
+            data = {
+                str(pk): {"baseline": 4, "endline": 8}
+                for pk in Student.objects.filter(school=ids["trainer_school"])
+                .values_list("pk", flat=True)
+            }
+        elif route.data == "upload":
+            key = direct_upload.new_key(Submission(pk=ids["draft"]), "p.jpg")
+            slot = direct_upload.presign(RequestFactory().get("/"), key, "image/jpeg")
+            data = {**slot["fields"], "file": _image("p.jpg")}
+        else:
+            data = _fill(route.data, ids)
+        path = "/api/" + route.path.format(**ids)
+        # Cached reports (learning gains) are measured cold
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            if route.data == "chunk":
+                response = client.generic(
+                    "PUT", path, b"da", content_type="application/octet-stream",
+                    HTTP_UPLOAD_OFFSET="0",
+                )
+            else:
+                response = getattr(client, route.method)(path, data, format=route.fmt)
+            # Streamed exports run their queries as the body is read
+            body = (
+                b"".join(response.streaming_content) if response.streaming
+                else response.content
+            )
+        return response, body, ctx.captured_queries
+
+    def _check(self, route, ids):
+        response, body, queries = self._request(route, ids)
+        label = f"{route.method.upper()} {route.path}"
+        self.assertLess(
+            response.status_code, 400,
+            f"{label} returned {response.status_code}: {body[:500]!r}",
+        )
+        if len(queries) > route.max_queries:
+            sql = "\n".join(
+                f"  {n}. {q['sql']}" for n, q in enumerate(queries, start=1)
+            )
+            self.fail(
+                f"{label} ran {len(queries)} queries "
+                f"(budget {route.max_queries}):\n{sql}"
+            )
+        size = len(body)
+        self.assertLessEqual(
+            size, route.max_bytes,
+            f"{label} returned {size} bytes (budget {route.max_bytes})",
+        )
+
+    def test_routes_within_budget(self):
+        for route in ROUTES:
+            with self.subTest(route=f"{route.method.upper()} {route.path}"):
+                # Each route runs against the same seeded data
+                with transaction.atomic():
+                    self._check(route, self._ids())
+                    transaction.set_rollback(True)
+
+    def test_every_route_has_a_budget(self):
+        patterns = set(_all_patterns(get_resolver("config.urls")))
+        api = {p[len("api/"):] for p in patterns if p.startswith("api/")}
+        covered = {route.pattern for route in ROUTES} | set(EXEMPT)
+        self.assertEqual(
+            sorted(api - covered), [],
+            "Routes without a query budget — add them to ROUTES",
+        )
+        self.assertEqual(sorted(covered - api), [], "Budgets for routes that no longer exist")
@@ -2,22 +2,63 @@
 Tests for the full submission → Swinfy verification flow.
 
 Covers:
-  1. Trainer submits a session (with photos)
-  2. Swinfy admin lists & views submissions
-  3. Swinfy verifies / flags / rejects submissions
-  4. Photo approval pipeline
-  5. ActivityLog signal creation
-  6. Permission guards (role-based access)
-  7. Unique constraint (one submission per school per session)
+  1. Trainer submits a session (with photos, one per school per day)
+  2. Swinfy admin lists, views, verifies / flags / rejects submissions
+  3. Photo approval pipeline
+  4. ActivityLog signal creation
+  5. End-to-end submit → verify / flag flows
+  6. Dashboard KPI snapshot
+  7. Conditional GET (ETag / If-None-Match) on polled endpoints
+  8. Swinfy live queue stream (SSE)
+  9. Opt-in keyset pagination on list endpoints
+ 10. Constant query counts for project listings
+ 11. Trainer profile built from a fixed number of queries
+ 12. Prefetched trainer assignments on school list / detail
+ 13. Synthetic data generator
+ 14. API latency benchmark command
+ 15. Image derivative pipeline (thumbnail / medium / WebP)
+ 16. Direct-to-storage photo uploads (presign → upload → finalize)
+ 17. Concurrent storage writes for multipart photo uploads
+ 18. Validate-first submit (rejected uploads write nothing)
+ 19. Idempotency-Key replay on trainer writes
+ 20. Resumable chunked uploads for project media
+ 21. Streaming upload limits (413 before the view runs)
+ 22. Background task queue (retries, dead-letter, run_worker)
+ 23. Email outbox sent in batches over one connection
+ 24. OTP emails on the priority lane with pollable delivery status
+ 25. Bulk student roster import (CSV / XLSX)
+ 26. Bulk baseline / endline marks entry
+ 27. Learning-gain analytics (percentiles, histograms, cached report)
+ 28. Streaming CSV / XLSX exports
+ 29. Streaming ZIP archive of approved photos
 """
 
+import csv
+import importlib.util
 import io
 import json
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock, skipUnless
 from PIL import Image
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.db import DatabaseError, connection, transaction
+from django.db.models import QuerySet
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.files.storage import InMemoryStorage, default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from apps.accounts.models import User
 from apps.dashboard.models import (
@@ -28,7 +69,30 @@ from apps.dashboard.models import (
     SessionPhoto,
     ActivityLog,
     TrainerAssignment,
+    ChunkedUpload,
+    DashboardKPI,
+    IdempotencyRecord,
+    ProjectHighlight,
+    Student,
+    StudentGroup,
+    Task,
+    EmailOutbox,
 )
+from apps.dashboard.services import (
+    analytics,
+    archives,
+    chunked_uploads,
+    derivatives,
+    direct_upload,
+    email,
+    kpi,
+    photo_uploads,
+    tasks,
+    versions,
+)
+from apps.dashboard.program_config import MAX_MARKS
+from apps.dashboard.stream import QueueBroadcaster
+from apps.dashboard.upload_limits import UploadLimitHandler, UploadTooLarge
 
 
 def make_test_image(name="test.jpg"):
@@ -748,3 +812,2378 @@ class EndToEndFlowTests(TestCase):
         )
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(Submission.objects.count(), 4)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 6. DASHBOARD KPI SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class DashboardKPITests(TestCase):
+    """summary / uwh_summary read the incrementally maintained KPI rows."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.admin = User.objects.create_user(
+            email="a@test.com", username="Admin", password="pw", role="admin"
+        )
+        self.sponsor = User.objects.create_user(
+            email="s@test.com", username="Sponsor", password="pw", role="sponsor"
+        )
+        self.district = District.objects.create(name="Hyderabad")
+        self.school = School.objects.create(
+            name="School A", district=self.district, total_students=50
+        )
+        kpi.rebuild()
+        self.submission = Submission.objects.create(
+            school=self.school,
+            trainer=self.trainer,
+            day_number=1,
+            student_count=48,
+            status="submitted",
+        )
+        self.photos = [
+            SessionPhoto.objects.create(
+                submission=self.submission, image=make_test_image(f"k{i}.jpg")
+            )
+            for i in range(3)
+        ]
+
+    def test_admin_summary_tracks_writes(self):
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.get("/api/dashboard/summary/")
+        self.assertEqual(resp.data["total_schools"], 1)
+        self.assertEqual(resp.data["students_trained"], 48)
+        self.assertEqual(resp.data["pending_submissions"], 1)
+        self.assertEqual(resp.data["pending_photos"], 3)
+
+        self.client.patch(f"/api/dashboard/swinfy/photos/{self.photos[0].pk}/approve/")
+        self.client.post(
+            "/api/dashboard/swinfy/photos/bulk-reject/",
+            data={"photo_ids": [str(p.pk) for p in self.photos], "reason": "Blurry"},
+            format="json",
+        )
+        resp = self.client.get("/api/dashboard/summary/")
+        self.assertEqual(resp.data["pending_photos"], 0)
+        self.assertEqual(kpi.check(), {})
+
+    def test_sponsor_sees_only_verified(self):
+        self.client.force_authenticate(user=self.sponsor)
+        resp = self.client.get("/api/dashboard/uwh/summary/")
+        self.assertEqual(resp.data["kpis"]["total_students_trained"], 0)
+        self.assertEqual(resp.data["kpis"]["total_sessions"], 0)
+
+        self.submission.status = "verified"
+        self.submission.save()
+        self.school.status = "in_progress"
+        self.school.save()
+
+        resp = self.client.get("/api/dashboard/uwh/summary/")
+        self.assertEqual(resp.data["kpis"]["total_students_trained"], 48)
+        self.assertEqual(resp.data["kpis"]["total_sessions"], 1)
+        self.assertEqual(resp.data["kpis"]["schools_in_progress"], 1)
+        self.assertEqual(kpi.check(), {})
+
+    def test_delete_cascades_into_snapshot(self):
+        self.school.delete()
+        self.assertEqual(kpi.check(), {})
+        self.assertEqual(kpi.load("admin").pending_photos, 0)
+
+    def test_summary_is_single_lookup(self):
+        self.client.force_authenticate(user=self.admin)
+        # ETag version lookup + the KPI row
+        with self.assertNumQueries(2):
+            self.client.get("/api/dashboard/summary/")
+
+    def test_missing_snapshot_is_rebuilt_on_read(self):
+        DashboardKPI.objects.all().delete()
+        self.assertEqual(kpi.load("admin").pending_photos, 3)
+        self.assertEqual(DashboardKPI.objects.count(), 2)
+
+    def test_rebuild_command_reports_and_fixes_drift(self):
+        DashboardKPI.objects.filter(role="admin").update(pending_photos=99)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_kpis", "--check", stdout=io.StringIO())
+        call_command("rebuild_kpis", stdout=io.StringIO())
+        self.assertEqual(kpi.check(), {})
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 7. CONDITIONAL GET
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class ConditionalGetTests(TestCase):
+    """Polled endpoints answer 304 until a write bumps their resource version."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.admin = User.objects.create_user(
+            email="a@test.com", username="Admin", password="pw", role="admin"
+        )
+        self.district = District.objects.create(name="Hyderabad")
+        self.school = School.objects.create(
+            name="School A", district=self.district, total_students=50
+        )
+        self.submission = Submission.objects.create(
+            school=self.school,
+            trainer=self.trainer,
+            day_number=1,
+            student_count=50,
+            status="submitted",
+        )
+        self.photo = SessionPhoto.objects.create(
+            submission=self.submission, image=make_test_image()
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_unchanged_poll_returns_304_without_querying_data(self):
+        url = "/api/dashboard/swinfy/photos/pending/"
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        etag = resp["ETag"]
+        self.assertIn("no-cache", resp["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp["ETag"], etag)
+
+    def test_write_changes_etag(self):
+        url = "/api/dashboard/swinfy/photos/pending/"
+        etag = self.client.get(url)["ETag"]
+        self.client.patch(f"/api/dashboard/swinfy/photos/{self.photo.pk}/approve/")
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data), 0)
+
+    def test_bulk_update_changes_etag(self):
+        url = "/api/dashboard/swinfy/photos/pending/"
+        etag = self.client.get(url)["ETag"]
+        self.client.post(
+            "/api/dashboard/swinfy/photos/bulk-approve/",
+            data={"photo_ids": [str(self.photo.pk)]},
+            format="json",
+        )
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_query_string(self):
+        url = "/api/dashboard/swinfy/submissions/"
+        etag = self.client.get(url)["ETag"]
+        resp = self.client.get(url + "?status=verified", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 8. SWINFY LIVE QUEUE STREAM
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class SwinfyStreamTests(TestCase):
+    """GET /api/dashboard/swinfy/stream/ and the per-process broadcaster."""
+
+    url = "/api/dashboard/swinfy/stream/"
+
+    def setUp(self):
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.admin = User.objects.create_user(
+            email="a@test.com", username="Admin", password="pw", role="admin"
+        )
+        self.district = District.objects.create(name="Hyderabad")
+        self.school = School.objects.create(
+            name="School A", district=self.district, total_students=50
+        )
+        self.submission = Submission.objects.create(
+            school=self.school,
+            trainer=self.trainer,
+            day_number=1,
+            student_count=50,
+            status="submitted",
+        )
+
+    def _token(self, user):
+        return str(RefreshToken.for_user(user).access_token)
+
+    def _ticket(self, user):
+        resp = self.client.post(
+            "/api/dashboard/swinfy/stream/ticket/",
+            HTTP_AUTHORIZATION=f"Bearer {self._token(user)}",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.json()["ticket"]
+
+    def test_requires_token(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_trainer_forbidden(self):
+        resp = self.client.get(
+            self.url, HTTP_AUTHORIZATION=f"Bearer {self._token(self.trainer)}"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ticket_only_for_admins(self):
+        resp = self.client.post(
+            "/api/dashboard/swinfy/stream/ticket/",
+            HTTP_AUTHORIZATION=f"Bearer {self._token(self.trainer)}",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_connects_with_ticket(self):
+        resp = self.client.get(self.url, {"ticket": self._ticket(self.admin)})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+
+    def test_access_token_not_accepted_in_query_string(self):
+        resp = self.client.get(self.url, {"token": self._token(self.admin)})
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        resp = self.client.get(self.url, {"ticket": self._token(self.admin)})
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(STREAM_TICKET_EXPIRES=60)
+    def test_expired_ticket_rejected(self):
+        ticket = self._ticket(self.admin)
+        later = timezone.now().timestamp() + 61
+        with mock.patch("django.core.signing.time") as clock:
+            clock.time.return_value = later
+            resp = self.client.get(self.url, {"ticket": ticket})
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_admin_gets_event_stream_with_bearer(self):
+        resp = self.client.get(
+            self.url, HTTP_AUTHORIZATION=f"Bearer {self._token(self.admin)}"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+
+    def test_broadcaster_emits_deltas_after_writes(self):
+        broadcaster = QueueBroadcaster()
+        self.assertEqual(broadcaster._poll(), [])  # baseline
+        self.assertEqual(broadcaster._poll(), [])  # nothing changed
+
+        SessionPhoto.objects.create(submission=self.submission, image=make_test_image())
+        self.submission.status = "verified"
+        self.submission.save()
+
+        events = dict(broadcaster._poll())
+        self.assertEqual(
+            sorted(events["changed"]["resources"]),
+            ["activity", "photos", "submissions"],
+        )
+        self.assertEqual(events["counts"]["pending_photos"], 1)
+        self.assertEqual(events["counts"]["pending_submissions"], 0)
+        self.assertEqual(events["activity"]["activity_type"], "submission_verified")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 9. KEYSET PAGINATION
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class KeysetPaginationTests(TestCase):
+    """List endpoints page with ?page_size=/&cursor= and stay flat arrays otherwise."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.admin = User.objects.create_user(
+            email="a@test.com", username="Admin", password="pw", role="admin"
+        )
+        self.sponsor = User.objects.create_user(
+            email="s@test.com", username="Sponsor", password="pw", role="sponsor"
+        )
+        self.district = District.objects.create(name="Hyderabad")
+        self.school = School.objects.create(
+            name="School A", district=self.district, total_students=50
+        )
+        TrainerAssignment.objects.create(
+            trainer=self.trainer, school=self.school, role="primary"
+        )
+        self.submission = Submission.objects.create(
+            school=self.school,
+            trainer=self.trainer,
+            day_number=1,
+            student_count=50,
+            status="verified",
+        )
+        self.photos = [
+            SessionPhoto.objects.create(
+                submission=self.submission,
+                image=make_test_image(f"pg{i}.jpg"),
+                approval_status="approved",
+                is_featured=(i == 0),
+            )
+            for i in range(7)
+        ]
+
+    def _walk(self, url, key="results"):
+        ids, pages = [], 0
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            ids += [row["id"] for row in resp.data[key]]
+            url, pages = resp.data["next"], pages + 1
+        return ids, pages
+
+    def test_unpaginated_by_default(self):
+        self.client.force_authenticate(user=self.trainer)
+        resp = self.client.get("/api/dashboard/trainer/gallery/")
+        self.assertIsInstance(resp.data, list)
+        self.assertEqual(len(resp.data), 7)
+
+    def test_trainer_gallery_pages_cover_every_row_once(self):
+        self.client.force_authenticate(user=self.trainer)
+        ids, pages = self._walk("/api/dashboard/trainer/gallery/?page_size=3")
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(ids), sorted(str(p.pk) for p in self.photos))
+
+    def test_swinfy_photos_pages(self):
+        self.client.force_authenticate(user=self.admin)
+        ids, _ = self._walk("/api/dashboard/swinfy/photos/pending/?status=all&page_size=2")
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+
+    def test_page_size_is_capped(self):
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.get("/api/dashboard/swinfy/photos/pending/?status=all&page_size=100000")
+        self.assertEqual(len(resp.data["results"]), 7)
+        self.assertIsNone(resp.data["next"])
+
+    def test_uwh_gallery_pages_regular_photos(self):
+        self.client.force_authenticate(user=self.sponsor)
+        resp = self.client.get("/api/dashboard/uwh/gallery/?page_size=4")
+        self.assertEqual(len(resp.data["featured"]), 1)
+        self.assertEqual(len(resp.data["photos"]), 4)
+        resp = self.client.get(resp.data["next"])
+        self.assertEqual(resp.data["featured"], [])
+        self.assertEqual(len(resp.data["photos"]), 2)
+        self.assertIsNone(resp.data["next"])
+
+        # Paging back to the start brings the featured photos back
+        resp = self.client.get(resp.data["previous"])
+        self.assertEqual(len(resp.data["featured"]), 1)
+        self.assertEqual(len(resp.data["photos"]), 4)
+        self.assertIsNone(resp.data["previous"])
+
+    def test_rows_sharing_a_timestamp_are_not_skipped_or_repeated(self):
+        SessionPhoto.objects.update(uploaded_at=timezone.now())
+        self.client.force_authenticate(user=self.admin)
+        ids, pages = self._walk("/api/dashboard/swinfy/photos/pending/?status=all&page_size=3")
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, sorted(str(p.pk) for p in self.photos))
+
+    def test_previous_link_returns_the_page_before(self):
+        self.client.force_authenticate(user=self.admin)
+        url = "/api/dashboard/swinfy/photos/pending/?status=all&page_size=3"
+        first = self.client.get(url)
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+        self.assertEqual(back.data["next"], first.data["next"])
+
+    def test_invalid_cursor_is_404(self):
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.get("/api/dashboard/swinfy/photos/pending/?cursor=bogus")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_is_a_row_value_comparison(self):
+        # SQLite understands row values too; Django only turns them off there
+        SessionPhoto.objects.update(uploaded_at=timezone.now())
+        self.client.force_authenticate(user=self.admin)
+        url = "/api/dashboard/swinfy/photos/pending/?status=all&page_size=3"
+        with mock.patch.object(connection.features, "supports_tuple_lookups", True):
+            with CaptureQueriesContext(connection) as ctx:
+                ids, pages = self._walk(url)
+        self.assertEqual(ids, sorted(str(p.pk) for p in self.photos))
+        seeks = [q["sql"] for q in ctx.captured_queries if '"uploaded_at", ' in q["sql"] and ") > (" in q["sql"]]
+        self.assertEqual(len(seeks), pages - 1)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 10. PROJECT LISTING QUERY COUNTS
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class ProjectListingQueryTests(TestCase):
+    """Group members are batch-loaded, so listings don't issue a query per row."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.sponsor = User.objects.create_user(
+            email="s@test.com", username="Sponsor", password="pw", role="sponsor"
+        )
+        self.district = District.objects.create(name="Hyderabad")
+        self.school = School.objects.create(
+            name="School A", district=self.district, total_students=50
+        )
+        TrainerAssignment.objects.create(
+            trainer=self.trainer, school=self.school, role="primary"
+        )
+
+    def _add_projects(self, count):
+        for _ in range(count):
+            n = ProjectHighlight.objects.count()
+            group = StudentGroup.objects.create(
+                name=f"Group {n}", school=self.school, created_by=self.trainer
+            )
+            for m in range(3):
+                Student.objects.create(
+                    name=f"Student {n}-{m}", school=self.school,
+                    added_by=self.trainer, group=group,
+                )
+            ProjectHighlight.objects.create(
+                school=self.school, trainer=self.trainer, group=group,
+                student_name="Team", title=f"Project {n}", description="Demo",
+                approval_status="approved",
+            )
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), resp
+
+    def test_uwh_projects_constant_queries(self):
+        self.client.force_authenticate(user=self.sponsor)
+        self._add_projects(2)
+        small, _ = self._count_queries("/api/dashboard/uwh/projects/")
+        self._add_projects(6)
+        large, resp = self._count_queries("/api/dashboard/uwh/projects/")
+        self.assertEqual(small, large)
+        self.assertEqual(len(resp.data), 8)
+        self.assertEqual(len(resp.data[0]["group_members"]), 3)
+
+    def test_trainer_projects_constant_queries(self):
+        self.client.force_authenticate(user=self.trainer)
+        self._add_projects(2)
+        small, _ = self._count_queries("/api/dashboard/trainer/projects/")
+        self._add_projects(6)
+        large, _ = self._count_queries("/api/dashboard/trainer/projects/")
+        self.assertEqual(small, large)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 11. TRAINER PROFILE QUERY COUNT
+# ═══════════════════════════════════════════════════════════════════
+
+
+class TrainerProfileQueryTests(TestCase):
+    """Assignments and co-trainers are prefetched once per profile request."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.district = District.objects.create(name="Hyderabad")
+
+    def _assign_school(self):
+        n = School.objects.count()
+        school = School.objects.create(
+            name=f"School {n}", district=self.district, total_students=50
+        )
+        TrainerAssignment.objects.create(
+            trainer=self.trainer, school=school, role="primary"
+        )
+        co = User.objects.create_user(
+            email=f"co{n}@test.com", username=f"Co {n}", password="pw", role="trainer"
+        )
+        TrainerAssignment.objects.create(trainer=co, school=school, role="secondary")
+
+    def _get_profile(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/dashboard/trainer/profile/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), resp
+
+    def test_query_count_does_not_grow_with_schools(self):
+        self._assign_school()
+        small, _ = self._get_profile()
+        for _ in range(4):
+            self._assign_school()
+        large, resp = self._get_profile()
+        self.assertEqual(small, large)
+        self.assertEqual(len(resp.data["assigned_schools"]), 5)
+
+    def test_co_trainers_exclude_self(self):
+        self._assign_school()
+        _, resp = self._get_profile()
+        entry = resp.data["assigned_school"]
+        self.assertEqual(entry["co_trainers"], ["Co 0"])
+        self.assertEqual(entry["co_trainer"], "Co 0")
+        self.assertNotIn("co_trainer", resp.data["assigned_schools"][0])
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 12. SCHOOL TRAINER ASSIGNMENT PREFETCH
+# ═══════════════════════════════════════════════════════════════════
+
+
+class SchoolTrainersPrefetchTests(TestCase):
+    """School serializers read trainers from one shared Prefetch(to_attr=...)."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="a@test.com", username="Admin", password="pw", role="admin"
+        )
+        self.trainer = User.objects.create_user(
+            email="t@test.com", username="Trainer", password="pw", role="trainer"
+        )
+        self.district = District.objects.create(name="Hyderabad")
+
+    def _add_schools(self, count):
+        for _ in range(count):
+            n = School.objects.count()
+            school = School.objects.create(
+                name=f"School {n}", district=self.district, total_students=50
+            )
+            co = User.objects.create_user(
+                email=f"co{n}@test.com", username=f"Co {n}", password="pw", role="trainer"
+            )
+            TrainerAssignment.objects.create(trainer=self.trainer, school=school, role="primary")
+            TrainerAssignment.objects.create(trainer=co, school=school, role="secondary")
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), resp
+
+    def test_school_list_constant_queries(self):
+        self.client.force_authenticate(user=self.admin)
+        self._add_schools(2)
+        small, _ = self._count_queries("/api/dashboard/schools/")
+        self._add_schools(5)
+        large, resp = self._count_queries("/api/dashboard/schools/")
+        self.assertEqual(small, large)
+        self.assertEqual(len(resp.data), 7)
+        self.assertEqual(len(resp.data[0]["trainers_list"]), 2)
+
+    def test_trainer_assigned_schools_constant_queries(self):
+        self.client.force_authenticate(user=self.trainer)
+        self._add_schools(2)
+        small, _ = self._count_queries("/api/dashboard/trainer/schools/")
+        self._add_schools(5)
+        large, _ = self._count_queries("/api/dashboard/trainer/schools/")
+        self.assertEqual(small, large)
+
+    def test_school_detail_reads_prefetched_trainers(self):
+        self.client.force_authenticate(user=self.admin)
+        self._add_schools(1)
+        school = School.objects.get()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(f"/api/dashboard/schools/{school.pk}/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data["trainers_list"]), 2)
+        # school + district, assignments + trainers, submissions, trainers M2M ids
+        self.assertEqual(len(ctx.captured_queries), 4)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 13. SYNTHETIC DATA GENERATOR
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class SeedSyntheticTests(TestCase):
+    """seed_synthetic --scale N generates a deterministic, consistent dataset."""
+
+    def _seed(self, **options):
+        call_command("seed_synthetic", stdout=io.StringIO(), **options)
+
+    def test_volumes_scale_with_factor(self):
+        self._seed(scale=1, images="none")
+        self.assertEqual(School.objects.count(), 40)
+        self.assertEqual(District.objects.count(), 7)
+        self.assertEqual(Submission.objects.count(), 160)
+        self.assertEqual(SessionPhoto.objects.count(), 800)
+        self.assertEqual(Student.objects.count(), 40 * 57)
+        self.assertEqual(ProjectHighlight.objects.count(), 400)
+        # bulk_create skips signals; the snapshot is rebuilt at the end
+        self.assertEqual(kpi.check(), {})
+
+    def test_same_seed_same_rows(self):
+        self._seed(scale=1, seed=3, images="none")
+        first = list(Student.objects.order_by("pk").values_list("pk", "name", "baseline_marks"))
+        self._seed(flush=True)
+        self.assertFalse(School.objects.exists())
+        self._seed(scale=1, seed=3, images="none")
+        second = list(Student.objects.order_by("pk").values_list("pk", "name", "baseline_marks"))
+        self.assertEqual(first, second)
+
+    def test_placeholder_images_share_one_file(self):
+        self._seed(scale=1)
+        names = set(SessionPhoto.objects.values_list("image", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(SessionPhoto.objects.first().image.storage.exists(names.pop()))
+
+    def test_flush_skips_per_row_signals_and_removes_files(self):
+        self._seed(scale=1, images="real")
+        names = set(SessionPhoto.objects.values_list("image", flat=True))
+        storage = SessionPhoto.objects.first().image.storage
+        with mock.patch("apps.dashboard.signals.kpi.apply_delta") as apply_delta, \
+                mock.patch("apps.dashboard.signals.versions.bump") as bump:
+            self._seed(flush=True)
+        apply_delta.assert_not_called()
+        # Once by flush itself, never per deleted row
+        bump.assert_called_once_with(*versions.RESOURCES)
+        self.assertFalse(Student.objects.exists())
+        self.assertEqual(kpi.check(), {})
+        self.assertFalse(any(storage.exists(name) for name in names))
+
+    def test_refuses_to_seed_twice(self):
+        self._seed(scale=1, images="none")
+        with self.assertRaises(CommandError):
+            self._seed(scale=1, images="none")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 14. API BENCHMARK COMMAND
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class BenchApiTests(BaseTestCase):
+    """bench_api reports every endpoint and fails on regressions against a baseline."""
+
+    def setUp(self):
+        super().setUp()
+        self.submit_session()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.baseline = os.path.join(self.tmp.name, "baseline.json")
+
+    def _bench(self, **options):
+        out = io.StringIO()
+        call_command("bench_api", requests=2, warmup=0, stdout=out, **options)
+        return out.getvalue()
+
+    def test_writes_baseline_for_each_role(self):
+        self._bench(output=self.baseline)
+        with open(self.baseline) as fh:
+            endpoints = json.load(fh)["endpoints"]
+        self.assertIn("admin GET dashboard/swinfy/submissions/", endpoints)
+        self.assertIn("trainer GET dashboard/trainer/submissions/{trainer_submission}/", endpoints)
+        self.assertIn("sponsor GET dashboard/uwh/gallery/", endpoints)
+        row = endpoints["admin GET dashboard/summary/"]
+        self.assertEqual(row["errors"], 0)
+        self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+        self.assertGreater(row["bytes"], 0)
+
+    def test_compare_fails_on_query_regression(self):
+        self._bench(output=self.baseline, roles=["admin"])
+        self._bench(compare=self.baseline, roles=["admin"], threshold=100)
+
+        with open(self.baseline) as fh:
+            data = json.load(fh)
+        data["endpoints"]["admin GET dashboard/schools/"]["queries"] = 0
+        with open(self.baseline, "w") as fh:
+            json.dump(data, fh)
+        with self.assertRaises(CommandError):
+            self._bench(compare=self.baseline, roles=["admin"], threshold=100)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 15. IMAGE DERIVATIVES
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class ImageDerivativeTests(BaseTestCase):
+    """Uploads queue a task that builds thumbnail / medium / WebP derivatives."""
+
+    def _large_image(self, name="big.jpg"):
+        buf = io.BytesIO()
+        Image.new("RGB", (2400, 1600), color="green").save(buf, format="JPEG")
+        return SimpleUploadedFile(name, buf.getvalue(), content_type="image/jpeg")
+
+    def test_submit_queues_derivative_builds(self):
+        self.auth_as(self.trainer)
+        resp = self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": 1,
+                "student_count": 40,
+                "photos": [self._large_image(f"p{i}.jpg") for i in range(3)],
+            },
+            format="multipart",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(tasks.run_pending(), 3)
+
+        photo = SessionPhoto.objects.first()
+        self.assertFalse(derivatives.is_stale(photo))
+        with photo.thumbnail.open("rb") as fh, Image.open(fh) as thumb:
+            self.assertLessEqual(max(thumb.size), 320)
+        with photo.image_medium.open("rb") as fh, Image.open(fh) as medium:
+            self.assertEqual(medium.size, (1280, 853))
+        with photo.image_webp.open("rb") as fh, Image.open(fh) as webp:
+            self.assertEqual(webp.format, "WEBP")
+
+        self.auth_as(self.admin)
+        data = self.client.get("/api/dashboard/swinfy/photos/pending/").data
+        self.assertTrue(data[0]["thumbnail_url"].endswith("_thumb.jpg"))
+        self.assertTrue(data[0]["webp_url"].endswith(".webp"))
+
+    def test_replaced_image_is_stale(self):
+        sub = Submission.objects.create(school=self.school, trainer=self.trainer, day_number=1)
+        photo = SessionPhoto.objects.create(submission=sub, image=self._large_image("a.jpg"))
+        tasks.run_pending()
+        photo.refresh_from_db()
+        self.assertFalse(derivatives.is_stale(photo))
+        photo.image = self._large_image("b.jpg")
+        self.assertTrue(derivatives.is_stale(photo))
+
+    def test_same_stem_different_extension_do_not_collide(self):
+        jpg = derivatives.derivative_names("session_photos/a.jpg")
+        png = derivatives.derivative_names("session_photos/a.png")
+        self.assertFalse(set(jpg.values()) & set(png.values()))
+
+    def test_rebuild_removes_previous_derivatives(self):
+        sub = Submission.objects.create(school=self.school, trainer=self.trainer, day_number=1)
+        photo = SessionPhoto.objects.create(submission=sub, image=self._large_image("a.jpg"))
+        tasks.run_pending()
+        photo.refresh_from_db()
+        old = photo.thumbnail.name
+        photo.image = self._large_image("b.jpg")
+        photo.save()
+        tasks.run_pending()
+        photo.refresh_from_db()
+        self.assertNotEqual(photo.thumbnail.name, old)
+        self.assertTrue(photo.thumbnail.storage.exists(photo.thumbnail.name))
+        self.assertFalse(photo.thumbnail.storage.exists(old))
+
+    def test_unreadable_image_is_skipped(self):
+        sub = Submission.objects.create(school=self.school, trainer=self.trainer, day_number=1)
+        broken = SimpleUploadedFile("broken.jpg", b"not an image", content_type="image/jpeg")
+        photo = SessionPhoto.objects.create(submission=sub, image=broken)
+        tasks.run_pending()
+        photo.refresh_from_db()
+        self.assertEqual(photo.thumbnail.name, "")
+
+    def test_backfill_command(self):
+        sub = Submission.objects.create(school=self.school, trainer=self.trainer, day_number=1)
+        # Queued, but no worker has run it
+        photo = SessionPhoto.objects.create(submission=sub, image=self._large_image())
+        self.assertTrue(derivatives.is_stale(photo))
+        call_command("build_image_derivatives", stdout=io.StringIO())
+        photo.refresh_from_db()
+        self.assertFalse(derivatives.is_stale(photo))
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 16. DIRECT UPLOADS
+# ═══════════════════════════════════════════════════════════════════
+
+
+class DirectUploadTests(BaseTestCase):
+    """Two-phase submit against the local stand-in for S3 presigned POSTs."""
+
+    def _start(self, count=3, **extra):
+        self.auth_as(self.trainer)
+        return self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": 1, "student_count": 40,
+                "uploads": [
+                    {"name": f"p{i}.jpg", "content_type": "image/jpeg", "size": 1000}
+                    for i in range(count)
+                ],
+                **extra,
+            },
+            format="json",
+        )
+
+    def _upload(self, slot, file=None):
+        # Storage endpoints are unauthenticated; the policy is the credential
+        return APIClient().post(
+            slot["url"], {**slot["fields"], "file": file or make_test_image()},
+            format="multipart",
+        )
+
+    def _finalize(self, sub_id, keys):
+        return self.client.post(
+            f"/api/dashboard/trainer/submissions/{sub_id}/finalize/",
+            {"keys": keys}, format="json",
+        )
+
+    def test_full_flow(self):
+        resp = self._start()
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        sub_id = resp.data["submission"]["id"]
+        self.assertEqual(Submission.objects.get(pk=sub_id).status, "draft")
+        self.assertEqual(len(resp.data["uploads"]), 3)
+
+        for slot in resp.data["uploads"]:
+            self.assertEqual(self._upload(slot).status_code, status.HTTP_204_NO_CONTENT)
+
+        keys = [slot["key"] for slot in resp.data["uploads"]]
+        resp = self._finalize(sub_id, keys)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["status"], "submitted")
+        self.assertEqual(len(resp.data["photos"]), 3)
+        self.assertEqual(
+            sorted(SessionPhoto.objects.values_list("image", flat=True)), sorted(keys)
+        )
+        self.assertTrue(
+            ActivityLog.objects.filter(activity_type="submission_created").exists()
+        )
+        self.assertEqual(kpi.load(kpi.ADMIN).total_sessions, 1)
+
+        # A second finalize is rejected
+        self.assertEqual(self._finalize(sub_id, keys).status_code, status.HTTP_409_CONFLICT)
+
+    def test_photo_limits(self):
+        self.assertEqual(self._start(count=2).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._start(count=6).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Submission.objects.exists())
+
+    def test_rejects_non_images(self):
+        self.auth_as(self.trainer)
+        resp = self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": 1,
+                "uploads": [{"name": f"f{i}.exe", "content_type": "image/jpeg", "size": 10}
+                            for i in range(3)],
+            },
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Submission.objects.exists())
+
+    def test_retry_replaces_abandoned_draft(self):
+        first = self._start().data["submission"]["id"]
+        resp = self._start()
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Submission.objects.filter(pk=first).exists())
+
+    def test_tampered_policy_is_refused(self):
+        slot = self._start().data["uploads"][0]
+        slot["fields"]["key"] = "session_photos/elsewhere.jpg"
+        self.assertEqual(self._upload(slot).status_code, status.HTTP_403_FORBIDDEN)
+        slot["fields"]["policy"] += "x"
+        self.assertEqual(self._upload(slot).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(DIRECT_UPLOAD_EXPIRES=-1)
+    def test_expired_policy_is_refused(self):
+        slot = self._start().data["uploads"][0]
+        self.assertEqual(self._upload(slot).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_finalize_requires_uploaded_keys(self):
+        resp = self._start()
+        sub_id, slots = resp.data["submission"]["id"], resp.data["uploads"]
+        self._upload(slots[0])
+        self._upload(slots[1])
+        keys = [slot["key"] for slot in slots]
+
+        resp = self._finalize(sub_id, keys)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data["keys"], [keys[2]])
+
+        # Keys from another submission cannot be attached
+        foreign = keys[:2] + ["session_photos/other/x.jpg"]
+        resp = self._finalize(sub_id, foreign)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Submission.objects.get(pk=sub_id).status, "draft")
+
+    def test_other_trainer_cannot_finalize(self):
+        sub_id = self._start().data["submission"]["id"]
+        other = User.objects.create_user(
+            email="other@test.com", username="Other", password="pass1234",
+            role="trainer", is_email_verified=True,
+        )
+        self.auth_as(other)
+        self.assertEqual(self._finalize(sub_id, []).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retry_deletes_the_abandoned_uploads(self):
+        slot = self._start().data["uploads"][0]
+        self._upload(slot)
+        self.assertTrue(default_storage.exists(slot["key"]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self._start().status_code, status.HTTP_201_CREATED)
+        self.assertFalse(default_storage.exists(slot["key"]))
+
+    def test_purge_expires_old_drafts_and_their_uploads(self):
+        resp = self._start()
+        sub_id, slot = resp.data["submission"]["id"], resp.data["uploads"][0]
+        self._upload(slot)
+        self.assertEqual(direct_upload.purge_stale_drafts(), 0)
+
+        Submission.objects.filter(pk=sub_id).update(
+            created_at=timezone.now() - timedelta(seconds=settings.DIRECT_UPLOAD_EXPIRES + 1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("purge_stale_uploads", stdout=io.StringIO())
+        self.assertFalse(Submission.objects.filter(pk=sub_id).exists())
+        self.assertFalse(default_storage.exists(slot["key"]))
+
+    def test_purge_keeps_submitted_sessions(self):
+        self.submit_session()
+        Submission.objects.update(created_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(direct_upload.purge_stale_drafts(), 0)
+        self.assertEqual(Submission.objects.count(), 1)
+
+    def test_concurrent_finalize_attaches_photos_once(self):
+        resp = self._start()
+        sub_id, slots = resp.data["submission"]["id"], resp.data["uploads"]
+        for slot in slots:
+            self._upload(slot)
+        keys = [slot["key"] for slot in slots]
+
+        def finalized_meanwhile(keys):
+            # Another request wins the race after our status check
+            Submission.objects.filter(pk=sub_id).update(status="submitted")
+            return keys
+
+        with mock.patch.object(direct_upload, "uploaded", side_effect=finalized_meanwhile):
+            resp = self._finalize(sub_id, keys)
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(SessionPhoto.objects.exists())
+
+    def test_receive_takes_one_file(self):
+        slot = self._start().data["uploads"][0]
+        resp = APIClient().post(
+            slot["url"],
+            {**slot["fields"], "file": make_test_image(), "extra": make_test_image("b.jpg")},
+            format="multipart",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_receive_is_off_with_s3(self):
+        slot = self._start().data["uploads"][0]
+        with override_settings(USE_S3=True):
+            self.assertEqual(self._upload(slot).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(default_storage.exists(slot["key"]))
+
+    def test_multipart_submit_still_works(self):
+        resp = self.submit_session()
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["status"], "submitted")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 17. CONCURRENT PHOTO WRITES
+# ═══════════════════════════════════════════════════════════════════
+
+
+class FailingStorage(InMemoryStorage):
+    """In-memory storage that refuses any file whose name contains "fail"."""
+
+    def _save(self, name, content):
+        if "fail" in name:
+            raise OSError("storage unavailable")
+        return super()._save(name, content)
+
+
+@override_settings(
+    STORAGES={"default": {"BACKEND": "apps.dashboard.tests.FailingStorage"}},
+)
+class ConcurrentPhotoWriteTests(BaseTestCase):
+    """Multipart submits write photos in parallel and insert them in one go."""
+
+    def setUp(self):
+        super().setUp()
+        kpi.rebuild()
+
+    def _submit(self, names, **extra):
+        self.auth_as(self.trainer)
+        return self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": 1, "student_count": 40,
+                "photos": [make_test_image(n) for n in names],
+                **extra,
+            },
+            format="multipart",
+        )
+
+    def test_photos_are_stored_and_counted(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._submit(["a.jpg", "b.jpg", "c.jpg", "d.jpg"])
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(resp.data["photos"]), 4)
+
+        inserts = [q for q in ctx.captured_queries
+                   if q["sql"].startswith('INSERT INTO "dashboard_sessionphoto"')]
+        self.assertEqual(len(inserts), 1)
+
+        storage = SessionPhoto._meta.get_field("image").storage
+        for photo in SessionPhoto.objects.all():
+            self.assertTrue(storage.exists(photo.image.name))
+        self.assertEqual(kpi.check(), {})
+
+    def test_failed_write_rolls_back_submission(self):
+        resp = self._submit(["a.jpg", "fail.jpg", "c.jpg"])
+        self.assertEqual(resp.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertFalse(Submission.objects.exists())
+        self.assertFalse(SessionPhoto.objects.exists())
+        self.assertEqual(kpi.check(), {})
+
+        # The photos that did land were cleaned up
+        storage = SessionPhoto._meta.get_field("image").storage
+        self.assertEqual(storage.listdir("session_photos")[1], [])
+
+        # and the trainer can retry the same day
+        self.assertEqual(self._submit(["a.jpg", "b.jpg", "c.jpg"]).status_code,
+                         status.HTTP_201_CREATED)
+
+    def test_files_are_written_before_the_transaction(self):
+        depth = len(connection.atomic_blocks)
+        store, seen = photo_uploads.store_session_photos, []
+
+        def spy(files):
+            seen.append(len(connection.atomic_blocks))
+            return store(files)
+
+        with mock.patch.object(photo_uploads, "store_session_photos", side_effect=spy):
+            resp = self._submit(["a.jpg", "b.jpg", "c.jpg"])
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(seen, [depth])
+
+    def test_failed_insert_deletes_stored_files(self):
+        storage = SessionPhoto._meta.get_field("image").storage
+        attendance = SimpleUploadedFile("roll.pdf", b"%PDF-1.4", content_type="application/pdf")
+        for target in ("bulk_create", "schedule"):
+            attendance.seek(0)
+            with self.subTest(target), mock.patch.object(
+                SessionPhoto.objects if target == "bulk_create" else derivatives,
+                target, side_effect=DatabaseError("insert failed"),
+            ):
+                with self.assertRaises(DatabaseError):
+                    self._submit(["a.jpg", "b.jpg", "c.jpg"], attendance_file=attendance)
+            self.assertFalse(Submission.objects.exists())
+            self.assertEqual(storage.listdir("session_photos")[1], [])
+            self.assertEqual(storage.listdir("attendance")[1], [])
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 18. VALIDATE-FIRST SUBMIT
+# ═══════════════════════════════════════════════════════════════════
+
+
+class SubmitValidationTests(BaseTestCase):
+    """Rejected submits never write a row or a file."""
+
+    def _submit(self, files):
+        self.auth_as(self.trainer)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(
+                "/api/dashboard/trainer/submit/",
+                {
+                    "school": str(self.school.pk), "day_number": 1,
+                    "student_count": 40, "photos": files,
+                },
+                format="multipart",
+            )
+        writes = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].split(" ", 1)[0] in ("INSERT", "UPDATE", "DELETE")
+        ]
+        return resp, writes
+
+    def assertRejected(self, files, message):
+        resp, writes = self._submit(files)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(message, resp.data["detail"])
+        self.assertEqual(writes, [])
+        storage = SessionPhoto._meta.get_field("image").storage
+        self.assertFalse(storage.exists("session_photos"))
+
+    def test_too_few_photos(self):
+        self.assertRejected([make_test_image()], "Minimum 3 photos")
+
+    def test_disallowed_extension(self):
+        files = [make_test_image(f"p{i}.jpg") for i in range(2)]
+        files.append(SimpleUploadedFile("notes.pdf", b"%PDF-1.4", content_type="application/pdf"))
+        self.assertRejected(files, "notes.pdf")
+
+
+    def test_direct_upload_rejects_before_draft(self):
+        self.auth_as(self.trainer)
+        resp = self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": 1,
+                "uploads": [
+                    {"name": "p.jpg", "content_type": "image/jpeg",
+                     "size": photo_uploads.MAX_BYTES + 1},
+                ] * 3,
+            },
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Submission.objects.exists())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 19. IDEMPOTENCY KEYS
+# ═══════════════════════════════════════════════════════════════════
+
+
+class IdempotencyKeyTests(BaseTestCase):
+    """Retried trainer writes with the same Idempotency-Key run once."""
+
+    def _submit(self, key, num_photos=3, day_number=1):
+        self.auth_as(self.trainer)
+        return self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": day_number,
+                "student_count": 40,
+                "photos": [make_test_image(f"p{i}.jpg") for i in range(num_photos)],
+            },
+            format="multipart",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retried_submit_replays_original_response(self):
+        first = self._submit("abc")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as ctx:
+            retry = self._submit("abc")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.data["id"], str(first.data["id"]))
+        self.assertEqual(Submission.objects.count(), 1)
+        self.assertEqual(SessionPhoto.objects.count(), 3)
+        # One lookup; the view does not run again
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_retried_project_is_not_duplicated(self):
+        self.auth_as(self.trainer)
+        for _ in range(2):
+            resp = self.client.post(
+                "/api/dashboard/trainer/projects/create/",
+                {
+                    "school": str(self.school.pk), "student_name": "Team",
+                    "title": "Robot", "description": "Demo",
+                },
+                format="multipart",
+                HTTP_IDEMPOTENCY_KEY="project-1",
+            )
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ProjectHighlight.objects.count(), 1)
+
+    def test_failed_request_releases_key(self):
+        self.assertEqual(self._submit("k", num_photos=1).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+        self.assertEqual(self._submit("k").status_code, status.HTTP_201_CREATED)
+
+    def test_in_progress_key_conflicts(self):
+        IdempotencyRecord.objects.create(
+            user=self.trainer, key="busy", method="POST", path="/api/dashboard/trainer/submit/",
+            body_hash="h",
+        )
+        with mock.patch("apps.dashboard.idempotency._body_hash", return_value="h"):
+            self.assertEqual(self._submit("busy").status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Submission.objects.exists())
+
+    def test_key_reused_with_a_changed_form(self):
+        self._submit("form", day_number=1)
+        resp = self._submit("form", day_number=2)
+        self.assertEqual(resp.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Submission.objects.count(), 1)
+
+    def test_key_reused_with_other_photos(self):
+        self._submit("form")
+        self.auth_as(self.trainer)
+        other = io.BytesIO()
+        Image.new("RGB", (100, 100), color="blue").save(other, format="JPEG")
+        resp = self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {
+                "school": str(self.school.pk), "day_number": 1, "student_count": 40,
+                "photos": [make_test_image("p0.jpg"), make_test_image("p1.jpg"),
+                           SimpleUploadedFile("p2.jpg", other.getvalue(), content_type="image/jpeg")],
+            },
+            format="multipart",
+            HTTP_IDEMPOTENCY_KEY="form",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_key_reused_on_other_endpoint(self):
+        self._submit("shared")
+        resp = self.client.post(
+            "/api/dashboard/trainer/groups/create/", {"name": "G"}, format="json",
+            HTTP_IDEMPOTENCY_KEY="shared",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_per_user(self):
+        self._submit("same")
+        other = User.objects.create_user(
+            email="other@test.com", username="Other", password="pass1234",
+            role="trainer", is_email_verified=True,
+        )
+        TrainerAssignment.objects.create(trainer=other, school=self.school, role="secondary")
+        self.client.force_authenticate(user=other)
+        resp = self.client.post(
+            "/api/dashboard/trainer/groups/create/", {"name": "G"}, format="json",
+            HTTP_IDEMPOTENCY_KEY="same",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(IDEMPOTENCY_TTL=0)
+    def test_expired_record_is_not_replayed(self):
+        self._submit("old", day_number=1)
+        resp = self._submit("old", day_number=2)
+        self.assertNotIn("Idempotent-Replayed", resp)
+        self.assertEqual(Submission.objects.count(), 2)
+
+        call_command("purge_idempotency_records", stdout=io.StringIO())
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 20. CHUNKED MEDIA UPLOADS
+# ═══════════════════════════════════════════════════════════════════
+
+
+class ChunkedUploadTests(BaseTestCase):
+    """create → PUT chunks at offsets → complete → attach to a project."""
+
+    DATA = bytes(range(256)) * 40  # 10 KB "video"
+
+    def setUp(self):
+        super().setUp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.enterContext(override_settings(CHUNKED_UPLOAD_DIR=self._tmp.name))
+        self.auth_as(self.trainer)
+
+    def _create(self, filename="demo.mp4", size=None):
+        return self.client.post(
+            "/api/dashboard/trainer/uploads/",
+            {"filename": filename, "size": len(self.DATA) if size is None else size},
+            format="json",
+        )
+
+    def _put(self, upload_id, offset, chunk):
+        return self.client.generic(
+            "PUT", f"/api/dashboard/trainer/uploads/{upload_id}/", chunk,
+            content_type="application/octet-stream", HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def _upload_all(self, chunk_size=4096):
+        upload_id = self._create().data["id"]
+        for offset in range(0, len(self.DATA), chunk_size):
+            resp = self._put(upload_id, offset, self.DATA[offset:offset + chunk_size])
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return upload_id
+
+    def _complete(self, upload_id):
+        return self.client.post(f"/api/dashboard/trainer/uploads/{upload_id}/complete/")
+
+    def test_upload_and_attach_to_project(self):
+        upload_id = self._upload_all()
+        resp = self._complete(upload_id)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["status"], "complete")
+        self.assertEqual(os.listdir(self._tmp.name), [])
+
+        resp = self.client.post(
+            "/api/dashboard/trainer/projects/create/",
+            {
+                "school": str(self.school.pk), "student_name": "Team", "title": "Film",
+                "description": "Demo", "project_type": "video",
+                "media_upload": str(upload_id),
+            },
+            format="multipart",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        project = ProjectHighlight.objects.get()
+        self.assertTrue(project.media_file.name.startswith("project_media/demo"))
+        with project.media_file.open("rb") as fh:
+            self.assertEqual(fh.read(), self.DATA)
+        # An upload can be attached only once
+        self.assertFalse(ChunkedUpload.objects.exists())
+
+    def test_resume_after_dropped_chunk(self):
+        upload_id = self._create().data["id"]
+        self._put(upload_id, 0, self.DATA[:4096])
+
+        # A retried chunk at a stale offset is refused with the offset to use
+        resp = self._put(upload_id, 0, self.DATA[:4096])
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(resp.data["offset"], 4096)
+
+        resp = self.client.get(f"/api/dashboard/trainer/uploads/{upload_id}/")
+        self.assertEqual(resp.data["offset"], 4096)
+        self.assertEqual(self._put(upload_id, 4096, self.DATA[4096:]).data["offset"], len(self.DATA))
+        self.assertEqual(self._complete(upload_id).status_code, status.HTTP_200_OK)
+
+    def test_partial_chunk_keeps_received_bytes(self):
+        upload = chunked_uploads.create(self.trainer, "song.mp3", 100)
+        # The client promised 60 bytes but the connection dropped after 25
+        offset = chunked_uploads.write_chunk(upload.pk, self.trainer, 0, io.BytesIO(b"x" * 25), 60)
+        self.assertEqual(offset, 25)
+
+    def test_racing_chunk_loses_the_offset(self):
+        upload = chunked_uploads.create(self.trainer, "song.mp3", 100)
+
+        class Racing(io.BytesIO):
+            # Another PUT for offset 0 commits while this body is arriving
+            def read(self, size=-1):
+                ChunkedUpload.objects.filter(pk=upload.pk).update(offset=40)
+                return super().read(size)
+
+        with self.assertRaises(chunked_uploads.OffsetMismatch) as ctx:
+            chunked_uploads.write_chunk(upload.pk, self.trainer, 0, Racing(b"y" * 30), 30)
+        self.assertEqual(ctx.exception.offset, 40)
+        upload.refresh_from_db()
+        self.assertEqual(upload.offset, 40)
+
+    def test_second_complete_returns_the_first(self):
+        upload_id = self._upload_all()
+        first = self._complete(upload_id)
+        second = self._complete(upload_id)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+
+    def test_incomplete_upload_cannot_complete(self):
+        upload_id = self._create().data["id"]
+        self._put(upload_id, 0, self.DATA[:100])
+        resp = self._complete(upload_id)
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(resp.data["offset"], 100)
+
+    def test_validation(self):
+        self.assertEqual(self._create("virus.exe").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self._create(size=chunked_uploads.MAX_BYTES + 1).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        upload_id = self._create(size=10).data["id"]
+        self.assertEqual(self._put(upload_id, 0, b"x" * 11).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_uploads_are_private(self):
+        upload_id = self._upload_all()
+        other = User.objects.create_user(
+            email="other@test.com", username="Other", password="pass1234",
+            role="trainer", is_email_verified=True,
+        )
+        self.auth_as(other)
+        self.assertEqual(self._complete(upload_id).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get(f"/api/dashboard/trainer/uploads/{upload_id}/").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_purge_stale_uploads(self):
+        upload_id = self._create().data["id"]
+        ChunkedUpload.objects.filter(pk=upload_id).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        call_command("purge_stale_uploads", stdout=io.StringIO())
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertEqual(os.listdir(self._tmp.name), [])
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 21. STREAMING UPLOAD LIMITS
+# ═══════════════════════════════════════════════════════════════════
+
+
+class UploadLimitTests(BaseTestCase):
+    """Oversized multipart bodies are cut off while they stream in."""
+
+    def _photos(self, count, big=None):
+        files = [make_test_image(f"p{i}.jpg") for i in range(count)]
+        if big is not None:
+            files.append(SimpleUploadedFile("huge.jpg", b"\0" * big, content_type="image/jpeg"))
+        return files
+
+    def _submit(self, photos):
+        self.auth_as(self.trainer)
+        return self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {"school": str(self.school.pk), "day_number": 1, "student_count": 40,
+             "photos": photos},
+            format="multipart",
+        )
+
+    def test_oversized_photo_is_rejected(self):
+        resp = self._submit(self._photos(2, big=photo_uploads.MAX_BYTES + 1))
+        self.assertEqual(resp.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertIn("huge.jpg", resp.data["detail"])
+        self.assertFalse(Submission.objects.exists())
+
+    def test_too_many_files(self):
+        resp = self._submit(self._photos(7))
+        self.assertEqual(resp.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertIn("At most 6 files", resp.data["detail"])
+
+    def test_session_photos_with_attendance_sheet_fit(self):
+        self.auth_as(self.trainer)
+        resp = self.client.post(
+            "/api/dashboard/trainer/submit/",
+            {"school": str(self.school.pk), "day_number": 1, "student_count": 40,
+             "photos": self._photos(5),
+             "attendance_file": SimpleUploadedFile("roll.pdf", b"%PDF-1.4")},
+            format="multipart",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_profile_photo_limit(self):
+        self.auth_as(self.trainer)
+        resp = self.client.patch(
+            "/api/dashboard/trainer/profile/",
+            {"profile_photo": SimpleUploadedFile(
+                "me.jpg", b"\0" * (photo_uploads.MAX_BYTES + 1), content_type="image/jpeg")},
+            format="multipart",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_handler_stops_at_first_chunk_over_limit(self):
+        handler = UploadLimitHandler(max_file_mb=1, max_files=2)
+        handler.new_file("photos", "a.jpg", "image/jpeg", None)
+        chunk = b"\0" * (256 * 1024)
+        received = 0
+        with self.assertRaises(UploadTooLarge):
+            while True:
+                handler.receive_data_chunk(chunk, received)
+                received += len(chunk)
+        # Nothing past the limit was passed on to the next handler
+        self.assertEqual(received, 1024 * 1024)
+
+    def test_handler_rejects_declared_length(self):
+        handler = UploadLimitHandler(max_file_mb=1, max_files=2)
+        with self.assertRaises(UploadTooLarge):
+            handler.handle_raw_input(None, {}, 10 * 1024 * 1024, b"x")
+
+    def test_field_specific_limit(self):
+        handler = UploadLimitHandler(max_file_mb=1, max_files=2, fields={"media_file": 3})
+        handler.new_file("media_file", "film.mp4", "video/mp4", None)
+        handler.receive_data_chunk(b"\0" * (2 * 1024 * 1024), 0)
+        handler.new_file("image", "cover.jpg", "image/jpeg", None)
+        with self.assertRaises(UploadTooLarge):
+            handler.receive_data_chunk(b"\0" * (2 * 1024 * 1024), 0)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 22. BACKGROUND TASK QUEUE
+# ═══════════════════════════════════════════════════════════════════
+
+
+_task_calls = []
+
+
+@tasks.task(max_attempts=2)
+def _record_call(value):
+    _task_calls.append(value)
+
+
+@tasks.task(max_attempts=2)
+def _always_fails():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTests(BaseTestCase):
+    """Work is queued in the caller's transaction and run by the worker."""
+
+    def setUp(self):
+        super().setUp()
+        _task_calls.clear()
+
+    def test_delay_queues_until_worker_runs(self):
+        _record_call.delay("a")
+        self.assertEqual(_task_calls, [])
+        task = Task.objects.get()
+        self.assertEqual((task.name, task.args), ("apps.dashboard.tests._record_call", ["a"]))
+
+        self.assertEqual(tasks.run_pending(), 1)
+        self.assertEqual(_task_calls, ["a"])
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+        self.assertEqual(task.attempts, 1)
+
+    def test_rolled_back_enqueue_is_discarded(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            _record_call.delay("a")
+            raise RuntimeError
+        self.assertFalse(Task.objects.exists())
+
+    def test_higher_priority_runs_first(self):
+        tasks.enqueue(_record_call, ("low",), priority=tasks.LOW)
+        _record_call.delay("normal")
+        tasks.enqueue(_record_call, ("high",), priority=tasks.HIGH)
+        tasks.run_pending()
+        self.assertEqual(_task_calls, ["high", "normal", "low"])
+
+    def test_failure_backs_off_then_dead_letters(self):
+        _always_fails.delay()
+        with self.assertLogs("apps.dashboard.services.tasks", "ERROR"):
+            tasks.run_pending()
+        task = Task.objects.get()
+        self.assertEqual((task.status, task.attempts), (Task.Status.QUEUED, 1))
+        self.assertIn("boom", task.last_error)
+        self.assertGreaterEqual(task.run_at, timezone.now() + timedelta(seconds=29))
+
+        # Not due yet
+        self.assertEqual(tasks.run_pending(), 0)
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs("apps.dashboard.services.tasks", "ERROR"):
+            tasks.run_pending()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.Status.DEAD, 2))
+        self.assertIsNotNone(task.finished_at)
+
+        self.assertEqual(tasks.retry(Task.objects.all()), 1)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.Status.QUEUED, 0))
+
+    def test_requeue_stale(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        retry = Task.objects.create(
+            name="x", status=Task.Status.RUNNING, attempts=1, max_attempts=2, locked_at=long_ago,
+        )
+        spent = Task.objects.create(
+            name="x", status=Task.Status.RUNNING, attempts=2, max_attempts=2, locked_at=long_ago,
+        )
+        fresh = Task.objects.create(
+            name="x", status=Task.Status.RUNNING, attempts=1, locked_at=timezone.now(),
+        )
+        self.assertEqual(tasks.requeue_stale(), 2)
+        statuses = {t.pk: t.status for t in Task.objects.all()}
+        self.assertEqual(statuses[retry.pk], Task.Status.QUEUED)
+        self.assertEqual(statuses[spent.pk], Task.Status.DEAD)
+        self.assertEqual(statuses[fresh.pk], Task.Status.RUNNING)
+
+    def test_heartbeat_keeps_long_tasks_running(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        busy = Task.objects.create(
+            name="x", status=Task.Status.RUNNING, attempts=1, locked_by="host:1:0", locked_at=long_ago,
+        )
+        crashed = Task.objects.create(
+            name="x", status=Task.Status.RUNNING, attempts=1, locked_by="host:2:0", locked_at=long_ago,
+        )
+        self.assertEqual(tasks.heartbeat(["host:1:0", "host:1:1"]), 1)
+        self.assertEqual(tasks.requeue_stale(), 1)
+        statuses = {t.pk: t.status for t in Task.objects.all()}
+        self.assertEqual(statuses[busy.pk], Task.Status.RUNNING)
+        self.assertEqual(statuses[crashed.pk], Task.Status.QUEUED)
+
+    def test_run_worker_once(self):
+        _record_call.delay("a")
+        _record_call.delay("b")
+        out = io.StringIO()
+        call_command("run_worker", "--once", stdout=out)
+        self.assertIn("Ran 2 task(s).", out.getvalue())
+        self.assertEqual(sorted(_task_calls), ["a", "b"])
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            _record_call.delay("a")
+            self.assertEqual(_task_calls, [])
+        self.assertEqual(_task_calls, ["a"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_warns_when_no_worker_claims_due_tasks(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        Task.objects.create(name="x", run_at=long_ago)
+        with self.assertLogs("apps.dashboard.services.tasks", "WARNING") as logs:
+            tasks.warn_if_unattended()
+        self.assertIn("1 background tasks", logs.output[0])
+
+        # A worker that claimed something recently is alive, just busy
+        Task.objects.create(name="x", status=Task.Status.RUNNING, locked_at=timezone.now())
+        self.assertEqual(tasks.unattended(), 0)
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_no_unattended_warning_in_eager_mode(self):
+        Task.objects.create(name="x", run_at=timezone.now() - timedelta(hours=1))
+        with self.assertNoLogs("apps.dashboard.services.tasks", "WARNING"):
+            tasks.warn_if_unattended()
+
+    def test_worker_serves_only_its_lanes(self):
+        _record_call.delay("default")
+        tasks.enqueue(email.send_now, (0,))
+        self.assertEqual(tasks.run_pending(queues=[tasks.PRIORITY_QUEUE]), 1)
+        self.assertEqual(_task_calls, [])
+        self.assertEqual(
+            Task.objects.get(status=Task.Status.QUEUED).queue, tasks.DEFAULT_QUEUE
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 23. EMAIL OUTBOX
+# ═══════════════════════════════════════════════════════════════════
+
+
+class RecordingEmailBackend(LocmemEmailBackend):
+    """locmem backend that counts opened connections and refuses bad@ addresses."""
+
+    opened = 0
+
+    def open(self):
+        type(self).opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if any("bad@test.com" in m.to for m in messages):
+            raise OSError("mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="apps.dashboard.tests.RecordingEmailBackend",
+    EMAIL_SEND_RATE=0,
+)
+class EmailOutboxTests(BaseTestCase):
+    """send_email() writes the outbox; the sender drains it over one connection."""
+
+    def setUp(self):
+        super().setUp()
+        RecordingEmailBackend.opened = 0
+
+    def test_send_email_renders_into_outbox(self):
+        ok = email.send_email(
+            "t@test.com", "Reminder", "trainer_form_reminder",
+            {"trainer_name": "Asha", "form_url": "https://x", "deadline": timezone.now().date()},
+        )
+        self.assertTrue(ok)
+        self.assertEqual(len(mail.outbox), 0)
+        row = EmailOutbox.objects.get()
+        self.assertEqual((row.to, row.status), (["t@test.com"], EmailOutbox.Status.PENDING))
+        self.assertIn("Asha", row.text_body)
+        self.assertIn("<html", row.html_body.lower())
+
+    def test_fan_out_queues_one_flush(self):
+        for i in range(5):
+            email.queue(f"p{i}@test.com", "Hello", "body")
+        self.assertEqual(Task.objects.filter(name=email.flush.task_name).count(), 1)
+        # A more urgent message gets a flush of its own priority
+        email.queue("otp@test.com", "Code", "123456", priority=tasks.HIGH)
+        self.assertEqual(Task.objects.filter(name=email.flush.task_name).count(), 2)
+
+    def test_batches_share_one_connection(self):
+        for i in range(5):
+            email.queue(f"p{i}@test.com", "Hello", "body")
+        self.assertEqual(email.send_outbox(batch_size=2), (5, 0))
+        self.assertEqual(RecordingEmailBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(EmailOutbox.objects.exclude(status=EmailOutbox.Status.SENT).exists())
+        self.assertFalse(EmailOutbox.objects.filter(sent_at=None).exists())
+
+    def test_higher_priority_sends_first(self):
+        email.queue("later@test.com", "Digest", "body")
+        email.queue("now@test.com", "Code", "body", priority=tasks.HIGH)
+        email.send_outbox()
+        self.assertEqual([m.to for m in mail.outbox], [["now@test.com"], ["later@test.com"]])
+
+    def test_failed_message_is_retried_then_marked_failed(self):
+        email.queue("bad@test.com", "Hello", "body")
+        email.queue("good@test.com", "Hello", "body")
+        with self.assertLogs("emails", "WARNING"):
+            self.assertEqual(email.send_outbox(), (1, 1))
+        bad = EmailOutbox.objects.get(to=["bad@test.com"])
+        self.assertEqual((bad.status, bad.attempts), (EmailOutbox.Status.PENDING, 1))
+        self.assertIn("mailbox unavailable", bad.last_error)
+
+        with self.assertLogs("emails", "WARNING"):
+            with self.assertRaises(email.EmailDeliveryError):
+                email.flush()
+            email.send_outbox()
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts), (EmailOutbox.Status.FAILED, email.MAX_ATTEMPTS))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_scheduled_emails_flush(self):
+        out = io.StringIO()
+        email.queue("p@test.com", "Hello", "body")
+        call_command("send_scheduled_emails", "--flush", stdout=out)
+        self.assertIn("Outbox: 1 sent, 0 left for retry.", out.getvalue())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 24. OTP DELIVERY
+# ═══════════════════════════════════════════════════════════════════
+
+
+@override_settings(EMAIL_BACKEND="apps.dashboard.tests.RecordingEmailBackend")
+class OtpDeliveryTests(BaseTestCase):
+    """OTP endpoints return once the email is queued; clients poll its status."""
+
+    def _status(self, delivery_id):
+        return self.client.get(f"/api/auth/otp-delivery/{delivery_id}/")
+
+    def test_request_otp_queues_on_priority_lane(self):
+        email.queue("p@test.com", "Digest", "body")
+        resp = self.client.post("/api/auth/request-otp/", {"email": self.trainer.email})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        delivery_id = resp.data["delivery_id"]
+        self.assertEqual(self._status(delivery_id).data, {"status": "pending"})
+
+        # A priority-lane worker sends the code and leaves the batch alone
+        self.assertEqual(tasks.run_pending(queues=[tasks.PRIORITY_QUEUE]), 1)
+        self.assertEqual([m.to for m in mail.outbox], [[self.trainer.email]])
+        self.assertIn(mail.outbox[0].subject.split(": ")[1], mail.outbox[0].body)
+        self.assertEqual(self._status(delivery_id).data, {"status": "sent"})
+        self.assertEqual(EmailOutbox.objects.filter(status="pending").count(), 1)
+
+    def test_failed_delivery_is_visible(self):
+        message = email.queue("bad@test.com", "Code", "123456", urgent=True)
+        with self.assertLogs("emails", "WARNING"):
+            for _ in range(email.MAX_ATTEMPTS - 1):
+                # Raises, so the task queue retries with backoff
+                with self.assertLogs("apps.dashboard.services.tasks", "ERROR"):
+                    tasks.run_pending()
+                self.assertEqual(self._status(message.delivery_id).data["status"], "pending")
+                Task.objects.update(run_at=timezone.now())
+            tasks.run_pending()
+        self.assertEqual(self._status(message.delivery_id).data, {"status": "failed"})
+
+    def test_batch_flush_does_not_resend(self):
+        message = email.queue("p@test.com", "Code", "123456", urgent=True)
+        email.send_outbox(rate=0)
+        tasks.run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(self._status(message.delivery_id).data, {"status": "sent"})
+
+    def test_unknown_delivery(self):
+        self.assertEqual(
+            self._status("00000000-0000-0000-0000-000000000000").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 25. ROSTER IMPORT
+# ═══════════════════════════════════════════════════════════════════
+
+
+class RosterImportTests(BaseTestCase):
+    """A whole class roster is validated first, deduped and bulk-inserted."""
+
+    URL = "/api/dashboard/trainer/students/import/"
+
+    def _csv(self, text, name="roster.csv"):
+        return SimpleUploadedFile(name, text.encode(), content_type="text/csv")
+
+    def _import(self, text, **extra):
+        return self.client.post(
+            self.URL, {"file": self._csv(text), **extra}, format="multipart"
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.auth_as(self.trainer)
+
+    def test_import_creates_students_in_bulk(self):
+        Student.objects.create(school=self.school, added_by=self.trainer, name="Asma Begum")
+        text = (
+            "Student Name,Age,Class,Guardian,Phone,Baseline,Ignored\n"
+            "asma  begum,12,7,,,,x\n"
+            "Kavya,11,6,Lakshmi,9876543210,6,x\n"
+            ",,,,,,\n"
+            "Sana,12,7,,,8,x\n"
+            "SANA,12,7,,,8,x\n"
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._import(text)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(resp.data["created"], 2)
+        self.assertEqual(
+            resp.data["skipped"], [{"row": 2, "name": "asma  begum"}, {"row": 6, "name": "SANA"}]
+        )
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "dashboard_student"')]
+        self.assertEqual(len(inserts), 1)
+
+        kavya = Student.objects.get(name="Kavya")
+        self.assertEqual(
+            (kavya.age, kavya.grade, kavya.parent_name, kavya.parent_phone, kavya.baseline_marks),
+            (11, "6", "Lakshmi", "9876543210", 6),
+        )
+        self.school.refresh_from_db()
+        self.assertEqual(self.school.total_students, 3)
+
+    def test_invalid_rows_are_all_reported_and_nothing_written(self):
+        resp = self._import("name,age,baseline_marks\nKavya,eleven,6\nSana,12,8\n,12,x\n")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data["created"], 0)
+        self.assertEqual([e["row"] for e in resp.data["errors"]], [2, 4])
+        self.assertIn("age", resp.data["errors"][0]["errors"])
+        self.assertEqual(set(resp.data["errors"][1]["errors"]), {"name", "baseline_marks"})
+        self.assertFalse(Student.objects.exists())
+
+    def test_dry_run_writes_nothing(self):
+        resp = self._import("name\nKavya\nSana\n", dry_run="true")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual((resp.data["created"], resp.data["dry_run"]), (2, True))
+        self.assertFalse(Student.objects.exists())
+
+    def test_file_level_errors(self):
+        self.assertIn("'name' column", self._import("age,grade\n12,7\n").data["detail"])
+        resp = self.client.post(
+            self.URL, {"file": self._csv("name\nKavya\n", "roster.txt")}, format="multipart"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Unsupported file type", resp.data["detail"])
+        bad = SimpleUploadedFile("roster.csv", "name\nK\xe4vya\n".encode("latin-1"))
+        resp = self.client.post(self.URL, {"file": bad}, format="multipart")
+        self.assertIn("UTF-8", resp.data["detail"])
+
+    def test_other_schools_are_off_limits(self):
+        other = School.objects.create(name="Elsewhere", district=self.district)
+        resp = self._import("name\nKavya\n", school=str(other.pk))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Student.objects.exists())
+
+    @skipUnless(importlib.util.find_spec("openpyxl"), "openpyxl is not installed")
+    def test_xlsx_roster(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        workbook.active.append(["Name", "Age", "Baseline"])
+        workbook.active.append(["Kavya", 11.0, 6])
+        buf = io.BytesIO()
+        workbook.save(buf)
+        upload = SimpleUploadedFile("roster.xlsx", buf.getvalue())
+        resp = self.client.post(self.URL, {"file": upload}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(Student.objects.get().age, 11)
+
+    @skipUnless(importlib.util.find_spec("openpyxl") is None, "openpyxl is installed")
+    def test_xlsx_needs_openpyxl(self):
+        upload = SimpleUploadedFile("roster.xlsx", b"PK\x03\x04")
+        resp = self.client.post(self.URL, {"file": upload}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("upload a CSV instead", resp.data["detail"])
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fh:
+            fh.write("name,age\nKavya,11\nSana,12\n")
+        self.addCleanup(os.remove, fh.name)
+        out = io.StringIO()
+        call_command("import_students", fh.name, "--school", self.school.name, stdout=out)
+        self.assertIn("Created 2 student(s)", out.getvalue())
+        self.assertEqual(Student.objects.filter(added_by=self.trainer).count(), 2)
+
+        with self.assertRaises(CommandError):
+            call_command("import_students", fh.name, "--school", "no such school")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 26. BULK MARKS ENTRY
+# ═══════════════════════════════════════════════════════════════════
+
+
+class BulkMarksTests(BaseTestCase):
+    """Marks for a whole class go in with one ownership check and one UPDATE."""
+
+    URL = "/api/dashboard/trainer/students/marks/"
+
+    def setUp(self):
+        super().setUp()
+        self.auth_as(self.trainer)
+        self.kavya, self.sana, self.asma = (
+            Student.objects.create(
+                school=self.school, added_by=self.trainer, name=name, baseline_marks=baseline
+            )
+            for name, baseline in (("Kavya", 5), ("Sana", None), ("Asma", 7))
+        )
+
+    def _post(self, data):
+        return self.client.post(self.URL, data, format="json")
+
+    def test_updates_in_one_statement_and_returns_only_changes(self):
+        before = versions.current(["students"])["students"]
+        data = {
+            str(self.kavya.pk): {"baseline": 5, "endline": 9},
+            str(self.sana.pk): {"baseline": 4},
+            str(self.asma.pk): {"baseline": 7},
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._post(data)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(resp.data, {
+            "updated": 2,
+            "changes": {
+                str(self.kavya.pk): {"endline": [None, 9]},
+                str(self.sana.pk): {"baseline": [None, 4]},
+            },
+        })
+        student_queries = [q["sql"] for q in ctx.captured_queries if '"dashboard_student"' in q["sql"]]
+        self.assertEqual(len(student_queries), 2)
+        self.assertTrue(student_queries[1].startswith('UPDATE "dashboard_student"'))
+
+        self.kavya.refresh_from_db()
+        self.sana.refresh_from_db()
+        self.assertEqual((self.kavya.baseline_marks, self.kavya.endline_marks), (5, 9))
+        self.assertEqual(self.sana.baseline_marks, 4)
+        self.assertEqual(versions.current(["students"])["students"], before + 1)
+
+    def test_null_clears_a_mark(self):
+        resp = self._post({str(self.asma.pk): {"baseline": None}})
+        self.assertEqual(resp.data["changes"], {str(self.asma.pk): {"baseline": [7, None]}})
+        self.asma.refresh_from_db()
+        self.assertIsNone(self.asma.baseline_marks)
+
+    def test_invalid_entry_writes_nothing(self):
+        resp = self._post({
+            str(self.kavya.pk): {"baseline": 8},
+            str(self.sana.pk): {"baseline": "high"},
+            str(self.asma.pk): {},
+        })
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(resp.data), {str(self.sana.pk), str(self.asma.pk)})
+        self.kavya.refresh_from_db()
+        self.assertEqual(self.kavya.baseline_marks, 5)
+
+        for body in ([], {}, {"not-a-uuid": {"baseline": 1}}):
+            self.assertEqual(self._post(body).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_marks_are_bounded_like_the_model(self):
+        resp = self._post({
+            str(self.kavya.pk): {"baseline": -1},
+            str(self.sana.pk): {"endline": MAX_MARKS + 1},
+            str(self.asma.pk): {"endline": MAX_MARKS},
+        })
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(resp.data), {str(self.kavya.pk), str(self.sana.pk)})
+        self.assertFalse(Student.objects.exclude(endline_marks=None).exists())
+
+    def test_rows_are_read_under_lock(self):
+        select_for_update = QuerySet.select_for_update
+        with mock.patch.object(
+            QuerySet, "select_for_update", autospec=True, side_effect=select_for_update
+        ) as spy:
+            self.assertEqual(self._post({str(self.kavya.pk): {"endline": 9}}).status_code,
+                             status.HTTP_200_OK)
+        self.assertIn(Student, [call.args[0].model for call in spy.call_args_list])
+
+    def test_students_of_other_schools_are_off_limits(self):
+        other = School.objects.create(name="Elsewhere", district=self.district)
+        outsider = Student.objects.create(school=other, added_by=self.admin, name="Ravi")
+        resp = self._post({
+            str(self.kavya.pk): {"endline": 9},
+            str(outsider.pk): {"endline": 9},
+        })
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(resp.data["unknown"], [str(outsider.pk)])
+        self.assertFalse(Student.objects.exclude(endline_marks=None).exists())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 27. LEARNING-GAIN ANALYTICS
+# ═══════════════════════════════════════════════════════════════════
+
+
+class LearningGainTests(BaseTestCase):
+    """Gain distributions per district / school / trainer / group, cached by version."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        group = StudentGroup.objects.create(
+            name="Team A", school=self.school, created_by=self.trainer
+        )
+        self.other = School.objects.create(
+            name="Other School", district=District.objects.create(name="Warangal")
+        )
+        for name, school, baseline, endline, grp in (
+            ("Kavya", self.school, 4, 9, group),
+            ("Sana", self.school, 6, 6, group),
+            ("Asma", self.school, 3, 10, None),
+            ("Ravi", self.other, 8, 5, None),
+            ("Unmarked", self.school, 5, None, group),
+        ):
+            Student.objects.create(
+                name=name, school=school, group=grp, added_by=self.trainer,
+                baseline_marks=baseline, endline_marks=endline,
+            )
+        self.group = group
+
+    def _by_name(self, entries):
+        return {entry["name"]: entry for entry in entries}
+
+    def test_distributions(self):
+        report = analytics.compute(use_numpy=False)
+        # Gains -3, 0, 5, 7; the student without an endline is left out
+        self.assertEqual(report["bins"], {"start": -3, "width": 2, "count": 6})
+        self.assertEqual(report["overall"], {
+            "assessed": 4,
+            "mean_baseline": 5.25,
+            "mean_endline": 7.5,
+            "mean_gain": 2.25,
+            "median_gain": 2.5,
+            "percentiles": {"p10": -2.1, "p25": -0.75, "p75": 5.5, "p90": 6.4},
+            "improved_share": 0.5,
+            "histogram": [1, 1, 0, 0, 1, 1],
+        })
+
+        school = self._by_name(report["schools"])[self.school.name]
+        self.assertEqual(school["district"], str(self.district.pk))
+        self.assertEqual(
+            (school["assessed"], school["mean_gain"], school["median_gain"], school["improved_share"]),
+            (3, 4.0, 5.0, 0.667),
+        )
+        districts = self._by_name(report["districts"])
+        self.assertEqual(districts["Hyderabad"]["assessed"], 3)
+        self.assertEqual(districts["Warangal"]["mean_gain"], -3.0)
+        # Ravi's school has no trainer
+        self.assertEqual(
+            [(t["name"], t["assessed"]) for t in report["trainers"]], [("Test Trainer", 3)]
+        )
+        self.assertEqual(
+            [(g["name"], g["school"], g["assessed"], g["median_gain"]) for g in report["groups"]],
+            [("Team A", str(self.school.pk), 2, 2.5)],
+        )
+
+    @skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_numpy_path_matches_python(self):
+        # A trainer across two schools is the union of both
+        TrainerAssignment.objects.create(trainer=self.trainer, school=self.other, role="primary")
+        python = analytics.compute(use_numpy=False)
+        vectorised = analytics.compute(use_numpy=True)
+        python.pop("computed_at")
+        vectorised.pop("computed_at")
+        self.assertEqual(vectorised, python)
+
+    def test_database_aggregates_match_python(self):
+        TrainerAssignment.objects.create(trainer=self.trainer, school=self.other, role="primary")
+        python = analytics.compute(use_numpy=False)
+        # SQLite has no percentile_cont; everything else is the PostgreSQL path
+        database = analytics._database_report(analytics._blank(), percentiles=False)
+
+        def without_percentiles(entry):
+            return {k: v for k, v in entry.items() if k not in ("median_gain", "percentiles")}
+
+        self.assertEqual(database["bins"], python["bins"])
+        self.assertEqual(database["overall"], without_percentiles(python["overall"]))
+        for name in analytics.DIMENSIONS:
+            self.assertEqual(database[name], [without_percentiles(e) for e in python[name]], name)
+
+    def test_percentile_cont_sql(self):
+        query = Student.objects.values("school_id").annotate(
+            p25=analytics.PercentileCont("baseline_marks", 25)
+        ).query
+        self.assertIn('PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY "dashboard_student"."baseline_marks")', str(query))
+
+    def test_no_marks_yet(self):
+        Student.objects.all().delete()
+        report = analytics.compute()
+        self.assertEqual((report["overall"], report["schools"]), ({"assessed": 0}, []))
+
+    def test_cached_until_marks_change(self):
+        first = analytics.load()
+        with self.assertNumQueries(1):
+            self.assertEqual(analytics.load(), first)
+
+        ravi = Student.objects.get(name="Ravi")
+        ravi.endline_marks = 9
+        ravi.save()
+        self.assertEqual(analytics.load()["overall"]["improved_share"], 0.75)
+
+    def test_endpoints(self):
+        self.auth_as(self.admin)
+        resp = self.client.get("/api/dashboard/swinfy/learning-gains/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data["trainers"]), 1)
+        resp = self.client.get("/api/dashboard/swinfy/learning-gains/?by=groups")
+        self.assertEqual(
+            set(resp.data), {"computed_at", "bins", "overall", "groups"}
+        )
+
+        self.auth_as(self.sponsor)
+        resp = self.client.get("/api/dashboard/uwh/learning-gains/")
+        self.assertEqual(
+            set(resp.data), {"computed_at", "bins", "overall", "districts", "schools"}
+        )
+        resp = self.client.get("/api/dashboard/uwh/learning-gains/?by=trainers")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.auth_as(self.trainer)
+        resp = self.client.get("/api/dashboard/uwh/learning-gains/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 28. STREAMING EXPORTS
+# ═══════════════════════════════════════════════════════════════════
+
+
+class ExportTests(BaseTestCase):
+    """swinfy/export/{submissions,students,projects,photos}/ as streamed files."""
+
+    def setUp(self):
+        super().setUp()
+        self.other = School.objects.create(name="Other School", district=self.district)
+        self.verified = Submission.objects.create(
+            school=self.school, trainer=self.trainer, day_number=1,
+            student_count=40, status="verified",
+        )
+        Submission.objects.create(
+            school=self.other, trainer=self.trainer, day_number=1, status="submitted"
+        )
+        Submission.objects.create(
+            school=self.school, trainer=self.trainer, day_number=2, status="draft"
+        )
+        SessionPhoto.objects.create(submission=self.verified, image=make_test_image())
+        for name, school in (("Kavya", self.school), ("Ravi", self.other)):
+            Student.objects.create(
+                name=name, school=school, added_by=self.trainer, baseline_marks=4
+            )
+        self.auth_as(self.admin)
+
+    def _export(self, dataset, params=""):
+        resp = self.client.get(f"/api/dashboard/swinfy/export/{dataset}/{params}")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        return resp
+
+    def _rows(self, resp):
+        text = b"".join(resp.streaming_content).decode("utf-8-sig")
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def test_submissions_csv(self):
+        resp = self._export("submissions")
+        self.assertEqual(resp["Content-Type"], "text/csv; charset=utf-8")
+        self.assertRegex(
+            resp["Content-Disposition"], r'attachment; filename="submissions-[\d-]+\.csv"'
+        )
+        rows = self._rows(resp)
+        self.assertEqual(len(rows), 2)  # drafts are not exported
+        verified = next(row for row in rows if row["status"] == "verified")
+        self.assertEqual(verified["school"], self.school.name)
+        self.assertEqual(verified["trainer"], self.trainer.username)
+        self.assertEqual(verified["photos"], "1")
+
+    def test_same_filters_as_submission_list(self):
+        for params, expected in (
+            (f"?school={self.other.pk}", "Other School"),
+            ("?status=verified", self.school.name),
+        ):
+            rows = self._rows(self._export("submissions", params))
+            self.assertEqual([row["school"] for row in rows], [expected])
+
+    def test_one_query_for_the_whole_export(self):
+        with self.assertNumQueries(1):
+            rows = self._rows(self._export("students", f"?district={self.district.pk}"))
+        # Ordered by school name, then student name
+        self.assertEqual([row["name"] for row in rows], ["Ravi", "Kavya"])
+        self.assertEqual(rows[0]["baseline_marks"], "4")
+
+    def test_file_columns_are_urls(self):
+        rows = self._rows(self._export("photos"))
+        self.assertEqual(len(rows), 1)  # every status, not only pending
+        self.assertTrue(rows[0]["image"].startswith("http://testserver/"))
+
+        ProjectHighlight.objects.create(
+            school=self.school, trainer=self.trainer, student_name="Kavya",
+            title="Robot", description="d", approval_status="approved",
+        )
+        rows = self._rows(self._export("projects", f"?trainer={self.trainer.pk}"))
+        self.assertEqual(rows[0]["school"], self.school.name)
+        self.assertEqual(rows[0]["image"], "")
+
+    @skipUnless(importlib.util.find_spec("openpyxl"), "openpyxl is not installed")
+    def test_xlsx(self):
+        from openpyxl import load_workbook
+
+        resp = self._export("students", "?file_format=xlsx")
+        self.assertTrue(resp["Content-Disposition"].endswith('.xlsx"'))
+        workbook = load_workbook(io.BytesIO(b"".join(resp.streaming_content)))
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][:2], ("id", "name"))
+        self.assertEqual(sorted(row[1] for row in rows[1:]), ["Kavya", "Ravi"])
+
+    @skipUnless(importlib.util.find_spec("openpyxl") is None, "openpyxl is installed")
+    def test_xlsx_needs_openpyxl(self):
+        resp = self.client.get("/api/dashboard/swinfy/export/students/?file_format=xlsx")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("use CSV instead", resp.data["detail"])
+
+    def test_formula_like_text_is_escaped(self):
+        names = ["=HYPERLINK(\"http://x\")", "+91 98480", "-1+2", "@SUM(A1)", "\tTab", "Plain"]
+        Student.objects.all().delete()
+        for name in names:
+            Student.objects.create(
+                name=name, school=self.school, added_by=self.trainer, baseline_marks=-3
+            )
+        rows = self._rows(self._export("students"))
+        self.assertEqual(
+            sorted(row["name"] for row in rows),
+            sorted(name if name == "Plain" else f"'{name}" for name in names),
+        )
+        # Numbers stay numbers
+        self.assertEqual({row["baseline_marks"] for row in rows}, {"-3"})
+
+    @skipUnless(importlib.util.find_spec("openpyxl"), "openpyxl is not installed")
+    def test_formula_like_text_is_not_a_formula_in_xlsx(self):
+        from openpyxl import load_workbook
+
+        Student.objects.create(name="=1+1", school=self.school, added_by=self.trainer)
+        resp = self._export("students", "?file_format=xlsx")
+        workbook = load_workbook(io.BytesIO(b"".join(resp.streaming_content)))
+        cells = [row[1] for row in workbook.active.iter_rows(min_row=2)]
+        escaped = next(cell for cell in cells if "1+1" in str(cell.value))
+        self.assertEqual((escaped.value, escaped.data_type), ("'=1+1", "s"))
+
+    def test_unknown_format_and_permissions(self):
+        resp = self.client.get("/api/dashboard/swinfy/export/students/?file_format=pdf")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.auth_as(self.trainer)
+        resp = self.client.get("/api/dashboard/swinfy/export/students/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_asgi_streams_asynchronously(self):
+        token = str(RefreshToken.for_user(self.admin).access_token)
+        resp = await self.async_client.get(
+            "/api/dashboard/swinfy/export/students/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.is_async)
+        body = b"".join([chunk async for chunk in resp.streaming_content])
+        self.assertEqual(body.decode("utf-8-sig").count("\n"), 3)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 29. GALLERY ZIP ARCHIVE
+# ═══════════════════════════════════════════════════════════════════
+
+
+class GalleryArchiveTests(BaseTestCase):
+    """GET uwh/gallery/archive/ streams approved photos as a ZIP built on the fly."""
+
+    URL = "/api/dashboard/uwh/gallery/archive/"
+
+    def setUp(self):
+        super().setUp()
+        self.verified = Submission.objects.create(
+            school=self.school, trainer=self.trainer, day_number=1, status="verified"
+        )
+        self.approved = SessionPhoto.objects.create(
+            submission=self.verified, image=make_test_image(), approval_status="approved"
+        )
+        SessionPhoto.objects.create(submission=self.verified, image=make_test_image())
+        other = School.objects.create(
+            name="Warangal School", district=District.objects.create(name="Warangal")
+        )
+        SessionPhoto.objects.create(
+            submission=Submission.objects.create(
+                school=other, trainer=self.trainer, day_number=1, status="verified"
+            ),
+            image=make_test_image(),
+            approval_status="approved",
+        )
+        self.project = ProjectHighlight.objects.create(
+            school=self.school, trainer=self.trainer, student_name="Kavya",
+            title="Robot / Arm", description="d", approval_status="featured",
+            image=make_test_image("robot.jpg"),
+        )
+        self.auth_as(self.sponsor)
+
+    def _archive(self, params=""):
+        resp = self.client.get(self.URL + params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/zip")
+        self.assertTrue(resp.streaming)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        return archive
+
+    def _stored(self, field):
+        field.open("rb")
+        with field:
+            return field.read()
+
+    def test_district_archive(self):
+        archive = self._archive(f"?district={self.district.pk}")
+        names = archive.namelist()
+        folder = "Hyderabad/TMREIS School #1"
+        self.assertEqual(len(names), 2)  # pending photo and other district left out
+        self.assertTrue(names[0].startswith(f"{folder}/Day 1/"))
+        self.assertTrue(names[0].endswith(f"-{self.approved.pk.hex[:8]}.jpg"))
+        self.assertEqual(names[1], f"{folder}/Projects/Robot - Arm-{self.project.pk.hex[:8]}.jpg")
+        self.assertEqual(archive.read(names[0]), self._stored(self.approved.image))
+        self.assertEqual(archive.read(names[1]), self._stored(self.project.image))
+
+    def test_same_filters_as_gallery(self):
+        gallery = self.client.get(f"/api/dashboard/uwh/gallery/?school={self.school.pk}")
+        archive = self._archive(f"?school={self.school.pk}")
+        photos = [name for name in archive.namelist() if "/Day " in name]
+        self.assertEqual(len(photos), len(gallery.data["featured"]) + len(gallery.data["photos"]))
+
+    def test_large_files_are_streamed_in_chunks(self):
+        with mock.patch.object(archives, "READ_AHEAD_BYTES", 100), \
+                mock.patch.object(archives, "CHUNK_BYTES", 256):
+            resp = self.client.get(self.URL)
+            chunks = list(resp.streaming_content)
+        self.assertGreater(len(chunks), 3)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        self.assertEqual(len(archive.namelist()), 3)
+        self.assertIn(self._stored(self.approved.image), [archive.read(n) for n in archive.namelist()])
+
+    @override_settings(STORAGE_READ_WORKERS=2)
+    def test_reads_run_at_most_one_per_worker_ahead(self):
+        files = iter([("a", f"f{i}", None) for i in range(10)])
+        with mock.patch.object(archives, "_read", side_effect=lambda name: (b"x", None)):
+            ahead = archives._read_ahead(files)
+            next(ahead)
+            self.assertEqual(len(list(files)), 8)
+            ahead.close()
+
+    def test_unreadable_file_is_left_out(self):
+        self.approved.image.storage.delete(self.approved.image.name)
+        with self.assertLogs("apps.dashboard.services.archives", "WARNING"):
+            archive = self._archive(f"?district={self.district.pk}")
+        self.assertEqual(len(archive.namelist()), 1)
+
+    def test_nothing_to_archive(self):
+        SessionPhoto.objects.update(approval_status="rejected")
+        ProjectHighlight.objects.update(approval_status="rejected")
+        resp = self.client.get(self.URL)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_admins_too_but_not_trainers(self):
+        self.auth_as(self.admin)
+        self.assertEqual(self.client.get(self.URL).status_code, status.HTTP_200_OK)
+        self.auth_as(self.trainer)
+        self.assertEqual(self.client.get(self.URL).status_code, status.HTTP_403_FORBIDDEN)
+
@@ -0,0 +1,105 @@
+"""
+Upload size limits enforced while a multipart body is still streaming.
+
+    @api_view(["POST"])
+    @permission_classes([IsAuthenticated, IsTrainer])
+    @parser_classes([MultiPartParser, FormParser])
+    @limit_uploads(max_files=2, fields={"media_file": MAX_MEDIA_SIZE_MB})
+    def trainer_create_project(request): ...
+
+Django's multipart parser normally reads every file into memory or a temp
+file before the view can look at it. limit_uploads() puts
+UploadLimitHandler in front of the default upload handlers. The handler
+counts bytes as chunks arrive and raises UploadTooLarge (HTTP 413) once a
+limit is crossed:
+
+  * the declared Content-Length is over the request limit (before any reading)
+  * more than ``max_files`` files
+  * one file over its field's limit (default MAX_PHOTO_SIZE_MB)
+  * the file bytes in total over the request limit
+
+Parsing stops at that point, so an oversized body never reaches memory,
+disk or the view.
+"""
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, load_handler
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .program_config import MAX_PHOTO_SIZE_MB, MAX_PHOTOS_PER_SUBMISSION
+
+MB = 1024 * 1024
+# Room for the non-file form fields and multipart boundaries
+FORM_OVERHEAD = 1 * MB
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Upload is too large."
+    default_code = "upload_too_large"
+
+
+class UploadLimitHandler(FileUploadHandler):
+    def __init__(self, request=None, max_file_mb=MAX_PHOTO_SIZE_MB,
+                 max_files=MAX_PHOTOS_PER_SUBMISSION, fields=None, max_request_mb=None):
+        super().__init__(request)
+        self.field_limits = {name: mb * MB for name, mb in (fields or {}).items()}
+        self.default_limit = max_file_mb * MB
+        self.max_files = max_files
+        if max_request_mb is None:
+            largest = max([self.default_limit, *self.field_limits.values()])
+            self.max_request = max_files * largest + FORM_OVERHEAD
+        else:
+            self.max_request = max_request_mb * MB
+        self.files = 0
+        self.total = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length and content_length > self.max_request:
+            raise UploadTooLarge(
+                f"Request body is larger than {self.max_request // MB} MB."
+            )
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.files += 1
+        if self.files > self.max_files:
+            raise UploadTooLarge(f"At most {self.max_files} files may be uploaded at once.")
+        self.limit = self.field_limits.get(field_name, self.default_limit)
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        self.total += len(raw_data)
+        if self.size > self.limit:
+            raise UploadTooLarge(f"{self.file_name}: larger than {self.limit // MB} MB.")
+        if self.total > self.max_request:
+            raise UploadTooLarge(
+                f"Request body is larger than {self.max_request // MB} MB."
+            )
+        # Pass the chunk on to the memory / temp-file handlers
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def limit_uploads(**limits):
+    """Apply UploadLimitHandler(**limits) to the decorated view's request."""
+
+    def decorator(func):
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            django_request = getattr(request, "_request", request)
+            django_request.upload_handlers = [
+                UploadLimitHandler(django_request, **limits),
+                *(load_handler(path, django_request) for path in settings.FILE_UPLOAD_HANDLERS),
+            ]
+            return func(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
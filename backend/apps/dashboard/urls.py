@@ -14,9 +14,12 @@ urlpatterns = [
     path("trainer/submissions/", views.trainer_submissions),
     path("trainer/submit/", views.trainer_submit),
     path("trainer/submissions/<uuid:pk>/", views.trainer_submission_detail),
+    path("trainer/submissions/<uuid:pk>/finalize/", views.trainer_finalize_submission),
     path("trainer/submissions/<uuid:submission_pk>/projects/", views.trainer_add_project),
     path("trainer/students/", views.trainer_students),
     path("trainer/students/add/", views.trainer_add_student),
+    path("trainer/students/import/", views.trainer_import_students),
+    path("trainer/students/marks/", views.trainer_bulk_marks),
     path("trainer/students/<uuid:pk>/", views.trainer_update_student),
     path("trainer/students/<uuid:pk>/delete/", views.trainer_delete_student),
     path("trainer/groups/", views.trainer_groups),
@@ -27,7 +30,11 @@ urlpatterns = [
     path("trainer/groups/<uuid:pk>/remove-students/", views.trainer_remove_students_from_group),
     path("trainer/projects/", views.trainer_projects),
     path("trainer/projects/create/", views.trainer_create_project),
+    path("trainer/uploads/", views.trainer_create_upload),
+    path("trainer/uploads/<uuid:pk>/", views.trainer_upload_chunk),
+    path("trainer/uploads/<uuid:pk>/complete/", views.trainer_complete_upload),
     path("trainer/gallery/", views.trainer_gallery),
+    path("uploads/direct/", views.direct_upload_receive, name="direct-upload"),
     path("trainer/schools/", views.trainer_assigned_schools),
 
     # Swinfy — Schools
@@ -69,10 +76,25 @@ urlpatterns = [
     # Swinfy — Activity Log
     path("swinfy/activity-log/", views.swinfy_activity_log),
 
+    # Swinfy — Exports
+    path("swinfy/export/submissions/", views.swinfy_export_submissions),
+    path("swinfy/export/students/", views.swinfy_export_students),
+    path("swinfy/export/projects/", views.swinfy_export_projects),
+    path("swinfy/export/photos/", views.swinfy_export_photos),
+
+    # Swinfy — Learning gains
+    path("swinfy/learning-gains/", views.swinfy_learning_gains),
+
+    # Swinfy — Live queue stream (SSE)
+    path("swinfy/stream/", views.swinfy_stream),
+    path("swinfy/stream/ticket/", views.swinfy_stream_ticket),
+
     # UWH (Sponsor)
     path("uwh/summary/", views.uwh_summary),
     path("uwh/gallery/", views.uwh_gallery),
+    path("uwh/gallery/archive/", views.uwh_gallery_archive),
     path("uwh/projects/", views.uwh_projects),
     path("uwh/activity-feed/", views.uwh_activity_feed),
     path("uwh/district-progress/", views.uwh_district_progress),
+    path("uwh/learning-gains/", views.uwh_learning_gains),
 ]
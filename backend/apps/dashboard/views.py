@@ -1,9 +1,14 @@
-from django.db.models import Count, Sum, Q
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Q
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes, parser_classes
-from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from .models import (
@@ -18,8 +23,18 @@ from .models import (
     Student,
     StudentGroup,
     TrainerAssignment,
+    ChunkedUpload,
 )
-from .permissions import IsAdmin, IsTrainer, IsSponsor
+from . import stream
+from .conditional import versioned_etag
+from .idempotency import idempotent
+from .loaders import (
+    group_members_prefetch,
+    submission_projects_prefetch,
+    trainer_assignments_prefetch,
+)
+from .pagination import KeysetPagination, paginated_response
+from .permissions import IsAdmin, IsAdminOrSponsor, IsTrainer, IsSponsor
 from .serializers import (
     DistrictSerializer,
     SchoolListSerializer,
@@ -34,11 +49,33 @@ from .serializers import (
     UWHControlSerializer,
     StudentSerializer,
     StudentCreateSerializer,
+    StudentMarksSerializer,
     StudentGroupSerializer,
     StudentGroupCreateSerializer,
     TrainerProfileSerializer,
     TrainerAssignmentSerializer,
 )
+from .program_config import (
+    MAX_MARKS_PER_REQUEST,
+    MAX_MEDIA_SIZE_MB,
+    MAX_PHOTO_SIZE_MB,
+    MAX_PHOTOS_PER_SESSION,
+    MAX_ROSTER_SIZE_MB,
+    MIN_PHOTOS_PER_SESSION,
+)
+from .services import (
+    analytics,
+    archives,
+    chunked_uploads,
+    derivatives,
+    direct_upload,
+    exports,
+    kpi,
+    photo_uploads,
+    roster,
+    versions,
+)
+from .upload_limits import limit_uploads
 
 
 # ─────────────────────────────────────────
@@ -48,38 +85,35 @@ from .serializers import (
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@versioned_etag(
+    "schools", "districts", "submissions", "photos", "projects",
+    "students", "assignments",
+)
 def summary(request):
     """Summary endpoint — returns real data based on role."""
     role = request.user.role
 
     if role == "sponsor":
         # UWH: only sees verified data
-        verified = Submission.objects.filter(status="verified")
+        kpis = kpi.load("sponsor")
         return Response({
-            "total_schools": School.objects.count(),
-            "schools_completed": School.objects.filter(status="completed").count(),
-            "total_students": School.objects.aggregate(
-                t=Sum("total_students"))["t"] or 0,
-            "students_trained": verified.aggregate(
-                t=Sum("student_count"))["t"] or 0,
+            "total_schools": kpis.total_schools,
+            "schools_completed": kpis.schools_completed,
+            "total_students": kpis.total_students,
+            "students_trained": kpis.students_trained,
         })
 
     elif role == "admin":
         # Swinfy: sees everything
-        all_subs = Submission.objects.exclude(status="draft")
+        kpis = kpi.load("admin")
         return Response({
-            "total_schools": School.objects.count(),
-            "schools_completed": School.objects.filter(status="completed").count(),
-            "total_students": School.objects.aggregate(
-                t=Sum("total_students"))["t"] or 0,
-            "students_trained": all_subs.aggregate(
-                t=Sum("student_count"))["t"] or 0,
-            "pending_submissions": Submission.objects.filter(
-                status="submitted").count(),
-            "pending_photos": SessionPhoto.objects.filter(
-                approval_status="pending").count(),
-            "pending_projects": ProjectHighlight.objects.filter(
-                approval_status="pending").count(),
+            "total_schools": kpis.total_schools,
+            "schools_completed": kpis.schools_completed,
+            "total_students": kpis.total_students,
+            "students_trained": kpis.students_trained,
+            "pending_submissions": kpis.pending_submissions,
+            "pending_photos": kpis.pending_photos,
+            "pending_projects": kpis.pending_projects,
         })
 
     elif role == "trainer":
@@ -123,7 +157,7 @@ def district_list(request):
 @permission_classes([IsAuthenticated])
 def school_list(request):
     qs = School.objects.select_related("district").prefetch_related(
-        "trainer_assignments__trainer"
+        trainer_assignments_prefetch()
     )
     district = request.query_params.get("district")
     if district:
@@ -141,7 +175,9 @@ def school_list(request):
 @permission_classes([IsAuthenticated])
 def school_detail(request, pk):
     try:
-        school = School.objects.select_related("district").get(pk=pk)
+        school = School.objects.select_related("district").prefetch_related(
+            trainer_assignments_prefetch()
+        ).get(pk=pk)
     except School.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
     return Response(SchoolDetailSerializer(school).data)
@@ -163,7 +199,9 @@ def curriculum_list(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsTrainer])
 def trainer_submissions(request):
-    qs = Submission.objects.filter(trainer=request.user).annotate(
+    qs = Submission.objects.filter(trainer=request.user).select_related(
+        "school", "trainer"
+    ).annotate(
         photo_count=Count("photos"),
         project_count=Count("project_highlights"),
     )
@@ -172,49 +210,212 @@ def trainer_submissions(request):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
-@parser_classes([MultiPartParser, FormParser])
+@parser_classes([MultiPartParser, FormParser, JSONParser])
+# The session photos plus one attendance sheet
+@limit_uploads(max_files=MAX_PHOTOS_PER_SESSION + 1, fields={"attendance_file": MAX_PHOTO_SIZE_MB})
+@idempotent
 def trainer_submit(request):
+    if "uploads" in request.data and not request.FILES.getlist("photos"):
+        return _trainer_submit_direct(request)
+
+    # Everything is validated before any row or file is written
+    files = request.FILES.getlist("photos")
+    error = photo_uploads.validation_error([(f.name, f.size) for f in files])
+    if error:
+        return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
     serializer = SubmissionCreateSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    sub = serializer.save(
+
+    # Files go to storage first, outside any transaction: the inserts below
+    # update the shared KPI and version rows, which stay locked only for
+    # the inserts themselves rather than for the whole upload
+    try:
+        photos = photo_uploads.store_session_photos(files)
+    except photo_uploads.PhotoUploadError:
+        return Response(
+            {"detail": "Photo upload failed, please try again"},
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
+    sub = Submission(
+        **serializer.validated_data,
         trainer=request.user,
         status="submitted",
         submitted_at=timezone.now(),
     )
+    try:
+        if sub.attendance_file:
+            attendance = sub.attendance_file
+            attendance.save(attendance.name, attendance.file, save=False)
+        with transaction.atomic():
+            sub.save()
+            photo_uploads.insert_session_photos(sub, photos)
+    except Exception:
+        # Storage does not roll back with the rows
+        photo_uploads.discard(photos)
+        if sub.attendance_file and sub.attendance_file._committed:
+            sub.attendance_file.delete(save=False)
+        raise
+
+    # Handle project highlights (optional JSON)
+    # Projects are sent as separate requests, not inline
+
+    return Response(
+        SubmissionDetailSerializer(sub, context={"request": request}).data,
+        status=status.HTTP_201_CREATED,
+    )
+
 
-    # Handle photo uploads (min 3, max 5)
-    photos = request.FILES.getlist("photos")
-    if len(photos) < 3:
-        sub.delete()
+def _trainer_submit_direct(request):
+    """Phase one of a direct upload: a draft submission plus one upload slot per photo."""
+    uploads = request.data.get("uploads")
+    if not isinstance(uploads, list) or not all(isinstance(u, dict) for u in uploads):
         return Response(
-            {"detail": "Minimum 3 photos required"},
+            {"detail": "uploads must be a list of {name, content_type, size}"},
             status=status.HTTP_400_BAD_REQUEST,
         )
-    if len(photos) > 5:
-        sub.delete()
+    for u in uploads:
+        if not str(u.get("content_type", "")).startswith("image/"):
+            return Response(
+                {"detail": f"{u.get('name')}: only images can be uploaded"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not isinstance(u.get("size"), int):
+            return Response(
+                {"detail": f"{u.get('name')}: size is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    error = photo_uploads.validation_error(
+        [(str(u.get("name", "")), u["size"]) for u in uploads]
+    )
+    if error:
+        return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        # A draft left behind by an abandoned upload would block the retry
+        # on the (school, day_number) unique constraint
+        try:
+            abandoned = list(Submission.objects.select_for_update().filter(
+                trainer=request.user, status="draft",
+                school=request.data.get("school"), day_number=request.data.get("day_number"),
+            ))
+        except (ValueError, DjangoValidationError):
+            abandoned = []  # reported by the serializer below
+        for draft in abandoned:
+            direct_upload.delete_draft(draft)
+        serializer = SubmissionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sub = serializer.save(trainer=request.user, status="draft")
+        slots = [
+            direct_upload.presign(request, direct_upload.new_key(sub, u["name"]), u["content_type"])
+            for u in uploads
+        ]
+
+    return Response(
+        {
+            "submission": SubmissionDetailSerializer(sub, context={"request": request}).data,
+            "uploads": slots,
+            "expires_in": settings.DIRECT_UPLOAD_EXPIRES,
+        },
+        status=status.HTTP_201_CREATED,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
+def trainer_finalize_submission(request, pk):
+    """Phase two of a direct upload: attach the uploaded keys and submit."""
+    try:
+        sub = Submission.objects.select_related("school", "trainer").get(
+            pk=pk, trainer=request.user
+        )
+    except Submission.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    if sub.status != "draft":
         return Response(
-            {"detail": "Maximum 5 photos allowed"},
-            status=status.HTTP_400_BAD_REQUEST,
+            {"detail": "Submission is already finalized"},
+            status=status.HTTP_409_CONFLICT,
         )
 
-    for f in photos:
-        SessionPhoto.objects.create(submission=sub, image=f)
-
-    # Handle project highlights (optional JSON)
-    # Projects are sent as separate requests, not inline
+    keys = request.data.get("keys")
+    if (
+        not isinstance(keys, list)
+        or not all(isinstance(k, str) for k in keys)
+        or len(set(keys)) != len(keys)
+    ):
+        return Response(
+            {"detail": "keys must be a list of distinct upload keys"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not MIN_PHOTOS_PER_SESSION <= len(keys) <= MAX_PHOTOS_PER_SESSION:
+        return Response(
+            {"detail": f"Between {MIN_PHOTOS_PER_SESSION} and {MAX_PHOTOS_PER_SESSION} photos required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    prefix = direct_upload.key_prefix(sub)
+    foreign = [k for k in keys if not k.startswith(prefix) or ".." in k]
+    if foreign:
+        return Response(
+            {"detail": "Keys were not issued for this submission", "keys": foreign},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    missing = sorted(set(keys) - set(direct_upload.uploaded(keys)))
+    if missing:
+        return Response(
+            {"detail": "Some photos have not been uploaded", "keys": missing},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
+    with transaction.atomic():
+        # Two concurrent finalizes both passed the check above; only the
+        # one holding the row lock while it is still a draft attaches photos
+        sub = (
+            Submission.objects.select_related("school", "trainer")
+            .select_for_update(of=("self",))
+            .filter(pk=sub.pk, status="draft")
+            .first()
+        )
+        if sub is None:
+            return Response(
+                {"detail": "Submission is already finalized"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        for key in keys:
+            SessionPhoto.objects.create(submission=sub, image=key)
+        sub.status = "submitted"
+        sub.submitted_at = timezone.now()
+        sub.save(update_fields=["status", "submitted_at", "updated_at"])
+
+    sub = Submission.objects.select_related("school", "trainer").prefetch_related(
+        "photos", submission_projects_prefetch()
+    ).get(pk=sub.pk)
     return Response(
-        SubmissionDetailSerializer(sub, context={"request": request}).data,
-        status=status.HTTP_201_CREATED,
+        SubmissionDetailSerializer(sub, context={"request": request}).data
     )
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+@parser_classes([MultiPartParser])
+@limit_uploads(max_files=1, max_file_mb=MAX_PHOTO_SIZE_MB)
+def direct_upload_receive(request):
+    """Local stand-in for an S3 presigned POST (used when USE_S3 is off)."""
+    if settings.USE_S3:
+        # Slots point at the bucket; nothing may write through this endpoint
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    try:
+        direct_upload.store_local(request.data, request.FILES.get("file"))
+    except direct_upload.InvalidUpload as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_403_FORBIDDEN)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsTrainer])
 def trainer_submission_detail(request, pk):
     try:
-        sub = Submission.objects.select_related("school").prefetch_related(
-            "photos", "project_highlights"
+        sub = Submission.objects.select_related("school", "trainer").prefetch_related(
+            "photos", submission_projects_prefetch()
         ).get(pk=pk, trainer=request.user)
     except Submission.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
@@ -226,6 +427,8 @@ def trainer_submission_detail(request, pk):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
 @parser_classes([MultiPartParser, FormParser])
+@limit_uploads(max_files=2, fields={"media_file": MAX_MEDIA_SIZE_MB})
+@idempotent
 def trainer_add_project(request, submission_pk):
     try:
         sub = Submission.objects.get(pk=submission_pk, trainer=request.user)
@@ -235,10 +438,30 @@ def trainer_add_project(request, submission_pk):
     data = request.data.copy()
     serializer = ProjectHighlightSerializer(data=data)
     serializer.is_valid(raise_exception=True)
-    serializer.save(submission=sub)
+    error = _save_project(request, serializer, submission=sub)
+    if error:
+        return error
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+def _save_project(request, serializer, **kwargs):
+    """Save ``serializer``, attaching the chunked upload named by ``media_upload``.
+
+    Returns an error response, or None once the project is saved.
+    """
+    upload_id = request.data.get("media_upload")
+    if not upload_id:
+        serializer.save(**kwargs)
+        return None
+    with transaction.atomic():
+        try:
+            kwargs["media_file"] = chunked_uploads.claim(upload_id, request.user)
+        except chunked_uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save(**kwargs)
+    return None
+
+
 # ─────────────────────────────────────────
 #  TRAINER: Profile
 # ─────────────────────────────────────────
@@ -247,6 +470,7 @@ def trainer_add_project(request, submission_pk):
 @api_view(["GET", "PATCH"])
 @permission_classes([IsAuthenticated, IsTrainer])
 @parser_classes([MultiPartParser, FormParser])
+@limit_uploads(max_files=1)
 def trainer_profile(request):
     if request.method == "GET":
         serializer = TrainerProfileSerializer(
@@ -275,12 +499,16 @@ def trainer_students(request):
     school_id = request.query_params.get("school")
     if school_id:
         schools = schools.filter(pk=school_id)
-    students = Student.objects.filter(school__in=schools)
-    return Response(StudentSerializer(students, many=True).data)
+    students = Student.objects.filter(school__in=schools).select_related("school", "group")
+    return paginated_response(
+        request, students, ("created_at", "id"),
+        lambda rows: StudentSerializer(rows, many=True).data,
+    )
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
 def trainer_add_student(request):
     school_id = request.data.get("school")
     if school_id:
@@ -298,6 +526,51 @@ def trainer_add_student(request):
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsTrainer])
+@parser_classes([MultiPartParser, FormParser])
+@limit_uploads(max_files=1, max_file_mb=MAX_ROSTER_SIZE_MB)
+@idempotent
+def trainer_import_students(request):
+    """Add a whole roster from a CSV / XLSX ``file`` (see services/roster.py).
+
+    Invalid rows are all reported in one 400 and nothing is written; names
+    the school already has are skipped. ``dry_run=true`` only validates.
+    """
+    school_id = request.data.get("school")
+    if school_id:
+        school = _get_trainer_schools(request.user).filter(pk=school_id).first()
+    else:
+        school = _get_trainer_school(request.user)
+    if not school:
+        return Response(
+            {"detail": "No school assigned to this trainer"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response(
+            {"file": ["A CSV or XLSX file is required."]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true")
+    try:
+        result = roster.import_students(
+            school, request.user, roster.read_rows(upload, upload.name), dry_run=dry_run
+        )
+    except roster.RosterError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if result["errors"]:
+        return Response(
+            {"detail": "Some rows are invalid; no students were added.", **result},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    code = status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED
+    return Response({**result, "dry_run": dry_run}, status=code)
+
+
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated, IsTrainer])
 def trainer_update_student(request, pk):
@@ -315,6 +588,84 @@ def trainer_update_student(request, pk):
     return Response(StudentSerializer(student).data)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsTrainer])
+@parser_classes([JSONParser])
+@idempotent
+def trainer_bulk_marks(request):
+    """Set baseline / endline marks for many students in one request.
+
+    Body: ``{"<student id>": {"baseline": 6, "endline": 9}, ...}``; either
+    mark may be omitted, null clears it. All or nothing: an invalid entry or
+    a student outside the trainer's schools writes nothing. Returns only
+    what changed, as ``{"<id>": {"endline": [old, new]}}``.
+    """
+    if not isinstance(request.data, dict) or not request.data:
+        return Response(
+            {"detail": "Send an object of {student_id: {baseline, endline}}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(request.data) > MAX_MARKS_PER_REQUEST:
+        return Response(
+            {"detail": f"At most {MAX_MARKS_PER_REQUEST} students per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    entries = serializers.DictField(child=StudentMarksSerializer()).run_validation(
+        request.data
+    )
+
+    ids = {}
+    for key in entries:
+        try:
+            ids[key] = serializers.UUIDField().to_internal_value(key)
+        except serializers.ValidationError:
+            return Response(
+                {key: ["Not a valid student id."]}, status=status.HTTP_400_BAD_REQUEST
+            )
+    with transaction.atomic():
+        # One ownership check for the whole batch. The rows stay locked until
+        # the UPDATE, so a concurrent batch can't be overwritten with stale
+        # marks; pk order keeps two batches from deadlocking.
+        students = (
+            Student.objects.filter(
+                school__in=_get_trainer_schools(request.user), pk__in=ids.values()
+            )
+            .only("id", "baseline_marks", "endline_marks")
+            .select_for_update(of=("self",))
+            .order_by("pk")
+            .in_bulk()
+        )
+        unknown = [key for key, pk in ids.items() if pk not in students]
+        if unknown:
+            return Response(
+                {"detail": "Students not found in your schools.", "unknown": unknown},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        now = timezone.now()
+        changed, diff = [], {}
+        for key, marks in entries.items():
+            student = students[ids[key]]
+            changes = {}
+            for field, new in marks.items():
+                old = getattr(student, field)
+                if old != new:
+                    changes[field.removesuffix("_marks")] = [old, new]
+                    setattr(student, field, new)
+            if changes:
+                student.updated_at = now
+                changed.append(student)
+                diff[str(student.pk)] = changes
+
+        if changed:
+            Student.objects.bulk_update(
+                changed, ["baseline_marks", "endline_marks", "updated_at"], batch_size=500
+            )
+            # bulk_update skips post_save, so bump the ETag version by hand
+            versions.bump("students")
+    return Response({"updated": len(changed), "changes": diff})
+
+
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated, IsTrainer])
 def trainer_delete_student(request, pk):
@@ -350,12 +701,15 @@ def trainer_groups(request):
         schools = schools.filter(pk=school_id)
     if not schools.exists():
         return Response([])
-    groups = StudentGroup.objects.filter(school__in=schools).prefetch_related("members")
+    groups = StudentGroup.objects.filter(school__in=schools).prefetch_related(
+        group_members_prefetch()
+    )
     return Response(StudentGroupSerializer(groups, many=True).data)
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
 def trainer_create_group(request):
     school_id = request.data.get("school")
     if school_id:
@@ -381,7 +735,9 @@ def trainer_create_group(request):
 def trainer_update_group(request, pk):
     school = _get_trainer_school(request.user)
     try:
-        group = StudentGroup.objects.get(pk=pk, school=school)
+        group = StudentGroup.objects.prefetch_related(group_members_prefetch()).get(
+            pk=pk, school=school
+        )
     except StudentGroup.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
     serializer = StudentGroupCreateSerializer(group, data=request.data, partial=True)
@@ -400,12 +756,14 @@ def trainer_delete_group(request, pk):
         return Response(status=status.HTTP_404_NOT_FOUND)
     # Unassign students before deleting
     group.members.update(group=None)
+    versions.bump("students")
     group.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
 def trainer_assign_students_to_group(request, pk):
     school = _get_trainer_school(request.user)
     try:
@@ -417,11 +775,13 @@ def trainer_assign_students_to_group(request, pk):
     updated = Student.objects.filter(
         id__in=student_ids, school=school
     ).update(group=group)
+    versions.bump("students")
     return Response({"assigned": updated})
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
 def trainer_remove_students_from_group(request, pk):
     school = _get_trainer_school(request.user)
     try:
@@ -433,6 +793,7 @@ def trainer_remove_students_from_group(request, pk):
     updated = Student.objects.filter(
         id__in=student_ids, group=group
     ).update(group=None)
+    versions.bump("students")
     return Response({"removed": updated})
 
 
@@ -444,6 +805,8 @@ def trainer_remove_students_from_group(request, pk):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsTrainer])
 @parser_classes([MultiPartParser, FormParser])
+@limit_uploads(max_files=2, fields={"media_file": MAX_MEDIA_SIZE_MB})
+@idempotent
 def trainer_create_project(request):
     """Create a project independent of any submission."""
     school_id = request.data.get("school")
@@ -460,10 +823,96 @@ def trainer_create_project(request):
     data = request.data.copy()
     serializer = ProjectHighlightSerializer(data=data)
     serializer.is_valid(raise_exception=True)
-    serializer.save(school=school, trainer=request.user)
+    error = _save_project(request, serializer, school=school, trainer=request.user)
+    if error:
+        return error
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+# ─────────────────────────────────────────
+#  TRAINER: Chunked media uploads
+# ─────────────────────────────────────────
+
+
+def _upload_state(upload):
+    return {
+        "id": upload.pk,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.offset,
+        "status": upload.status,
+        "chunk_size": chunked_uploads.MAX_CHUNK_BYTES,
+    }
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
+def trainer_create_upload(request):
+    """Start a resumable upload of a project video / music file."""
+    size = request.data.get("size")
+    if not isinstance(size, int):
+        return Response(
+            {"detail": "size (bytes) is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        upload = chunked_uploads.create(request.user, str(request.data.get("filename", "")), size)
+    except chunked_uploads.UploadError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(_upload_state(upload), status=status.HTTP_201_CREATED)
+
+
+@api_view(["GET", "PUT"])
+@permission_classes([IsAuthenticated, IsTrainer])
+def trainer_upload_chunk(request, pk):
+    """GET: the offset to resume from. PUT: raw chunk bytes at Upload-Offset."""
+    if request.method == "GET":
+        try:
+            upload = ChunkedUpload.objects.get(pk=pk, user=request.user)
+        except ChunkedUpload.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(_upload_state(upload))
+
+    try:
+        offset = int(request.headers["Upload-Offset"])
+        length = int(request.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return Response(
+            {"detail": "Upload-Offset and Content-Length headers are required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        # Read the body as a stream; request.data would buffer all of it
+        new_offset = chunked_uploads.write_chunk(pk, request.user, offset, request.stream, length)
+    except ChunkedUpload.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    except chunked_uploads.OffsetMismatch as exc:
+        return Response(
+            {"detail": str(exc), "offset": exc.offset},
+            status=status.HTTP_409_CONFLICT,
+        )
+    except chunked_uploads.UploadError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"offset": new_offset})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsTrainer])
+@idempotent
+def trainer_complete_upload(request, pk):
+    try:
+        upload = chunked_uploads.complete(pk, request.user)
+    except ChunkedUpload.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    except chunked_uploads.OffsetMismatch as exc:
+        return Response(
+            {"detail": "Upload is incomplete", "offset": exc.offset},
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response(_upload_state(upload))
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsTrainer])
 def trainer_projects(request):
@@ -494,21 +943,26 @@ def trainer_gallery(request):
     if school:
         photos = photos.filter(submission__school_id=school)
 
-    data = []
-    for p in photos:
-        data.append({
-            "id": str(p.id),
-            "image_url": request.build_absolute_uri(p.image.url) if p.image else None,
-            "caption": p.caption,
-            "approval_status": p.approval_status,
-            "is_featured": p.is_featured,
-            "rejection_reason": p.rejection_reason,
-            "uploaded_at": p.uploaded_at.isoformat(),
-            "school_name": p.submission.school.name,
-            "day_number": p.submission.day_number,
-        })
-
-    return Response(data)
+    def serialize(rows):
+        return [
+            {
+                "id": str(p.id),
+                "image_url": request.build_absolute_uri(p.image.url) if p.image else None,
+                "thumbnail_url": request.build_absolute_uri(p.thumbnail.url) if p.thumbnail else None,
+                "medium_url": request.build_absolute_uri(p.image_medium.url) if p.image_medium else None,
+                "webp_url": request.build_absolute_uri(p.image_webp.url) if p.image_webp else None,
+                "caption": p.caption,
+                "approval_status": p.approval_status,
+                "is_featured": p.is_featured,
+                "rejection_reason": p.rejection_reason,
+                "uploaded_at": p.uploaded_at.isoformat(),
+                "school_name": p.submission.school.name,
+                "day_number": p.submission.day_number,
+            }
+            for p in rows
+        ]
+
+    return paginated_response(request, photos, ("-uploaded_at", "-id"), serialize)
 
 
 # ─────────────────────────────────────────
@@ -521,7 +975,7 @@ def trainer_gallery(request):
 def trainer_assigned_schools(request):
     """Returns only schools assigned to the current trainer."""
     schools = _get_trainer_schools(request.user).select_related("district").prefetch_related(
-        "trainer_assignments__trainer"
+        trainer_assignments_prefetch()
     )
     return Response(SchoolListSerializer(schools, many=True).data)
 
@@ -595,7 +1049,9 @@ def swinfy_trainers(request):
 def swinfy_update_school(request, pk):
     """Admin: update school details (POC, principal, status, etc.)."""
     try:
-        school = School.objects.select_related("district").get(pk=pk)
+        school = School.objects.select_related("district").prefetch_related(
+            trainer_assignments_prefetch()
+        ).get(pk=pk)
     except School.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -682,32 +1138,44 @@ def swinfy_unassign_trainer(request, pk):
 # ─────────────────────────────────────────
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated, IsAdmin])
-def swinfy_submissions(request):
-    """All submissions for review. Filter by ?status=, ?trainer=, ?school=, ?district=, ?day="""
-    qs = Submission.objects.exclude(status="draft").select_related(
-        "school", "trainer"
-    ).annotate(
-        photo_count=Count("photos"),
-        project_count=Count("project_highlights"),
-    )
-    status_filter = request.query_params.get("status")
+def _filter_submissions(qs, params):
+    """?status=, ?trainer=, ?school=, ?district=, ?day= (shared with the export)."""
+    status_filter = params.get("status")
     if status_filter:
         qs = qs.filter(status=status_filter)
-    trainer = request.query_params.get("trainer")
+    trainer = params.get("trainer")
     if trainer:
         qs = qs.filter(trainer_id=trainer)
-    school = request.query_params.get("school")
+    school = params.get("school")
     if school:
         qs = qs.filter(school_id=school)
-    district = request.query_params.get("district")
+    district = params.get("district")
     if district:
         qs = qs.filter(school__district_id=district)
-    day = request.query_params.get("day")
+    day = params.get("day")
     if day:
         qs = qs.filter(day_number=day)
-    return Response(SubmissionListSerializer(qs, many=True).data)
+    return qs
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+@versioned_etag("submissions", "photos", "projects", "schools", "users")
+def swinfy_submissions(request):
+    """All submissions for review. Filter by ?status=, ?trainer=, ?school=, ?district=, ?day="""
+    qs = _filter_submissions(
+        Submission.objects.exclude(status="draft").select_related(
+            "school", "trainer"
+        ).annotate(
+            photo_count=Count("photos"),
+            project_count=Count("project_highlights"),
+        ),
+        request.query_params,
+    )
+    return paginated_response(
+        request, qs, ("-created_at", "-id"),
+        lambda rows: SubmissionListSerializer(rows, many=True).data,
+    )
 
 
 @api_view(["GET"])
@@ -715,7 +1183,7 @@ def swinfy_submissions(request):
 def swinfy_submission_detail(request, pk):
     try:
         sub = Submission.objects.select_related("school", "trainer").prefetch_related(
-            "photos", "project_highlights"
+            "photos", submission_projects_prefetch()
         ).get(pk=pk)
     except Submission.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
@@ -781,34 +1249,79 @@ def swinfy_reject_submission(request, pk):
 
 
 # ─────────────────────────────────────────
-#  SWINFY (Admin): Photo Actions
+#  SWINFY (Admin): Live queue stream (SSE)
 # ─────────────────────────────────────────
 
 
-@api_view(["GET"])
+@api_view(["POST"])
 @permission_classes([IsAuthenticated, IsAdmin])
-def swinfy_pending_photos(request):
-    """Photos for review. Filter by ?status= (default pending, 'all'), ?school=, ?trainer=, ?district=, ?day="""
-    status_filter = request.query_params.get("status", "pending")
-    qs = SessionPhoto.objects.select_related(
-        "submission__school", "submission__trainer"
+def swinfy_stream_ticket(request):
+    """Short-lived ?ticket= for opening swinfy/stream/ from EventSource."""
+    return Response({
+        "ticket": stream.issue_ticket(request.user),
+        "expires_in": settings.STREAM_TICKET_EXPIRES,
+    })
+
+
+async def swinfy_stream(request):
+    """Server-Sent Events feed of queue counts and changes. Auth: Bearer header or ?ticket="""
+    user = await sync_to_async(stream.authenticate)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    if user.role != "admin":
+        return JsonResponse(
+            {"detail": "You do not have permission to perform this action."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    return StreamingHttpResponse(
+        stream.event_stream(),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+
+
+# ─────────────────────────────────────────
+#  SWINFY (Admin): Photo Actions
+# ─────────────────────────────────────────
+
+
+def _filter_photos(qs, params, default_status="pending"):
+    """?status= ('all' for every status), ?school=, ?trainer=, ?district=, ?day="""
+    status_filter = params.get("status", default_status)
     if status_filter != "all":
         qs = qs.filter(approval_status=status_filter)
-    school = request.query_params.get("school")
+    school = params.get("school")
     if school:
         qs = qs.filter(submission__school_id=school)
-    trainer = request.query_params.get("trainer")
+    trainer = params.get("trainer")
     if trainer:
         qs = qs.filter(submission__trainer_id=trainer)
-    district = request.query_params.get("district")
+    district = params.get("district")
     if district:
         qs = qs.filter(submission__school__district_id=district)
-    day = request.query_params.get("day")
+    day = params.get("day")
     if day:
         qs = qs.filter(submission__day_number=day)
-    return Response(
-        SessionPhotoSerializer(qs, many=True, context={"request": request}).data
+    return qs
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+@versioned_etag("photos", "submissions", "schools", "users")
+def swinfy_pending_photos(request):
+    """Photos for review. Filter by ?status= (default pending, 'all'), ?school=, ?trainer=, ?district=, ?day="""
+    qs = _filter_photos(
+        SessionPhoto.objects.select_related("submission__school", "submission__trainer"),
+        request.query_params,
+    )
+    return paginated_response(
+        request, qs, ("uploaded_at", "id"),
+        lambda rows: SessionPhotoSerializer(
+            rows, many=True, context={"request": request}
+        ).data,
     )
 
 
@@ -880,7 +1393,8 @@ def swinfy_delete_photo(request, pk):
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     school_name = photo.submission.school.name
-    # Delete the actual file
+    # Delete the actual file and its derivatives
+    derivatives.delete_files(photo)
     if photo.image:
         photo.image.delete(save=False)
     photo.delete()
@@ -892,11 +1406,16 @@ def swinfy_delete_photo(request, pk):
 def swinfy_bulk_approve_photos(request):
     ids = request.data.get("photo_ids", [])
     now = timezone.now()
-    updated = SessionPhoto.objects.filter(id__in=ids).update(
+    photos = SessionPhoto.objects.filter(id__in=ids)
+    # .update() skips signals — keep the KPI snapshot in step by hand
+    was_pending = photos.filter(approval_status="pending").count()
+    updated = photos.update(
         approval_status="approved",
         approved_by=request.user,
         approved_at=now,
     )
+    kpi.adjust(pending_photos=-was_pending)
+    versions.bump("photos")
     return Response({"approved": updated})
 
 
@@ -905,10 +1424,14 @@ def swinfy_bulk_approve_photos(request):
 def swinfy_bulk_reject_photos(request):
     ids = request.data.get("photo_ids", [])
     reason = request.data.get("reason", "")
-    updated = SessionPhoto.objects.filter(id__in=ids).update(
+    photos = SessionPhoto.objects.filter(id__in=ids)
+    was_pending = photos.filter(approval_status="pending").count()
+    updated = photos.update(
         approval_status="rejected",
         rejection_reason=reason,
     )
+    kpi.adjust(pending_photos=-was_pending)
+    versions.bump("photos")
     return Response({"rejected": updated})
 
 
@@ -917,28 +1440,45 @@ def swinfy_bulk_reject_photos(request):
 # ─────────────────────────────────────────
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated, IsAdmin])
-def swinfy_pending_projects(request):
-    """Projects for review. Filter by ?status= (default pending, 'all'), ?school=, ?trainer=, ?district="""
-    status_filter = request.query_params.get("status", "pending")
-    qs = ProjectHighlight.objects.select_related(
-        "submission__school", "submission__trainer", "school", "trainer", "group"
-    )
+def _filter_projects(qs, params, default_status="pending"):
+    """?status= ('all' for every status), ?school=, ?trainer=, ?district=, ?day="""
+    status_filter = params.get("status", default_status)
     if status_filter != "all":
         qs = qs.filter(approval_status=status_filter)
-    school = request.query_params.get("school")
+    school = params.get("school")
     if school:
         qs = qs.filter(Q(school_id=school) | Q(submission__school_id=school))
-    trainer = request.query_params.get("trainer")
+    trainer = params.get("trainer")
     if trainer:
         qs = qs.filter(Q(trainer_id=trainer) | Q(submission__trainer_id=trainer))
-    district = request.query_params.get("district")
+    district = params.get("district")
     if district:
         qs = qs.filter(
             Q(school__district_id=district) | Q(submission__school__district_id=district)
         )
-    return Response(ProjectHighlightSerializer(qs, many=True, context={"request": request}).data)
+    day = params.get("day")
+    if day:
+        qs = qs.filter(submission__day_number=day)
+    return qs
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+@versioned_etag("projects", "submissions", "schools", "groups", "students", "users")
+def swinfy_pending_projects(request):
+    """Projects for review. Filter by ?status= (default pending, 'all'), ?school=, ?trainer=, ?district=, ?day="""
+    qs = _filter_projects(
+        ProjectHighlight.objects.select_related(
+            "submission__school", "submission__trainer", "school", "trainer", "group"
+        ),
+        request.query_params,
+    )
+    return paginated_response(
+        request, qs, ("-created_at", "-id"),
+        lambda rows: ProjectHighlightSerializer(
+            rows, many=True, context={"request": request}
+        ).data,
+    )
 
 
 @api_view(["PATCH"])
@@ -1054,11 +1594,115 @@ def swinfy_uwh_financial(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsAdmin])
+@versioned_etag("activity", "users")
 def swinfy_activity_log(request):
     qs = ActivityLog.objects.select_related("user").all()[:50]
     return Response(ActivityLogSerializer(qs, many=True).data)
 
 
+# ─────────────────────────────────────────
+#  SWINFY (Admin): Exports
+# ─────────────────────────────────────────
+
+
+def _filter_students(qs, params):
+    """?school=, ?district=, ?group=, ?trainer= (schools the trainer is assigned to)"""
+    school = params.get("school")
+    if school:
+        qs = qs.filter(school_id=school)
+    district = params.get("district")
+    if district:
+        qs = qs.filter(school__district_id=district)
+    group = params.get("group")
+    if group:
+        qs = qs.filter(group_id=group)
+    trainer = params.get("trainer")
+    if trainer:
+        qs = qs.filter(
+            school__in=TrainerAssignment.objects.filter(trainer_id=trainer).values("school")
+        )
+    return qs
+
+
+def _export(request, dataset, qs):
+    """Stream ``qs`` as CSV (default) or ``?file_format=xlsx``."""
+    try:
+        return exports.response(
+            request, dataset, qs, request.query_params.get("file_format", "csv")
+        )
+    except exports.ExportError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def swinfy_export_submissions(request):
+    """Submissions as a file. Same filters as swinfy/submissions/."""
+    qs = _filter_submissions(Submission.objects.exclude(status="draft"), request.query_params)
+    return _export(request, "submissions", qs)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def swinfy_export_students(request):
+    """Students as a file. Filter by ?school=, ?district=, ?group=, ?trainer="""
+    qs = _filter_students(Student.objects.all(), request.query_params)
+    return _export(request, "students", qs)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def swinfy_export_projects(request):
+    """Projects as a file. Same filters as swinfy/projects/pending/, every status by default."""
+    qs = _filter_projects(ProjectHighlight.objects.all(), request.query_params, "all")
+    return _export(request, "projects", qs)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def swinfy_export_photos(request):
+    """Photos as a file. Same filters as swinfy/photos/pending/, every status by default."""
+    qs = _filter_photos(SessionPhoto.objects.all(), request.query_params, "all")
+    return _export(request, "photos", qs)
+
+
+# ─────────────────────────────────────────
+#  SWINFY (Admin): Learning Gains
+# ─────────────────────────────────────────
+
+
+def _learning_gains(request, dimensions):
+    """analytics.load() limited to ``dimensions`` and to ``?by=`` if given."""
+    by = request.query_params.get("by")
+    if by:
+        requested = [name.strip() for name in by.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in dimensions]
+        if unknown:
+            return Response(
+                {"by": [f"Choose from: {', '.join(dimensions)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        dimensions = requested
+    report = analytics.load()
+    return Response({
+        "computed_at": report["computed_at"],
+        "bins": report["bins"],
+        "overall": report["overall"],
+        **{name: report[name] for name in dimensions},
+    })
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+@versioned_etag(*analytics.RESOURCES)
+def swinfy_learning_gains(request):
+    """Baseline → endline gains overall and per district, school, trainer and group.
+
+    ``?by=schools,trainers`` returns only those breakdowns.
+    """
+    return _learning_gains(request, analytics.DIMENSIONS)
+
+
 # ─────────────────────────────────────────
 #  UWH (Sponsor): Dashboard
 # ─────────────────────────────────────────
@@ -1066,8 +1710,9 @@ def swinfy_activity_log(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsSponsor])
+@versioned_etag("schools", "districts", "submissions", "uwh_control")
 def uwh_summary(request):
-    verified = Submission.objects.filter(status="verified")
+    kpis = kpi.load("sponsor")
     ctrl = UWHControl.load()
     return Response({
         "status_banner": {
@@ -1076,78 +1721,109 @@ def uwh_summary(request):
             "color": ctrl.status_color,
         },
         "kpis": {
-            "total_schools": School.objects.count(),
-            "schools_completed": School.objects.filter(status="completed").count(),
-            "schools_in_progress": School.objects.filter(status="in_progress").count(),
-            "total_students_trained": verified.aggregate(
-                t=Sum("student_count"))["t"] or 0,
-            "total_sessions": verified.count(),
-            "total_districts": District.objects.count(),
+            "total_schools": kpis.total_schools,
+            "schools_completed": kpis.schools_completed,
+            "schools_in_progress": kpis.schools_in_progress,
+            "total_students_trained": kpis.students_trained,
+            "total_sessions": kpis.total_sessions,
+            "total_districts": kpis.total_districts,
         },
         "financial_summary": ctrl.financial_summary,
     })
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated, IsSponsor])
-def uwh_gallery(request):
-    """Only approved photos from verified submissions. Filter by ?district=, ?school="""
+def _uwh_photos(params):
+    """Photos UWH may see: approved, from verified submissions. ?district=, ?school="""
     photos = SessionPhoto.objects.filter(
         submission__status="verified",
         approval_status="approved",
-    ).select_related("submission__school")
-
-    district = request.query_params.get("district")
+    )
+    district = params.get("district")
     if district:
         photos = photos.filter(submission__school__district_id=district)
-    school = request.query_params.get("school")
+    school = params.get("school")
     if school:
         photos = photos.filter(submission__school_id=school)
+    return photos
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsSponsor])
+@versioned_etag("photos", "submissions", "schools")
+def uwh_gallery(request):
+    """Only approved photos from verified submissions. Filter by ?district=, ?school="""
+    photos = _uwh_photos(request.query_params).select_related("submission__school")
 
     featured = photos.filter(is_featured=True)
     regular = photos.filter(is_featured=False)
 
+    paginator = KeysetPagination(("uploaded_at", "id"))
+    page = paginator.paginate_queryset(regular, request)
+    if page is None:
+        return Response({
+            "featured": SessionPhotoSerializer(
+                featured, many=True, context={"request": request}
+            ).data,
+            "photos": SessionPhotoSerializer(
+                regular, many=True, context={"request": request}
+            ).data,
+        })
+
+    # Paginated: featured photos come with the first page only, i.e. the
+    # page with nothing before it (however the client got there)
+    is_first_page = paginator.get_previous_link() is None
     return Response({
         "featured": SessionPhotoSerializer(
-            featured, many=True, context={"request": request}
+            featured if is_first_page else [], many=True, context={"request": request}
         ).data,
         "photos": SessionPhotoSerializer(
-            regular, many=True, context={"request": request}
+            page, many=True, context={"request": request}
         ).data,
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
     })
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated, IsSponsor])
-def uwh_projects(request):
-    """Approved/featured projects. Includes both submission-linked and standalone projects."""
+def _uwh_projects(params):
+    """Projects UWH may see: approved / featured, from verified submissions or standalone."""
     projects = ProjectHighlight.objects.filter(
         approval_status__in=["approved", "featured"],
     ).filter(
         # Either from verified submissions, or standalone (no submission)
         Q(submission__status="verified") | Q(submission__isnull=True)
-    ).select_related("submission__school", "school", "group")
-
-    district = request.query_params.get("district")
+    )
+    district = params.get("district")
     if district:
         projects = projects.filter(
             Q(school__district_id=district) | Q(submission__school__district_id=district)
         )
-    school = request.query_params.get("school")
+    school = params.get("school")
     if school:
         projects = projects.filter(
             Q(school_id=school) | Q(submission__school_id=school)
         )
+    return projects
 
-    return Response(
-        ProjectHighlightSerializer(
-            projects, many=True, context={"request": request}
-        ).data
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsSponsor])
+@versioned_etag("projects", "submissions", "schools", "groups", "students")
+def uwh_projects(request):
+    """Approved/featured projects. Includes both submission-linked and standalone projects."""
+    projects = _uwh_projects(request.query_params).select_related(
+        "submission__school", "school", "group"
+    )
+    return paginated_response(
+        request, projects, ("-created_at", "-id"),
+        lambda rows: ProjectHighlightSerializer(
+            rows, many=True, context={"request": request}
+        ).data,
     )
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsSponsor])
+@versioned_etag("activity", "photos", "submissions", "users")
 def uwh_activity_feed(request):
     activities = list(
         ActivityLog.objects.filter(is_uwh_visible=True)
@@ -1165,7 +1841,7 @@ def uwh_activity_feed(request):
     for p in photos_qs:
         sid = str(p.submission_id)
         if sid not in sub_photos:
-            sub_photos[sid] = request.build_absolute_uri(p.image.url)
+            sub_photos[sid] = request.build_absolute_uri((p.thumbnail or p.image).url)
     photo_urls = list(sub_photos.values())
 
     for i, item in enumerate(data):
@@ -1182,6 +1858,7 @@ def uwh_activity_feed(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsSponsor])
+@versioned_etag("districts", "schools")
 def uwh_district_progress(request):
     districts = District.objects.annotate(
         total_schools=Count("schools"),
@@ -1198,3 +1875,25 @@ def uwh_district_progress(request):
         }
         for d in districts
     ])
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsSponsor])
+@versioned_etag(*analytics.RESOURCES)
+def uwh_learning_gains(request):
+    """Baseline → endline gains overall, per district and per school (``?by=``)."""
+    return _learning_gains(request, ("districts", "schools"))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminOrSponsor])
+def uwh_gallery_archive(request):
+    """ZIP of every approved photo and project image. Same ?district=, ?school= as the gallery."""
+    photos = _uwh_photos(request.query_params)
+    projects = _uwh_projects(request.query_params)
+    if archives.is_empty(photos, projects):
+        return Response(
+            {"detail": "No approved photos match these filters."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return archives.response(request, photos, projects)
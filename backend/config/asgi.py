@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve with an ASGI server so long-lived streams (swinfy/stream/) don't each
+hold a worker thread:
+
+    uvicorn config.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +19,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Tasks (emails, image derivatives) only run under `manage.py run_worker`
+from apps.dashboard.services.tasks import check_workers_at_startup  # noqa: E402
+
+check_workers_at_startup()
@@ -1,7 +1,9 @@
 from pathlib import Path
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 import os
+import tempfile
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -91,6 +93,8 @@ CORS_ALLOWED_ORIGINS = [
     ).split(",")
     if o.strip()
 ]
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key", "upload-offset")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed", "Content-Disposition"]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -119,6 +123,40 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "support@ailiteracy.co.in")
 EMAIL_REPLY_TO = os.getenv("EMAIL_REPLY_TO", "support@ailiteracy.co.in")
+# Outbox rows claimed per batch, and the cap on messages sent per second
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+EMAIL_SEND_RATE = float(os.getenv("EMAIL_SEND_RATE", 10))
+
+# --- Background task queue (manage.py run_worker) ---
+# Production needs `python manage.py run_worker` running beside the web
+# server; nothing starts it. True runs tasks in-process after commit
+# instead, which is the default under DEBUG so runserver works on its own.
+TASK_QUEUE_EAGER = os.getenv("TASK_QUEUE_EAGER", str(DEBUG)) == "True"
+
+# --- Direct-to-storage photo uploads ---
+# Lifetime in seconds of a presigned upload slot
+DIRECT_UPLOAD_EXPIRES = int(os.getenv("DIRECT_UPLOAD_EXPIRES", 900))
+# Threads shared by multipart submits for concurrent storage writes
+STORAGE_WRITE_WORKERS = int(os.getenv("STORAGE_WRITE_WORKERS", 4))
+# Threads shared by ZIP downloads for reading files ahead of the writer
+STORAGE_READ_WORKERS = int(os.getenv("STORAGE_READ_WORKERS", 4))
+
+# --- Swinfy live queue stream (swinfy/stream/) ---
+# Lifetime in seconds of the ?ticket= that EventSource connects with
+STREAM_TICKET_EXPIRES = int(os.getenv("STREAM_TICKET_EXPIRES", 60))
+# Seconds between version checks; each worker process with an open stream
+# runs one primary-key query per tick, whatever the number of clients
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", 1))
+
+# --- Resumable chunked uploads (project video / music) ---
+# Partial files are assembled here before moving to media storage
+CHUNKED_UPLOAD_DIR = os.getenv(
+    "CHUNKED_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "dashboard-chunked-uploads")
+)
+
+# --- Idempotency-Key on trainer writes ---
+# Seconds a successful response is kept for replay
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 24 * 60 * 60))
 
 # --- Media / S3 Storage ---
 USE_S3 = os.getenv("USE_S3", "False") == "True"
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Tasks (emails, image derivatives) only run under `manage.py run_worker`
+from apps.dashboard.services.tasks import check_workers_at_startup  # noqa: E402
+
+check_workers_at_startup()
@@ -8,6 +8,7 @@ import axios from "axios";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
+import { useOtpDelivery } from "@/hooks/use-otp-delivery";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL;
 
@@ -25,9 +26,19 @@ export default function ForgotPasswordPage() {
   const [success, setSuccess] = useState("");
   const [loading, setLoading] = useState(false);
   const [cooldown, setCooldown] = useState(0);
+  const [deliveryId, setDeliveryId] = useState<string | null>(null);
+  const { data: deliveryStatus } = useOtpDelivery(deliveryId);
 
   const otpRefs = useRef<(HTMLInputElement | null)[]>([]);
 
+  // The code is emailed in the background; allow an immediate resend if it bounced
+  useEffect(() => {
+    if (deliveryStatus !== "failed") return;
+    setSuccess("");
+    setError("We couldn't deliver the code to your email. Please resend it.");
+    setCooldown(0);
+  }, [deliveryStatus]);
+
   // Cooldown timer for resend
   useEffect(() => {
     if (cooldown <= 0) return;
@@ -43,7 +54,10 @@ export default function ForgotPasswordPage() {
     setLoading(true);
 
     try {
-      await axios.post(`${API_URL}/api/auth/request-otp/`, { email });
+      const res = await axios.post(`${API_URL}/api/auth/request-otp/`, {
+        email,
+      });
+      setDeliveryId(res.data.delivery_id);
       setSuccess("Verification code sent to your email.");
       setStep("otp");
       setCooldown(60);
@@ -147,7 +161,10 @@ export default function ForgotPasswordPage() {
     setLoading(true);
 
     try {
-      await axios.post(`${API_URL}/api/auth/request-otp/`, { email });
+      const res = await axios.post(`${API_URL}/api/auth/request-otp/`, {
+        email,
+      });
+      setDeliveryId(res.data.delivery_id);
       setSuccess("New code sent to your email.");
       setCooldown(60);
       setOtp(["", "", "", "", "", ""]);
@@ -9,6 +9,7 @@ import axios from "axios";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
+import { useOtpDelivery } from "@/hooks/use-otp-delivery";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL;
 
@@ -38,6 +39,8 @@ export default function RegisterPage() {
   const [otp, setOtp] = useState(["", "", "", "", "", ""]);
   const otpRefs = useRef<(HTMLInputElement | null)[]>([]);
   const [cooldown, setCooldown] = useState(0);
+  const [deliveryId, setDeliveryId] = useState<string | null>(null);
+  const { data: deliveryStatus } = useOtpDelivery(deliveryId);
 
   // UI state
   const [error, setError] = useState("");
@@ -59,6 +62,14 @@ export default function RegisterPage() {
       .catch(() => {});
   }, []);
 
+  // The code is emailed in the background; allow an immediate resend if it bounced
+  useEffect(() => {
+    if (deliveryStatus !== "failed") return;
+    setSuccess("");
+    setError("We couldn't deliver the code to your email. Please resend it.");
+    setCooldown(0);
+  }, [deliveryStatus]);
+
   // Cooldown timer
   useEffect(() => {
     if (cooldown <= 0) return;
@@ -85,13 +96,14 @@ export default function RegisterPage() {
     setLoading(true);
 
     try {
-      await axios.post(`${API_URL}/api/auth/trainer-register/`, {
+      const res = await axios.post(`${API_URL}/api/auth/trainer-register/`, {
         email,
         first_name: firstName,
         last_name: lastName,
         password,
         school: selectedSchool,
       });
+      setDeliveryId(res.data.delivery_id);
       setSuccess("Verification code sent to your email.");
       setStep("otp");
       setCooldown(60);
@@ -214,9 +226,11 @@ export default function RegisterPage() {
     setLoading(true);
 
     try {
-      await axios.post(`${API_URL}/api/auth/resend-registration-otp/`, {
-        email,
-      });
+      const res = await axios.post(
+        `${API_URL}/api/auth/resend-registration-otp/`,
+        { email },
+      );
+      setDeliveryId(res.data.delivery_id);
       setSuccess("New code sent to your email.");
       setCooldown(60);
       setOtp(["", "", "", "", "", ""]);
@@ -2,7 +2,11 @@
 
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Skeleton } from "@/components/ui/skeleton";
-import { useAdminSummary, useSwinfyActivityLog } from "@/hooks/use-swinfy-data";
+import {
+  useAdminSummary,
+  useSwinfyActivityLog,
+  useSwinfyLearningGains,
+} from "@/hooks/use-swinfy-data";
 import { timeAgo } from "@/lib/utils";
 import { ACTIVITY_TYPE_LABELS } from "@/lib/constants";
 import {
@@ -18,6 +22,7 @@ import Link from "next/link";
 export default function SwinfyDashboardPage() {
   const { data: summary, isLoading } = useAdminSummary();
   const { data: activities } = useSwinfyActivityLog();
+  const { data: gains } = useSwinfyLearningGains();
 
   if (isLoading) {
     return (
@@ -115,6 +120,36 @@ export default function SwinfyDashboardPage() {
         })}
       </div>
 
+      {gains && gains.overall.assessed > 0 && (
+        <Card className="mb-6">
+          <CardHeader>
+            <CardTitle className="text-sm font-semibold">
+              Learning Gains · {gains.overall.assessed} students assessed, mean{" "}
+              {gains.overall.mean_gain}, {Math.round((gains.overall.improved_share ?? 0) * 100)}%
+              improved
+            </CardTitle>
+          </CardHeader>
+          <CardContent>
+            <div className="grid grid-cols-[1fr_repeat(4,auto)] gap-x-4 gap-y-2 text-sm">
+              <span className="text-xs text-muted-foreground">School</span>
+              <span className="text-xs text-muted-foreground">Assessed</span>
+              <span className="text-xs text-muted-foreground">Mean</span>
+              <span className="text-xs text-muted-foreground">Median</span>
+              <span className="text-xs text-muted-foreground">Improved</span>
+              {gains.schools?.map((s) => (
+                <div key={s.id} className="contents tabular-nums">
+                  <span className="truncate font-medium">{s.name}</span>
+                  <span>{s.assessed}</span>
+                  <span>{s.mean_gain}</span>
+                  <span>{s.median_gain}</span>
+                  <span>{Math.round(s.improved_share * 100)}%</span>
+                </div>
+              ))}
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
       <Card>
         <CardHeader>
           <CardTitle className="text-sm font-semibold">Recent Activity</CardTitle>
@@ -8,6 +8,7 @@ import {
   SidebarInset,
 } from "@/components/ui/sidebar";
 import { SwinySidebarNav } from "@/components/swinfy/sidebar-nav";
+import { useSwinfyQueueStream } from "@/hooks/use-swinfy-data";
 
 export default function SwinfyLayout({
   children,
@@ -16,6 +17,7 @@ export default function SwinfyLayout({
 }) {
   const { status } = useSession();
   const router = useRouter();
+  useSwinfyQueueStream();
 
   useEffect(() => {
     if (status === "unauthenticated") router.push("/login");
@@ -2,11 +2,14 @@
 
 import { useState } from "react";
 import { Skeleton } from "@/components/ui/skeleton";
-import { useSwinfySubmissions } from "@/hooks/use-swinfy-data";
+import { useSwinfySubmissions, useSwinfyExport } from "@/hooks/use-swinfy-data";
 import { VerificationQueue } from "@/components/swinfy/verification-queue";
 import { SubmissionDetailModal } from "@/components/swinfy/submission-detail-modal";
 import { SwinfyFilters } from "@/components/swinfy/swinfy-filters";
 import { Tabs, TabsList, TabsTrigger } from "@/components/ui/tabs";
+import { Button } from "@/components/ui/button";
+import { toast } from "sonner";
+import { Download, Loader2 } from "lucide-react";
 
 export default function VerificationPage() {
   const [selectedId, setSelectedId] = useState<string | null>(null);
@@ -16,17 +19,40 @@ export default function VerificationPage() {
   const [trainer, setTrainer] = useState("");
   const [day, setDay] = useState("");
 
-  const { data: submissions, isLoading } = useSwinfySubmissions({
+  const filters = {
     status: tab === "all" ? undefined : tab,
     district: district || undefined,
     school: school || undefined,
     trainer: trainer || undefined,
     day: day || undefined,
-  });
+  };
+  const { data: submissions, isLoading } = useSwinfySubmissions(filters);
+  const exportSubmissions = useSwinfyExport();
+
+  const handleExport = () =>
+    exportSubmissions.mutate(
+      { dataset: "submissions", filters },
+      { onError: () => toast.error("Failed to export submissions") }
+    );
 
   return (
     <div className="p-4 sm:p-6">
-      <h1 className="mb-4 text-xl font-bold sm:text-2xl">Verification Queue</h1>
+      <div className="mb-4 flex items-center justify-between gap-3">
+        <h1 className="text-xl font-bold sm:text-2xl">Verification Queue</h1>
+        <Button
+          variant="outline"
+          size="sm"
+          onClick={handleExport}
+          disabled={exportSubmissions.isPending}
+        >
+          {exportSubmissions.isPending ? (
+            <Loader2 className="mr-2 h-4 w-4 animate-spin" />
+          ) : (
+            <Download className="mr-2 h-4 w-4" />
+          )}
+          Export CSV
+        </Button>
+      </div>
 
       <Tabs value={tab} onValueChange={setTab} className="mb-3">
         <TabsList>
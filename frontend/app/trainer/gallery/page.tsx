@@ -7,7 +7,7 @@ import { Skeleton } from "@/components/ui/skeleton";
 import { TrainerHeader } from "@/components/trainer/trainer-header";
 import { useTrainerGallery } from "@/hooks/use-trainer-data";
 import { getDayTheme } from "@/lib/constants";
-import { timeAgo } from "@/lib/utils";
+import { mediumSrc, thumbSrc, timeAgo } from "@/lib/utils";
 import { GalleryFilters } from "@/components/trainer/gallery-filters";
 import { ImageIcon, X, Star, Clock, CheckCircle, XCircle } from "lucide-react";
 
@@ -107,7 +107,7 @@ export default function TrainerGalleryPage() {
                   <div className="aspect-square">
                     {photo.image_url ? (
                       <img
-                        src={photo.image_url}
+                        src={thumbSrc(photo)}
                         alt={photo.caption || "Session photo"}
                         className="h-full w-full object-cover"
                       />
@@ -176,7 +176,7 @@ export default function TrainerGalleryPage() {
           >
             {selected.image_url && (
               <img
-                src={selected.image_url}
+                src={mediumSrc(selected)}
                 alt={selected.caption || "Session photo"}
                 className="max-h-[60vh] w-full object-contain bg-black"
               />
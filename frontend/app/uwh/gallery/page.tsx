@@ -4,18 +4,23 @@ import { useState } from "react";
 import { Badge } from "@/components/ui/badge";
 import { Skeleton } from "@/components/ui/skeleton";
 import { Dialog, DialogContent, DialogTitle } from "@/components/ui/dialog";
-import { useUWHGallery } from "@/hooks/use-uwh-data";
+import { useUWHGallery, useUWHGalleryArchive } from "@/hooks/use-uwh-data";
 import { UWHFilters } from "@/components/uwh/uwh-filters";
-import { Camera, Star } from "lucide-react";
+import { Button } from "@/components/ui/button";
+import { toast } from "sonner";
+import { Camera, Download, Loader2, Star } from "lucide-react";
 import type { SessionPhoto } from "@/lib/types";
+import { mediumSrc, thumbSrc } from "@/lib/utils";
 
 export default function GalleryPage() {
   const [district, setDistrict] = useState("");
   const [school, setSchool] = useState("");
-  const { data: gallery, isLoading } = useUWHGallery({
+  const filters = {
     district: district || undefined,
     school: school || undefined,
-  });
+  };
+  const { data: gallery, isLoading } = useUWHGallery(filters);
+  const archive = useUWHGalleryArchive();
   const [viewPhoto, setViewPhoto] = useState<SessionPhoto | null>(null);
 
   if (isLoading) {
@@ -37,13 +42,32 @@ export default function GalleryPage() {
   return (
     <div className="p-5 sm:p-8 uwh-animate-in">
       {/* Header */}
-      <div className="mb-8">
-        <h1 className="uwh-heading text-2xl font-bold sm:text-3xl">
-          Photo Gallery
-        </h1>
-        <p className="mt-1 text-sm text-[#9CA3AF]">
-          The AI Literacy program in action — <span className="uwh-mono">{allPhotos.length}</span> photos
-        </p>
+      <div className="mb-8 flex flex-wrap items-start justify-between gap-4">
+        <div>
+          <h1 className="uwh-heading text-2xl font-bold sm:text-3xl">
+            Photo Gallery
+          </h1>
+          <p className="mt-1 text-sm text-[#9CA3AF]">
+            The AI Literacy program in action — <span className="uwh-mono">{allPhotos.length}</span> photos
+          </p>
+        </div>
+        <Button
+          variant="outline"
+          size="sm"
+          disabled={archive.isPending || allPhotos.length === 0}
+          onClick={() =>
+            archive.mutate(filters, {
+              onError: () => toast.error("Failed to download photos"),
+            })
+          }
+        >
+          {archive.isPending ? (
+            <Loader2 className="mr-2 h-4 w-4 animate-spin" />
+          ) : (
+            <Download className="mr-2 h-4 w-4" />
+          )}
+          Download ZIP
+        </Button>
       </div>
 
       <div className="mb-6">
@@ -70,7 +94,7 @@ export default function GalleryPage() {
                 onClick={() => setViewPhoto(photo)}
               >
                 <img
-                  src={photo.image_url}
+                  src={thumbSrc(photo)}
                   alt={photo.caption || "Featured photo"}
                   className="aspect-square w-full object-cover transition-transform duration-300 group-hover:scale-105"
                 />
@@ -106,7 +130,7 @@ export default function GalleryPage() {
                 onClick={() => setViewPhoto(photo)}
               >
                 <img
-                  src={photo.image_url}
+                  src={thumbSrc(photo)}
                   alt={photo.caption || "Session photo"}
                   className="aspect-square w-full object-cover transition-transform duration-300 group-hover:scale-105"
                 />
@@ -135,7 +159,7 @@ export default function GalleryPage() {
           {viewPhoto && (
             <div>
               <img
-                src={viewPhoto.image_url}
+                src={mediumSrc(viewPhoto)}
                 alt={viewPhoto.caption || "Session photo"}
                 className="w-full rounded-t-xl object-contain"
               />
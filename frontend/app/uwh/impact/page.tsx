@@ -2,6 +2,7 @@
 
 import { Skeleton } from "@/components/ui/skeleton";
 import { useUWHSummary, useUWHDistrictProgress } from "@/hooks/use-uwh-data";
+import { UWHLearningGains } from "@/components/uwh/uwh-learning-gains";
 import {
   BarChart,
   Bar,
@@ -178,6 +179,10 @@ export default function ImpactPage() {
           </div>
         </div>
       </div>
+
+      <div className="mt-6">
+        <UWHLearningGains />
+      </div>
     </div>
   );
 }
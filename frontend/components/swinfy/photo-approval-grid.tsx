@@ -15,6 +15,7 @@ import {
 } from "@/hooks/use-swinfy-data";
 import type { SessionPhoto } from "@/lib/types";
 import { toast } from "sonner";
+import { thumbSrc } from "@/lib/utils";
 import { Check, X, Star, CheckCheck, Trash2 } from "lucide-react";
 
 interface Props {
@@ -178,7 +179,7 @@ export function PhotoApprovalGrid({ photos }: Props) {
               {/* Image */}
               {photo.image_url ? (
                 <img
-                  src={photo.image_url}
+                  src={thumbSrc(photo)}
                   alt={photo.caption || "Session photo"}
                   className="aspect-square w-full object-cover"
                 />
@@ -122,10 +122,9 @@ export function AddProjectDialog({
     }
 
     if (image) formData.append("image", image);
-    if (mediaFile) formData.append("media_file", mediaFile);
     if (websiteUrl.trim()) formData.append("website_url", websiteUrl.trim());
 
-    addProject.mutate(formData, {
+    addProject.mutate({ formData, mediaFile }, {
       onSuccess: () => {
         toast.success("Project added!");
         reset();
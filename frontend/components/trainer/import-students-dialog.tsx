@@ -0,0 +1,127 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import axios from "axios";
+import {
+  Dialog,
+  DialogContent,
+  DialogHeader,
+  DialogTitle,
+} from "@/components/ui/dialog";
+import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { useImportStudents } from "@/hooks/use-trainer-data";
+import { toast } from "sonner";
+import { Loader2, Upload } from "lucide-react";
+import type { RosterImportResult } from "@/lib/types";
+
+interface ImportStudentsDialogProps {
+  open: boolean;
+  onOpenChange: (open: boolean) => void;
+}
+
+export function ImportStudentsDialog({
+  open,
+  onOpenChange,
+}: ImportStudentsDialogProps) {
+  const importStudents = useImportStudents();
+  const [file, setFile] = useState<File | null>(null);
+  const [result, setResult] = useState<RosterImportResult | null>(null);
+
+  useEffect(() => {
+    setFile(null);
+    setResult(null);
+  }, [open]);
+
+  const handleSubmit = (e: React.FormEvent) => {
+    e.preventDefault();
+    if (!file) {
+      toast.error("Choose a CSV or Excel file");
+      return;
+    }
+    importStudents.mutate(
+      { file },
+      {
+        onSuccess: (data) => {
+          if (data.errors.length > 0) {
+            setResult(data);
+            return;
+          }
+          const skipped = data.skipped.length
+            ? `, ${data.skipped.length} already on the list`
+            : "";
+          toast.success(`${data.created} students added${skipped}`);
+          onOpenChange(false);
+        },
+        onError: (err) =>
+          toast.error(
+            (axios.isAxiosError(err) && err.response?.data?.detail) ||
+              "Failed to import students"
+          ),
+      }
+    );
+  };
+
+  return (
+    <Dialog open={open} onOpenChange={onOpenChange}>
+      <DialogContent className="max-h-[90dvh] overflow-y-auto rounded-t-3xl sm:rounded-2xl sm:max-w-md">
+        <DialogHeader>
+          <DialogTitle className="text-base">Import Students</DialogTitle>
+        </DialogHeader>
+        <form onSubmit={handleSubmit} className="space-y-4">
+          <div>
+            <Label className="mb-2 block text-sm font-medium">
+              Roster file (.csv or .xlsx)
+            </Label>
+            <Input
+              type="file"
+              accept=".csv,.xlsx"
+              onChange={(e) => {
+                setFile(e.target.files?.[0] ?? null);
+                setResult(null);
+              }}
+              className="h-12 rounded-xl text-sm"
+            />
+            <p className="mt-2 text-xs text-[#9CA3AF]">
+              First row is the header. Only &quot;name&quot; is required; age,
+              grade, parent_name, parent_phone, notes, baseline_marks and
+              endline_marks are optional. Names already on the list are skipped.
+            </p>
+          </div>
+
+          {result && result.errors.length > 0 && (
+            <div className="rounded-xl border border-red-200 bg-red-50 p-3 text-xs text-red-700">
+              <p className="mb-1 font-medium">
+                No students were added. Fix these rows and try again:
+              </p>
+              <ul className="space-y-0.5">
+                {result.errors.map((error) => (
+                  <li key={error.row}>
+                    Row {error.row}:{" "}
+                    {Object.entries(error.errors)
+                      .map(([field, messages]) => `${field} – ${messages.join(" ")}`)
+                      .join("; ")}
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
+
+          <Button
+            type="submit"
+            disabled={importStudents.isPending}
+            className="h-12 w-full rounded-xl bg-[#0F4C4C] text-sm hover:bg-[#0F4C4C]/90"
+          >
+            {importStudents.isPending ? (
+              <Loader2 className="mr-2 h-4 w-4 animate-spin" />
+            ) : (
+              <Upload className="mr-2 h-4 w-4" />
+            )}
+            Import
+          </Button>
+        </form>
+      </DialogContent>
+    </Dialog>
+  );
+}
@@ -0,0 +1,154 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import axios from "axios";
+import {
+  Dialog,
+  DialogContent,
+  DialogHeader,
+  DialogTitle,
+} from "@/components/ui/dialog";
+import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input";
+import { useBulkMarks } from "@/hooks/use-trainer-data";
+import { toast } from "sonner";
+import { Loader2 } from "lucide-react";
+import type { Student, StudentMarks } from "@/lib/types";
+
+interface MarksEntryDialogProps {
+  open: boolean;
+  onOpenChange: (open: boolean) => void;
+  students: Student[];
+}
+
+type Draft = Record<string, { baseline: string; endline: string }>;
+
+function toDraft(students: Student[]): Draft {
+  return Object.fromEntries(
+    students.map((s) => [
+      s.id,
+      {
+        baseline: s.baseline_marks?.toString() ?? "",
+        endline: s.endline_marks?.toString() ?? "",
+      },
+    ])
+  );
+}
+
+function toMark(value: string) {
+  return value === "" ? null : Number(value);
+}
+
+export function MarksEntryDialog({
+  open,
+  onOpenChange,
+  students,
+}: MarksEntryDialogProps) {
+  const bulkMarks = useBulkMarks();
+  const [draft, setDraft] = useState<Draft>({});
+
+  useEffect(() => {
+    if (open) setDraft(toDraft(students));
+    // Only reset when the dialog opens, not when the list refetches
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [open]);
+
+  const setMark = (id: string, field: "baseline" | "endline", value: string) =>
+    setDraft((d) => ({ ...d, [id]: { ...d[id], [field]: value } }));
+
+  const handleSubmit = (e: React.FormEvent) => {
+    e.preventDefault();
+    // Send only the students whose marks were edited
+    const marks: Record<string, StudentMarks> = {};
+    for (const student of students) {
+      const entry = draft[student.id];
+      if (!entry) continue;
+      const changed: StudentMarks = {};
+      if (toMark(entry.baseline) !== student.baseline_marks)
+        changed.baseline = toMark(entry.baseline);
+      if (toMark(entry.endline) !== student.endline_marks)
+        changed.endline = toMark(entry.endline);
+      if (Object.keys(changed).length > 0) marks[student.id] = changed;
+    }
+    if (Object.keys(marks).length === 0) {
+      onOpenChange(false);
+      return;
+    }
+    bulkMarks.mutate(marks, {
+      onSuccess: (data) => {
+        toast.success(`Marks saved for ${data.updated} students`);
+        onOpenChange(false);
+      },
+      onError: (err) =>
+        toast.error(
+          (axios.isAxiosError(err) && err.response?.data?.detail) ||
+            "Failed to save marks"
+        ),
+    });
+  };
+
+  return (
+    <Dialog open={open} onOpenChange={onOpenChange}>
+      <DialogContent className="max-h-[90dvh] overflow-y-auto rounded-t-3xl sm:rounded-2xl sm:max-w-md">
+        <DialogHeader>
+          <DialogTitle className="text-base">Enter Marks</DialogTitle>
+        </DialogHeader>
+        <form onSubmit={handleSubmit} className="space-y-4">
+          <div className="grid grid-cols-[1fr_4.5rem_4.5rem] items-center gap-2 text-xs">
+            <span className="font-medium text-[#6B7280]">Student</span>
+            <span className="font-medium text-[#6B7280]">Baseline</span>
+            <span className="font-medium text-[#6B7280]">Endline</span>
+            {students.map((student) => (
+              <MarksRow
+                key={student.id}
+                name={student.name}
+                baseline={draft[student.id]?.baseline ?? ""}
+                endline={draft[student.id]?.endline ?? ""}
+                onChange={(field, value) => setMark(student.id, field, value)}
+              />
+            ))}
+          </div>
+
+          <Button
+            type="submit"
+            disabled={bulkMarks.isPending}
+            className="h-12 w-full rounded-xl bg-[#0F4C4C] text-sm hover:bg-[#0F4C4C]/90"
+          >
+            {bulkMarks.isPending && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+            Save Marks
+          </Button>
+        </form>
+      </DialogContent>
+    </Dialog>
+  );
+}
+
+function MarksRow({
+  name,
+  baseline,
+  endline,
+  onChange,
+}: {
+  name: string;
+  baseline: string;
+  endline: string;
+  onChange: (field: "baseline" | "endline", value: string) => void;
+}) {
+  return (
+    <>
+      <span className="truncate text-sm text-[#111827]">{name}</span>
+      {(["baseline", "endline"] as const).map((field) => (
+        <Input
+          key={field}
+          type="number"
+          inputMode="numeric"
+          min={0}
+          max={10}
+          value={field === "baseline" ? baseline : endline}
+          onChange={(e) => onChange(field, e.target.value)}
+          className="h-10 rounded-xl text-sm"
+        />
+      ))}
+    </>
+  );
+}
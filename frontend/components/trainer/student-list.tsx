@@ -15,8 +15,18 @@ import {
 } from "@/components/ui/table";
 import { useTrainerStudents, useDeleteStudent } from "@/hooks/use-trainer-data";
 import { AddStudentDialog } from "./add-student-dialog";
+import { ImportStudentsDialog } from "./import-students-dialog";
+import { MarksEntryDialog } from "./marks-entry-dialog";
 import { toast } from "sonner";
-import { Plus, Search, Pencil, Trash2, Users } from "lucide-react";
+import {
+  Plus,
+  Search,
+  Pencil,
+  Trash2,
+  Users,
+  Upload,
+  ClipboardList,
+} from "lucide-react";
 import type { Student } from "@/lib/types";
 
 // Modern gradient avatar colors based on first letter
@@ -60,6 +70,8 @@ export function StudentList({ schoolId }: { schoolId?: string } = {}) {
   const [search, setSearch] = useState("");
   const [dialogOpen, setDialogOpen] = useState(false);
   const [editingStudent, setEditingStudent] = useState<Student | null>(null);
+  const [importOpen, setImportOpen] = useState(false);
+  const [marksOpen, setMarksOpen] = useState(false);
 
   if (isLoading) {
     return (
@@ -107,6 +119,26 @@ export function StudentList({ schoolId }: { schoolId?: string } = {}) {
           <Plus className="mr-1 h-3.5 w-3.5" />
           Add
         </Button>
+        <Button
+          onClick={() => setImportOpen(true)}
+          size="sm"
+          variant="outline"
+          className="h-10 rounded-xl border-[#E5E7EB] px-3.5 text-xs"
+        >
+          <Upload className="mr-1 h-3.5 w-3.5" />
+          Import
+        </Button>
+        {students && students.length > 0 && (
+          <Button
+            onClick={() => setMarksOpen(true)}
+            size="sm"
+            variant="outline"
+            className="h-10 rounded-xl border-[#E5E7EB] px-3.5 text-xs"
+          >
+            <ClipboardList className="mr-1 h-3.5 w-3.5" />
+            Marks
+          </Button>
+        )}
       </div>
 
       {/* Summary line */}
@@ -243,6 +275,12 @@ export function StudentList({ schoolId }: { schoolId?: string } = {}) {
         onOpenChange={setDialogOpen}
         student={editingStudent}
       />
+      <ImportStudentsDialog open={importOpen} onOpenChange={setImportOpen} />
+      <MarksEntryDialog
+        open={marksOpen}
+        onOpenChange={setMarksOpen}
+        students={students || []}
+      />
     </div>
   );
 }
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useRef } from "react";
+import { useEffect, useState, useRef } from "react";
 import { useRouter } from "next/navigation";
 import { Card, CardContent } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -47,6 +47,8 @@ const STEPS = [
 export function SubmissionForm() {
   const router = useRouter();
   const fileInputRef = useRef<HTMLInputElement>(null);
+  // Reused when the trainer taps Submit again after a dropped response
+  const idempotencyKey = useRef(crypto.randomUUID());
 
   const { data: schools } = useTrainerSchools();
   const { data: curriculum } = useCurriculum();
@@ -102,6 +104,11 @@ export function SubmissionForm() {
       })()
     : "";
 
+  // The server binds a key to one request body, so an edited form is a new request
+  useEffect(() => {
+    idempotencyKey.current = crypto.randomUUID();
+  }, [schoolId, dayNumber, reachedAt, studentCount, photos]);
+
   const canSubmit =
     schoolId &&
     dayNumber &&
@@ -118,26 +125,21 @@ export function SubmissionForm() {
       return;
     }
 
-    const formData = new FormData();
-    formData.append("school", schoolId);
-    formData.append("day_number", dayNumber);
-    formData.append("reached_at", reachedAt);
-    formData.append("student_count", studentCount);
-
     const matchedCurriculum = curriculum?.find(
       (c) => c.day_number === parseInt(dayNumber)
     );
-    if (matchedCurriculum) {
-      formData.append("curriculum", matchedCurriculum.id);
-    }
-
-    formData.append("topics_covered", JSON.stringify([]));
-    formData.append("trainer_notes", "");
-    formData.append("challenges", "");
-
-    photos.forEach((photo) => formData.append("photos", photo));
-
-    submit.mutate(formData, {
+    const fields = {
+      school: schoolId,
+      day_number: parseInt(dayNumber),
+      reached_at: reachedAt || null,
+      student_count: parseInt(studentCount) || 0,
+      curriculum: matchedCurriculum?.id ?? null,
+      topics_covered: [],
+      trainer_notes: "",
+      challenges: "",
+    };
+
+    submit.mutate({ fields, photos, idempotencyKey: idempotencyKey.current }, {
       onSuccess: () => {
         toast.success("Session submitted successfully!");
         router.push("/trainer/submissions");
@@ -0,0 +1,114 @@
+"use client";
+
+import { Skeleton } from "@/components/ui/skeleton";
+import { useUWHLearningGains } from "@/hooks/use-uwh-data";
+import {
+  BarChart,
+  Bar,
+  XAxis,
+  YAxis,
+  CartesianGrid,
+  Tooltip,
+  ResponsiveContainer,
+} from "recharts";
+import { GraduationCap } from "lucide-react";
+
+function signed(value: number) {
+  return value > 0 ? `+${value}` : `${value}`;
+}
+
+export function UWHLearningGains() {
+  const { data, isLoading } = useUWHLearningGains();
+
+  if (isLoading) {
+    return <Skeleton className="h-64 rounded-xl bg-[#F3F4F6]" />;
+  }
+
+  const overall = data?.overall;
+  const bins = data?.bins;
+  const histogram =
+    bins && overall?.histogram
+      ? overall.histogram.map((count, i) => {
+          const lo = bins.start + i * bins.width;
+          const hi = lo + bins.width - 1;
+          return { gain: lo === hi ? signed(lo) : `${signed(lo)}…${signed(hi)}`, count };
+        })
+      : [];
+
+  return (
+    <div className="uwh-card overflow-hidden">
+      <div className="flex items-center gap-2 border-b border-[#E5E7EB] px-5 py-4">
+        <GraduationCap className="h-4 w-4 text-[#7C3AED]" />
+        <h2 className="uwh-heading text-base font-semibold">Learning Gains</h2>
+      </div>
+      {!overall || overall.assessed === 0 ? (
+        <p className="py-12 text-center text-sm text-[#9CA3AF]">
+          No baseline and endline marks yet.
+        </p>
+      ) : (
+        <div className="grid gap-6 p-5 lg:grid-cols-2">
+          <div>
+            <div className="mb-5 grid grid-cols-3 gap-3 text-center">
+              <div>
+                <p className="uwh-mono text-2xl font-bold text-[#7C3AED]">
+                  {signed(overall.mean_gain ?? 0)}
+                </p>
+                <p className="uwh-label mt-1">Mean Gain</p>
+              </div>
+              <div>
+                <p className="uwh-mono text-2xl font-bold text-[#1F2937]">
+                  {Math.round((overall.improved_share ?? 0) * 100)}%
+                </p>
+                <p className="uwh-label mt-1">Improved</p>
+              </div>
+              <div>
+                <p className="uwh-mono text-2xl font-bold text-[#1F2937]">
+                  {overall.assessed}
+                </p>
+                <p className="uwh-label mt-1">Assessed</p>
+              </div>
+            </div>
+            <div className="h-48">
+              <ResponsiveContainer width="100%" height="100%">
+                <BarChart data={histogram}>
+                  <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
+                  <XAxis
+                    dataKey="gain"
+                    tick={{ fontSize: 11, fontFamily: "var(--font-geist-sans)", fill: "#9CA3AF" }}
+                  />
+                  <YAxis
+                    tick={{ fontSize: 11, fontFamily: "var(--font-geist-sans)", fill: "#9CA3AF" }}
+                  />
+                  <Tooltip
+                    contentStyle={{
+                      borderRadius: 8,
+                      border: "1px solid #E5E7EB",
+                      boxShadow: "0 4px 12px rgba(0,0,0,0.06)",
+                      fontFamily: "var(--font-geist-sans)",
+                    }}
+                  />
+                  <Bar dataKey="count" fill="#7C3AED" name="Students" radius={[4, 4, 0, 0]} />
+                </BarChart>
+              </ResponsiveContainer>
+            </div>
+          </div>
+
+          <div className="space-y-3">
+            {data?.districts?.map((d) => (
+              <div key={d.id} className="flex items-center justify-between gap-3 text-sm">
+                <span className="truncate font-medium text-[#1F2937]">{d.name}</span>
+                <span className="shrink-0 text-xs tabular-nums text-[#9CA3AF]">
+                  {d.mean_baseline} → {d.mean_endline}
+                  <span className="ml-2 font-semibold text-[#7C3AED]">
+                    {signed(d.mean_gain)}
+                  </span>
+                  <span className="ml-2">{Math.round(d.improved_share * 100)}% improved</span>
+                </span>
+              </div>
+            ))}
+          </div>
+        </div>
+      )}
+    </div>
+  );
+}
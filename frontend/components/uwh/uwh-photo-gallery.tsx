@@ -13,6 +13,7 @@ import {
 import { useUWHGallery } from "@/hooks/use-uwh-data";
 import { Image as ImageIcon, Star } from "lucide-react";
 import type { SessionPhoto } from "@/lib/types";
+import { mediumSrc, thumbSrc } from "@/lib/utils";
 
 export function UWHPhotoGallery() {
   const { data: gallery, isLoading } = useUWHGallery();
@@ -73,7 +74,7 @@ export function UWHPhotoGallery() {
                 onClick={() => setViewPhoto(photo)}
               >
                 <img
-                  src={photo.image_url}
+                  src={thumbSrc(photo)}
                   alt={photo.caption || "Session photo"}
                   className="aspect-square w-full object-cover transition-transform group-hover:scale-105"
                 />
@@ -110,7 +111,7 @@ export function UWHPhotoGallery() {
           {viewPhoto && (
             <div>
               <img
-                src={viewPhoto.image_url}
+                src={mediumSrc(viewPhoto)}
                 alt={viewPhoto.caption || "Session photo"}
                 className="w-full rounded-t-lg object-contain"
               />
@@ -0,0 +1,40 @@
+import { useInfiniteQuery } from "@tanstack/react-query";
+import api from "@/lib/api";
+import type { CursorPage } from "@/lib/types";
+
+function cursorFrom(url: string | null) {
+  return url ? new URL(url).searchParams.get("cursor") : null;
+}
+
+/**
+ * Incrementally fetch a keyset-paginated list endpoint
+ * (swinfy/submissions, swinfy/photos/pending, trainer/gallery, uwh/projects, ...).
+ * Loaded pages are flattened into `items`; call `fetchNextPage()` for more.
+ */
+export function useCursorList<T>(
+  queryKey: unknown[],
+  url: string,
+  params: Record<string, string> = {},
+  pageSize = 50
+) {
+  const query = useInfiniteQuery({
+    queryKey: [...queryKey, "pages", params, pageSize],
+    initialPageParam: null as string | null,
+    queryFn: ({ pageParam }) =>
+      api
+        .get<CursorPage<T>>(url, {
+          params: {
+            ...params,
+            page_size: pageSize,
+            ...(pageParam ? { cursor: pageParam } : {}),
+          },
+        })
+        .then((r) => r.data),
+    getNextPageParam: (lastPage) => cursorFrom(lastPage.next),
+  });
+
+  return {
+    ...query,
+    items: query.data?.pages.flatMap((page) => page.results) ?? [],
+  };
+}
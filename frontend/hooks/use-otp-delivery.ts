@@ -0,0 +1,25 @@
+import { useQuery } from "@tanstack/react-query";
+import axios from "axios";
+import type { OtpDeliveryStatus } from "@/lib/types";
+
+const API_URL = process.env.NEXT_PUBLIC_API_URL;
+
+/**
+ * Poll the delivery status of a queued OTP email until it is sent or failed.
+ * The OTP endpoints return before the email goes out; `deliveryId` is the
+ * `delivery_id` from their response.
+ */
+export function useOtpDelivery(deliveryId: string | null) {
+  return useQuery<OtpDeliveryStatus>({
+    queryKey: ["otp-delivery", deliveryId],
+    queryFn: () =>
+      axios
+        .get(`${API_URL}/api/auth/otp-delivery/${deliveryId}/`)
+        .then((r) => r.data.status),
+    enabled: !!deliveryId,
+    refetchInterval: (query) =>
+      query.state.data === "sent" || query.state.data === "failed"
+        ? false
+        : 2_000,
+  });
+}
@@ -1,5 +1,8 @@
+import { useEffect } from "react";
+import { useSession } from "next-auth/react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import api from "@/lib/api";
+import { saveDownload } from "@/lib/utils";
 import type {
   AdminSummary,
   District,
@@ -12,6 +15,7 @@ import type {
   ActivityLogEntry,
   UWHControl,
   SwinfyTrainer,
+  LearningGains,
 } from "@/lib/types";
 
 // ---- Filter types ----
@@ -37,8 +41,18 @@ export interface ProjectFilters {
   school?: string;
   trainer?: string;
   district?: string;
+  day?: string;
+}
+
+export interface StudentFilters {
+  school?: string;
+  district?: string;
+  group?: string;
+  trainer?: string;
 }
 
+export type ExportDataset = "submissions" | "students" | "projects" | "photos";
+
 // ---- Helper ----
 
 function cleanParams(obj: { [key: string]: string | undefined }) {
@@ -55,7 +69,14 @@ export function useAdminSummary() {
   return useQuery<AdminSummary>({
     queryKey: ["admin", "summary"],
     queryFn: () => api.get("/api/dashboard/summary/").then((r) => r.data),
-    refetchInterval: 15_000,
+  });
+}
+
+export function useSwinfyLearningGains() {
+  return useQuery<LearningGains>({
+    queryKey: ["swinfy", "learning-gains"],
+    queryFn: () =>
+      api.get("/api/dashboard/swinfy/learning-gains/").then((r) => r.data),
   });
 }
 
@@ -95,7 +116,6 @@ export function useSwinfySubmissions(filters: SubmissionFilters = {}) {
       api
         .get("/api/dashboard/swinfy/submissions/", { params })
         .then((r) => r.data),
-    refetchInterval: 15_000,
   });
 }
 
@@ -122,7 +142,6 @@ export function useSwinfyPhotos(filters: PhotoFilters = {}) {
       api
         .get("/api/dashboard/swinfy/photos/pending/", { params })
         .then((r) => r.data),
-    refetchInterval: 15_000,
   });
 }
 
@@ -144,7 +163,6 @@ export function useSwinfyProjects(filters: ProjectFilters = {}) {
       api
         .get("/api/dashboard/swinfy/projects/pending/", { params })
         .then((r) => r.data),
-    refetchInterval: 15_000,
   });
 }
 
@@ -158,7 +176,6 @@ export function useSwinfyActivityLog() {
     queryKey: ["swinfy", "activity-log"],
     queryFn: () =>
       api.get("/api/dashboard/swinfy/activity-log/").then((r) => r.data),
-    refetchInterval: 30_000,
   });
 }
 
@@ -182,6 +199,82 @@ export function useSwinfyTrainers(districtId?: string) {
   });
 }
 
+// ---- Live queue stream (replaces polling of the queues) ----
+
+const STREAM_QUERY_KEYS: Record<string, string[][]> = {
+  submissions: [["swinfy", "submissions"], ["admin", "summary"]],
+  photos: [["swinfy", "photos"], ["admin", "summary"]],
+  projects: [["swinfy", "projects"], ["admin", "summary"]],
+  activity: [["swinfy", "activity-log"]],
+};
+
+type QueueCounts = Pick<
+  AdminSummary,
+  "pending_submissions" | "pending_photos" | "pending_projects"
+>;
+
+/** Subscribe to swinfy/stream/ and refresh queue queries as changes arrive. */
+export function useSwinfyQueueStream() {
+  const { data: session } = useSession();
+  const qc = useQueryClient();
+  const token = session?.accessToken;
+
+  useEffect(() => {
+    if (!token) return;
+    let source: EventSource | null = null;
+    let closed = false;
+
+    // EventSource cannot send the JWT; connect with a short-lived ticket
+    // and fetch a fresh one whenever the browser gives up reconnecting
+    const connect = async () => {
+      let ticket: string;
+      try {
+        const { data } = await api.post<{ ticket: string }>(
+          "/api/dashboard/swinfy/stream/ticket/"
+        );
+        ticket = data.ticket;
+      } catch {
+        if (!closed) setTimeout(connect, 5000);
+        return;
+      }
+      if (closed) return;
+      source = new EventSource(
+        `${process.env.NEXT_PUBLIC_API_URL}/api/dashboard/swinfy/stream/?ticket=${encodeURIComponent(ticket)}`
+      );
+
+      source.addEventListener("counts", (e) => {
+        const counts: QueueCounts = JSON.parse((e as MessageEvent).data);
+        qc.setQueryData<AdminSummary>(["admin", "summary"], (prev) =>
+          prev ? { ...prev, ...counts } : prev
+        );
+      });
+
+      source.addEventListener("changed", (e) => {
+        const { resources }: { resources: string[] } = JSON.parse(
+          (e as MessageEvent).data
+        );
+        for (const resource of resources) {
+          for (const queryKey of STREAM_QUERY_KEYS[resource] ?? []) {
+            qc.invalidateQueries({ queryKey });
+          }
+        }
+      });
+
+      source.onerror = () => {
+        if (source?.readyState === EventSource.CLOSED && !closed) {
+          setTimeout(connect, 5000);
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      source?.close();
+    };
+  }, [token, qc]);
+}
+
 // ---- Mutations ----
 
 function useInvalidateSwinfy() {
@@ -351,6 +444,28 @@ export function useUpdateSchool() {
   });
 }
 
+/** Download a streamed CSV / XLSX export with the given list filters. */
+export function useSwinfyExport() {
+  return useMutation({
+    mutationFn: async ({
+      dataset,
+      filters = {},
+      fileFormat = "csv",
+    }: {
+      dataset: ExportDataset;
+      filters?: SubmissionFilters | PhotoFilters | ProjectFilters | StudentFilters;
+      fileFormat?: "csv" | "xlsx";
+    }) => {
+      const params = cleanParams({ ...filters, file_format: fileFormat });
+      const r = await api.get(`/api/dashboard/swinfy/export/${dataset}/`, {
+        params,
+        responseType: "blob",
+      });
+      saveDownload(r.data, r.headers["content-disposition"], `${dataset}.${fileFormat}`);
+    },
+  });
+}
+
 export function useAssignTrainer() {
   const invalidate = useInvalidateSwinfy();
   const qc = useQueryClient();
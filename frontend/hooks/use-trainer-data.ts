@@ -1,15 +1,21 @@
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import axios from "axios";
 import api from "@/lib/api";
+import { uploadChunked } from "@/lib/chunked-upload";
 import type {
+  BulkMarksResult,
+  DirectSubmitResponse,
   TrainerSummary,
   SubmissionListItem,
   SubmissionDetail,
   School,
   Curriculum,
   ProjectHighlight,
+  RosterImportResult,
   TrainerProfile,
   Student,
   StudentGroup,
+  StudentMarks,
   TrainerGalleryPhoto,
 } from "@/lib/types";
 
@@ -56,11 +62,54 @@ export function useCurriculum() {
   });
 }
 
+export interface SessionSubmission {
+  fields: Record<string, unknown>;
+  photos: File[];
+  /** Sent as Idempotency-Key so a retried submit is not applied twice */
+  idempotencyKey?: string;
+}
+
+/**
+ * Two-phase submit: the API hands out one presigned upload slot per photo,
+ * the files go straight to storage, then the uploaded keys are finalized.
+ */
 export function useSubmitSession() {
   const qc = useQueryClient();
-  return useMutation({
-    mutationFn: (formData: FormData) =>
-      api.post("/api/dashboard/trainer/submit/", formData),
+  return useMutation<SubmissionDetail, Error, SessionSubmission>({
+    mutationFn: async ({ fields, photos, idempotencyKey }) => {
+      const keyed = (suffix: string) =>
+        idempotencyKey
+          ? { headers: { "Idempotency-Key": `${idempotencyKey}:${suffix}` } }
+          : undefined;
+      const { data } = await api.post<DirectSubmitResponse>(
+        "/api/dashboard/trainer/submit/",
+        {
+          ...fields,
+          uploads: photos.map((p) => ({
+            name: p.name,
+            content_type: p.type,
+            size: p.size,
+          })),
+        },
+        keyed("submit")
+      );
+      // Storage URLs are not our API: send them without the auth header
+      await Promise.all(
+        data.uploads.map((slot, i) => {
+          const body = new FormData();
+          Object.entries(slot.fields).forEach(([k, v]) => body.append(k, v));
+          body.append("file", photos[i]);
+          return axios.post(slot.url, body);
+        })
+      );
+      return api
+        .post(
+          `/api/dashboard/trainer/submissions/${data.submission.id}/finalize/`,
+          { keys: data.uploads.map((slot) => slot.key) },
+          keyed("finalize")
+        )
+        .then((r) => r.data);
+    },
     onSuccess: () => {
       qc.invalidateQueries({ queryKey: ["trainer"] });
     },
@@ -69,11 +118,20 @@ export function useSubmitSession() {
 
 export function useAddProject() {
   const qc = useQueryClient();
-  return useMutation<ProjectHighlight, Error, FormData>({
-    mutationFn: (formData) =>
-      api
+  return useMutation<
+    ProjectHighlight,
+    Error,
+    { formData: FormData; mediaFile?: File | null }
+  >({
+    mutationFn: async ({ formData, mediaFile }) => {
+      // Video / music goes up in resumable chunks, then is attached by id
+      if (mediaFile) {
+        formData.append("media_upload", await uploadChunked(mediaFile));
+      }
+      return api
         .post("/api/dashboard/trainer/projects/create/", formData)
-        .then((r) => r.data),
+        .then((r) => r.data);
+    },
     onSuccess: () => {
       qc.invalidateQueries({ queryKey: ["trainer"] });
     },
@@ -129,6 +187,48 @@ export function useAddStudent() {
   });
 }
 
+export function useImportStudents() {
+  const qc = useQueryClient();
+  return useMutation<RosterImportResult, Error, { file: File; schoolId?: string }>({
+    mutationFn: ({ file, schoolId }) => {
+      const formData = new FormData();
+      formData.append("file", file);
+      if (schoolId) formData.append("school", schoolId);
+      return api
+        .post("/api/dashboard/trainer/students/import/", formData)
+        .then((r) => r.data)
+        .catch((err) => {
+          // Row-level errors come back as a 400 with the same shape
+          if (axios.isAxiosError(err) && err.response?.data?.errors) {
+            return err.response.data as RosterImportResult;
+          }
+          throw err;
+        });
+    },
+    onSuccess: (result) => {
+      if (result.created > 0) {
+        qc.invalidateQueries({ queryKey: ["trainer", "students"] });
+        qc.invalidateQueries({ queryKey: ["trainer", "summary"] });
+      }
+    },
+  });
+}
+
+export function useBulkMarks() {
+  const qc = useQueryClient();
+  return useMutation<BulkMarksResult, Error, Record<string, StudentMarks>>({
+    mutationFn: (marks) =>
+      api
+        .post("/api/dashboard/trainer/students/marks/", marks)
+        .then((r) => r.data),
+    onSuccess: (result) => {
+      if (result.updated > 0) {
+        qc.invalidateQueries({ queryKey: ["trainer", "students"] });
+      }
+    },
+  });
+}
+
 export function useUpdateStudent() {
   const qc = useQueryClient();
   return useMutation<Student, Error, { id: string; data: Record<string, string> }>({
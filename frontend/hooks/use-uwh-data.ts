@@ -1,11 +1,13 @@
-import { useQuery } from "@tanstack/react-query";
+import { useQuery, useMutation } from "@tanstack/react-query";
 import api from "@/lib/api";
+import { saveDownload } from "@/lib/utils";
 import type {
   UWHSummary,
   UWHGallery,
   ProjectHighlight,
   ActivityLogEntry,
   DistrictProgress,
+  LearningGains,
 } from "@/lib/types";
 
 export interface UWHFilters {
@@ -39,6 +41,19 @@ export function useUWHGallery(filters: UWHFilters = {}) {
   });
 }
 
+/** Download every approved photo matching the gallery filters as one ZIP. */
+export function useUWHGalleryArchive() {
+  return useMutation({
+    mutationFn: async (filters: UWHFilters = {}) => {
+      const r = await api.get("/api/dashboard/uwh/gallery/archive/", {
+        params: cleanParams({ ...filters }),
+        responseType: "blob",
+      });
+      saveDownload(r.data, r.headers["content-disposition"], "approved-photos.zip");
+    },
+  });
+}
+
 export function useUWHProjects(filters: UWHFilters = {}) {
   const params = cleanParams({ ...filters });
   return useQuery<ProjectHighlight[]>({
@@ -65,3 +80,12 @@ export function useUWHDistrictProgress() {
     refetchInterval: 30_000,
   });
 }
+
+export function useUWHLearningGains() {
+  return useQuery<LearningGains>({
+    queryKey: ["uwh", "learning-gains"],
+    queryFn: () =>
+      api.get("/api/dashboard/uwh/learning-gains/").then((r) => r.data),
+    refetchInterval: 60_000,
+  });
+}
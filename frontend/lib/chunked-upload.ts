@@ -0,0 +1,48 @@
+import api from "@/lib/api";
+
+interface UploadState {
+  id: string;
+  offset: number;
+  size: number;
+  chunk_size: number;
+}
+
+const MAX_ATTEMPTS = 5;
+
+/**
+ * Upload a large file in resumable chunks and return the upload id to send
+ * as `media_upload`. A failed chunk is retried from the offset the server
+ * reports, so a dropped connection only costs the chunk in flight.
+ */
+export async function uploadChunked(file: File): Promise<string> {
+  const { data: upload } = await api.post<UploadState>(
+    "/api/dashboard/trainer/uploads/",
+    { filename: file.name, size: file.size }
+  );
+  const url = `/api/dashboard/trainer/uploads/${upload.id}/`;
+
+  let offset = 0;
+  let failures = 0;
+  while (offset < file.size) {
+    const chunk = file.slice(offset, offset + upload.chunk_size);
+    try {
+      const { data } = await api.put<{ offset: number }>(url, chunk, {
+        headers: {
+          "Content-Type": "application/octet-stream",
+          "Upload-Offset": String(offset),
+        },
+      });
+      offset = data.offset;
+      failures = 0;
+    } catch (err) {
+      if (++failures >= MAX_ATTEMPTS) throw err;
+      await new Promise((r) => setTimeout(r, 1000 * failures));
+      // Resume from whatever the server actually received
+      const { data } = await api.get<UploadState>(url);
+      offset = data.offset;
+    }
+  }
+
+  await api.post(`${url}complete/`);
+  return upload.id;
+}
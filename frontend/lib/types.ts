@@ -59,6 +59,9 @@ export interface SessionPhoto {
   id: string;
   image: string;
   image_url: string;
+  thumbnail_url: string | null;
+  medium_url: string | null;
+  webp_url: string | null;
   caption: string;
   approval_status: "pending" | "approved" | "rejected";
   is_featured: boolean;
@@ -79,6 +82,9 @@ export interface ProjectHighlight {
   project_type: ProjectType;
   image: string | null;
   image_url: string | null;
+  thumbnail_url: string | null;
+  medium_url: string | null;
+  webp_url: string | null;
   media_file: string | null;
   media_file_url: string | null;
   website_url: string;
@@ -137,6 +143,18 @@ export interface SubmissionDetail {
   project_highlights: ProjectHighlight[];
 }
 
+export interface UploadSlot {
+  key: string;
+  url: string;
+  fields: Record<string, string>;
+}
+
+export interface DirectSubmitResponse {
+  submission: SubmissionDetail;
+  uploads: UploadSlot[];
+  expires_in: number;
+}
+
 // --- Activity Log ---
 export interface ActivityLogEntry {
   id: string;
@@ -190,6 +208,26 @@ export interface Student {
   updated_at: string;
 }
 
+/** Response of POST trainer/students/import/ (201, or 400 with row errors). */
+export interface RosterImportResult {
+  created: number;
+  skipped: { row: number; name: string }[];
+  errors: { row: number; errors: Record<string, string[]> }[];
+  dry_run?: boolean;
+  detail?: string;
+}
+
+export type StudentMarks = { baseline?: number | null; endline?: number | null };
+
+export interface BulkMarksResult {
+  updated: number;
+  // Only the marks that changed, as [old, new]
+  changes: Record<
+    string,
+    { baseline?: [number | null, number | null]; endline?: [number | null, number | null] }
+  >;
+}
+
 // --- Trainer School (from profile) ---
 export interface TrainerSchool {
   id: string;
@@ -236,6 +274,9 @@ export interface TrainerAssignment {
 export interface TrainerGalleryPhoto {
   id: string;
   image_url: string | null;
+  thumbnail_url: string | null;
+  medium_url: string | null;
+  webp_url: string | null;
   caption: string;
   approval_status: "pending" | "approved" | "rejected";
   is_featured: boolean;
@@ -316,6 +357,15 @@ export interface UWHSummary {
 export interface UWHGallery {
   featured: SessionPhoto[];
   photos: SessionPhoto[];
+  next?: string | null;
+  previous?: string | null;
+}
+
+/** Keyset page returned by list endpoints when ?page_size= or ?cursor= is sent. */
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
 }
 
 // --- UWH District Progress ---
@@ -326,3 +376,38 @@ export interface DistrictProgress {
   completed: number;
   in_progress: number;
 }
+
+// --- Learning gains (baseline → endline marks) ---
+export interface LearningGainStats {
+  assessed: number;
+  mean_baseline: number;
+  mean_endline: number;
+  mean_gain: number;
+  median_gain: number;
+  percentiles: { p10: number; p25: number; p75: number; p90: number };
+  /** Share (0–1) of assessed students whose endline beat their baseline. */
+  improved_share: number;
+  /** Student counts per gain bin; see LearningGains.bins. */
+  histogram: number[];
+}
+
+export interface LearningGainGroup extends LearningGainStats {
+  id: string;
+  name: string;
+  district?: string;
+  school?: string;
+}
+
+export interface LearningGains {
+  computed_at: string;
+  bins: { start: number; width: number; count: number } | null;
+  /** Only ``assessed`` is present until some student has both marks. */
+  overall: Partial<LearningGainStats> & { assessed: number };
+  districts?: LearningGainGroup[];
+  schools?: LearningGainGroup[];
+  trainers?: LearningGainGroup[];
+  groups?: LearningGainGroup[];
+}
+
+// --- OTP email delivery (polled after request-otp / trainer-register) ---
+export type OtpDeliveryStatus = "pending" | "sending" | "sent" | "failed";
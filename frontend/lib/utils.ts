@@ -20,8 +20,40 @@ export function timeAgo(date: string | Date): string {
   return d.toLocaleDateString();
 }
 
+interface DerivedImage {
+  image_url: string | null;
+  thumbnail_url?: string | null;
+  medium_url?: string | null;
+}
+
+/** Grid-tile rendition of an upload; falls back to the original until derivatives exist. */
+export function thumbSrc(img: DerivedImage): string | undefined {
+  return img.thumbnail_url ?? img.image_url ?? undefined;
+}
+
+/** Lightbox rendition of an upload; falls back to the original until derivatives exist. */
+export function mediumSrc(img: DerivedImage): string | undefined {
+  return img.medium_url ?? img.image_url ?? undefined;
+}
+
 export function formatNumber(n: number): string {
   if (n >= 1_000_000) return `${(n / 1_000_000).toFixed(1)}M`;
   if (n >= 1_000) return `${(n / 1_000).toFixed(1)}K`;
   return n.toString();
 }
+
+/** Save a file fetched with responseType "blob", named by its Content-Disposition. */
+export function saveDownload(
+  data: Blob,
+  contentDisposition: string | undefined,
+  fallbackName: string
+) {
+  const filename =
+    /filename="([^"]+)"/.exec(contentDisposition ?? "")?.[1] ?? fallbackName;
+  const url = URL.createObjectURL(data);
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = filename;
+  link.click();
+  URL.revokeObjectURL(url);
+}